@@ -7,6 +7,14 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str = "postgresql+psycopg://postgres:postgres@db:5432/library"
 
+    # Pool de connexions, par processus et par moteur (sync et async) :
+    # connexions max par worker = 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
     LOAN_DAYS_DEFAULT: int = 14
     LOAN_RENEW_MAX: int = 2
     FINE_PER_DAY: float = 0.5
@@ -16,6 +24,60 @@ class Settings(BaseSettings):
     JWT_EXPIRES_MIN: int = 60               
     JWT_REFRESH_EXPIRES_DAYS: int = 7       
 
+    CATALOGUE_CACHE_SIZE: int = 1024
+    CATALOGUE_CACHE_TTL_SEC: int = 30
+
+    # Compression des réponses (gzip, et br si le paquet `brotli` est installé) :
+    # corps d'au moins COMPRESSION_MIN_SIZE octets, types listés (séparés par des virgules)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_CONTENT_TYPES: str = "application/json,application/x-ndjson,text/csv"
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+
+    # Mesures par route et requêtes SQL, exposées sur /metrics (Prometheus)
+    METRICS_ENABLED: bool = True
+
+    # Inspection des requêtes SQL, pour le développement et les tests uniquement :
+    # compte par requête HTTP (en-têtes X-Query-*), alerte N+1 dès qu'une même forme
+    # revient QUERY_N_PLUS_ONE_THRESHOLD fois, plan des requêtes de plus de QUERY_SLOW_MS ms
+    QUERY_INSPECTION_ENABLED: bool = False
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 5
+    QUERY_SLOW_MS: int = 200
+
+    # Cache des utilisateurs authentifiés, local à chaque processus : un rôle modifié
+    # ou un compte supprimé n'est vu des autres processus qu'au bout de AUTH_CACHE_TTL_SEC
+    AUTH_CACHE_SIZE: int = 10000
+    AUTH_CACHE_TTL_SEC: int = 60
+
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_LIMIT: int = 16
+
+    # Envoi des notifications : log | file | smtp
+    NOTIFICATION_DISPATCH_ENABLED: bool = True
+    NOTIFICATION_DISPATCH_BATCH: int = 100
+    NOTIFICATION_DISPATCH_INTERVAL_MS: int = 500
+    NOTIFICATION_TRANSPORT: str = "log"
+    NOTIFICATION_FILE: str = "notifications.ndjson"
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 25
+    SMTP_SENDER: str = "bibliotheque@example.com"
+
+    # Journal d'audit : écrit par lots (AUDIT_FLUSH_BATCH événements ou toutes
+    # les AUDIT_FLUSH_INTERVAL_MS) ; file bornée à AUDIT_QUEUE_MAX événements
+    AUDIT_FLUSH_INTERVAL_MS: int = 200
+    AUDIT_FLUSH_BATCH: int = 500
+    AUDIT_QUEUE_MAX: int = 10000
+    AUDIT_ENQUEUE_TIMEOUT_MS: int = 50
+
+    # Archivage : les prêts rendus depuis plus de LOAN_ARCHIVE_AFTER_DAYS jours
+    # passent de `prets` à `prets_archive`, par lots de LOAN_ARCHIVE_BATCH
+    LOAN_ARCHIVE_ENABLED: bool = True
+    LOAN_ARCHIVE_AFTER_DAYS: int = 365
+    LOAN_ARCHIVE_BATCH: int = 1000
+    LOAN_ARCHIVE_INTERVAL_SEC: int = 3600
+
 
 @lru_cache
 def get_settings() -> Settings:
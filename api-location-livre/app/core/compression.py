@@ -0,0 +1,171 @@
+"""
+Compression des réponses HTTP : gzip, et br si le paquet `brotli` est installé.
+
+`CompressionMiddleware` compresse à la volée les réponses dont le type figure
+dans COMPRESSION_CONTENT_TYPES et dont le corps atteint COMPRESSION_MIN_SIZE
+octets (les réponses en flux sont compressées morceau par morceau).
+Les réponses qui portent déjà un Content-Encoding (entrées du cache catalogue,
+compressées une fois pour toutes, voir app.utils.http_cache) sont laissées telles quelles.
+"""
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import get_settings
+
+try:
+    import brotli
+except ImportError:  # dépendance optionnelle
+    brotli = None
+
+# ordre de préférence du serveur, à qualité égale côté client
+ENCODINGS = ("br", "gzip") if brotli else ("gzip",)
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Encodage à utiliser d'après l'en-tête Accept-Encoding (valeurs q comprises),
+    ou None si le client n'en accepte aucun.
+    """
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token.strip().lower()] = q
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def choose_encoding(accept_encoding: Optional[str], size: int) -> Optional[str]:
+    """Encodage pour un corps de `size` octets, selon la configuration (seuil, activation)."""
+    s = get_settings()
+    if not s.COMPRESSION_ENABLED or size < s.COMPRESSION_MIN_SIZE:
+        return None
+    return negotiate(accept_encoding)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    s = get_settings()
+    if encoding == "br":
+        return brotli.compress(body, quality=s.COMPRESSION_BROTLI_QUALITY)
+    c = _gzip_compressor(s.COMPRESSION_GZIP_LEVEL)
+    return c.compress(body) + c.flush()
+
+
+def _gzip_compressor(level: int):
+    # wbits 31 : format gzip (en-tête et CRC), pas zlib brut
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+class _StreamCompressor:
+    """Compression incrémentale : chaque morceau est émis aussitôt (flush de synchronisation)."""
+
+    def __init__(self, encoding: str):
+        s = get_settings()
+        self.encoding = encoding
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=s.COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._c = _gzip_compressor(s.COMPRESSION_GZIP_LEVEL)
+
+    def compress(self, chunk: bytes, last: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._c.process(chunk)
+            return out + (self._c.finish() if last else self._c.flush())
+        out = self._c.compress(chunk)
+        return out + self._c.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp):
+        s = get_settings()
+        self.app = app
+        self.minimum_size = s.COMPRESSION_MIN_SIZE
+        self.content_types = {t.strip() for t in s.COMPRESSION_CONTENT_TYPES.split(",") if t.strip()}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(self, send, encoding))
+
+    def eligible(self, status: int, headers: Headers) -> bool:
+        if status < 200 or status in (204, 304) or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return content_type in self.content_types
+
+
+class _CompressingSend:
+    def __init__(self, middleware: CompressionMiddleware, send: Send, encoding: str):
+        self.middleware = middleware
+        self.send = send
+        self.encoding = encoding
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_StreamCompressor] = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is not None:
+            await self.send({
+                "type": "http.response.body",
+                "body": self.compressor.compress(body, last=not more_body),
+                "more_body": more_body,
+            })
+            return
+
+        # premier morceau du corps : décide pour toute la réponse
+        headers = MutableHeaders(raw=self.start["headers"])
+        if not self.middleware.eligible(self.start["status"], headers) or (
+            not more_body and len(body) < self.middleware.minimum_size
+        ):
+            self.passthrough = True
+            await self.send(self.start)
+            await self.send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if not more_body:
+            data = compress(body, self.encoding)
+            headers["Content-Length"] = str(len(data))
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": data})
+            return
+
+        if "content-length" in headers:
+            del headers["Content-Length"]
+        self.compressor = _StreamCompressor(self.encoding)
+        await self.send(self.start)
+        await self.send({
+            "type": "http.response.body",
+            "body": self.compressor.compress(body, last=False),
+            "more_body": True,
+        })
@@ -1,9 +1,15 @@
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
-from app.core.exceptions import BusinessError, NotFoundError, ValidationRuleError
+from app.core.exceptions import BusinessError, NotFoundError, OverloadedError, ValidationRuleError
 
 def install_error_handlers(app: FastAPI):
     @app.exception_handler(BusinessError)
     async def business_error_handler(request: Request, exc: BusinessError):
+        if isinstance(exc, OverloadedError):
+            return JSONResponse(
+                status_code=429,
+                content={"error": exc.code, "detail": exc.message},
+                headers={"Retry-After": "1"},
+            )
         status = 422 if isinstance(exc, ValidationRuleError) else 404 if isinstance(exc, NotFoundError) else 400
         return JSONResponse(status_code=status, content={"error": exc.code, "detail": exc.message})
@@ -9,3 +9,6 @@ class NotFoundError(BusinessError):
 
 class ValidationRuleError(BusinessError):
     pass
+
+class OverloadedError(BusinessError):
+    pass
@@ -0,0 +1,97 @@
+"""
+Mesures HTTP par route, exposées sur /metrics (format texte Prometheus).
+
+Étiquettes : méthode et gabarit de route (`/api/v1/livres/{book_id}`, jamais le
+chemin brut : cardinalité bornée par le nombre de routes). Les mesures sont
+propres au processus : avec plusieurs workers, Prometheus interroge chacun.
+"""
+import time
+from typing import List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import CounterFamily, GaugeFamily, HistogramFamily, register
+from app.db.query_metrics import QueryStats, current_query_stats
+
+UNMATCHED = "non_routee"
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+http_request_seconds = register(HistogramFamily(
+    "http_request_duration_seconds", "Durée des requêtes HTTP, corps de réponse compris", ("method", "route"),
+))
+http_in_flight = register(GaugeFamily(
+    "http_requests_in_flight", "Requêtes HTTP en cours de traitement", ("method", "route"),
+))
+http_responses = register(CounterFamily(
+    "http_responses_total", "Réponses HTTP par code de statut", ("method", "route", "status"),
+))
+http_db_queries = register(HistogramFamily(
+    "http_request_db_queries", "Requêtes SQL exécutées par requête HTTP", ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+))
+http_db_seconds = register(HistogramFamily(
+    "http_request_db_seconds", "Temps SQL cumulé par requête HTTP", ("method", "route"),
+))
+
+
+def compile_routes(app) -> List[Tuple]:
+    """(regex, méthodes, gabarit) de chaque route, dans l'ordre du routeur."""
+    return [
+        (route.path_regex, getattr(route, "methods", None), route.path)
+        for route in app.router.routes
+        if hasattr(route, "path_regex")
+    ]
+
+
+def route_template(routes: List[Tuple], method: str, path: str) -> str:
+    """
+    Gabarit de la route qui traitera la requête, même parcours que le routeur Starlette
+    (première route dont le chemin et la méthode correspondent, sinon première route
+    dont seul le chemin correspond : réponse 405). Simple test d'expressions régulières,
+    sans conversion des paramètres de chemin.
+    """
+    partial = None
+    for regex, methods, template in routes:
+        if regex.match(path):
+            if not methods or method in methods:
+                return template
+            if partial is None:
+                partial = template
+    return partial or UNMATCHED
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._routes: Optional[List[Tuple]] = None  # compilées à la première requête
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self._routes is None:
+            self._routes = compile_routes(scope["app"])
+        method = scope["method"]
+        route = route_template(self._routes, method, scope["path"])
+        status = 500  # exception non gérée : ServerErrorMiddleware répondra 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        http_in_flight.inc(method, route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_request_seconds.labels(method, route).observe(time.perf_counter() - started)
+            http_in_flight.dec(method, route)
+            current_query_stats.reset(token)
+            http_responses.inc(method, route, str(status))
+            http_db_queries.labels(method, route).observe(stats.count)
+            http_db_seconds.labels(method, route).observe(stats.seconds)
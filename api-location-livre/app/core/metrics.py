@@ -0,0 +1,135 @@
+import bisect
+import threading
+from typing import Dict, List, Sequence
+
+# bornes (en secondes) adaptées aux latences d'une API et de sa base
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Histogramme cumulatif à bornes fixes (même modèle que Prometheus) :
+    observe() est en O(log n) et ne garde aucun échantillon.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict:
+        """
+        {"buckets": {"0.005": n, ..., "+Inf": n}, "sum": s, "count": c}
+        (comptes cumulés, comme le format texte Prometheus).
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative, running = {}, 0
+        for bound, n in zip(list(self.buckets) + ["+Inf"], counts):
+            running += n
+            cumulative[str(bound)] = running
+        return {"buckets": cumulative, "sum": total, "count": count}
+
+
+# ========= FAMILLES ÉTIQUETÉES (format texte Prometheus) =========
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Family:
+    """Une série par combinaison de valeurs d'étiquettes, créée au premier usage."""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class CounterFamily(_Family):
+    kind = "counter"
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        with self._lock:
+            self._series[labelvalues] = self._series.get(labelvalues, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted(self._series.items())
+        return self._header() + [f"{self.name}{_labels(self.labelnames, k)} {v}" for k, v in series]
+
+
+class GaugeFamily(CounterFamily):
+    kind = "gauge"
+
+    def dec(self, *labelvalues: str, amount: float = 1) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+
+class HistogramFamily(_Family):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def labels(self, *labelvalues: str) -> Histogram:
+        histogram = self._series.get(labelvalues)
+        if histogram is None:
+            with self._lock:
+                histogram = self._series.setdefault(labelvalues, Histogram(self.buckets))
+        return histogram
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted(self._series.items())
+        lines = self._header()
+        for values, histogram in series:
+            snap = histogram.snapshot()
+            for bound, count in snap["buckets"].items():
+                le = 'le="' + bound + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, values, le)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, values)} {snap['sum']}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, values)} {snap['count']}")
+        return lines
+
+
+REGISTRY: List[_Family] = []
+
+
+def register(family: _Family) -> _Family:
+    REGISTRY.append(family)
+    return family
+
+
+def render_prometheus() -> str:
+    """Toutes les familles enregistrées, au format d'exposition texte Prometheus 0.0.4."""
+    lines: List[str] = []
+    for family in REGISTRY:
+        lines.extend(family.render())
+    return "\n".join(lines) + "\n"
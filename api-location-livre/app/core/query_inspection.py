@@ -0,0 +1,45 @@
+"""
+Inspection des requêtes SQL par requête HTTP (développement et tests, QUERY_INSPECTION_ENABLED).
+
+Chaque réponse porte X-Query-Count, X-Query-Time-Ms et X-Query-Repeated (nombre
+de formes de requête répétées au moins QUERY_N_PLUS_ONE_THRESHOLD fois, N+1
+probables, aussi journalisées). Les tests de bout en bout s'en servent pour
+vérifier un budget de requêtes par endpoint (fixture `query_budget`).
+Les requêtes exécutées pendant l'envoi d'un corps en flux ne sont pas comptées dans les en-têtes.
+Le relevé est celui de MetricsMiddleware quand il enveloppe l'application.
+"""
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import get_settings
+from app.db.query_metrics import capture_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryInspectionMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.threshold = get_settings().QUERY_N_PLUS_ONE_THRESHOLD
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with capture_queries(join=True) as stats:
+
+            async def send_with_counts(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(raw=message["headers"])
+                    headers["X-Query-Count"] = str(stats.count)
+                    headers["X-Query-Time-Ms"] = f"{stats.seconds * 1000:.1f}"
+                    headers["X-Query-Repeated"] = str(len(stats.repeated(self.threshold)))
+                await send(message)
+
+            await self.app(scope, receive, send_with_counts)
+
+        for shape, n in stats.repeated(self.threshold):
+            logger.warning("N+1 probable sur %s %s : %d × %s", scope["method"], scope["path"], n, shape)
@@ -0,0 +1,47 @@
+import asyncio
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicWorker:
+    """
+    Tâche de fond asyncio : exécute `run_once` (bloquant, dans un thread), puis attend
+    `interval` secondes avant le passage suivant. Tant que `run_once` retourne True
+    (travail restant), les passages s'enchaînent sans attente.
+    """
+
+    name = "worker"
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    def run_once(self) -> bool:
+        raise NotImplementedError
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                more = await asyncio.to_thread(self.run_once)
+            except Exception:
+                logger.exception("échec de la tâche de fond %s", self.name)
+                more = False
+            if not more:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
@@ -1,10 +1,11 @@
-from app.db.session import Base, engine, SessionLocal
+from app.db.session import engine, SessionLocal
+from app.db.migrate import upgrade
 from app.models.book import Book
 from app.models.user import User
 from app.utils.security import hash_password
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    upgrade(engine)
 
 def seed():
     db = SessionLocal()
@@ -0,0 +1,86 @@
+"""
+Application des migrations du schéma, une fois par déploiement :
+
+    python -m app.db.migrate            # jusqu'à la dernière révision
+    python -m app.db.migrate --to 2     # jusqu'à une révision donnée
+    python -m app.db.migrate current    # révision appliquée
+    python -m app.db.migrate history    # révisions connues
+
+L'application ne touche plus au schéma au démarrage.
+"""
+import argparse
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.migrations import load_migrations
+from app.db.session import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+# Verrou consultatif PostgreSQL : deux déploiements simultanés s'attendent.
+_PG_LOCK_KEY = 7_316_001
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _metadata,
+    Column("revision", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def current_revision(conn: Connection) -> int:
+    return conn.execute(select(func.coalesce(func.max(schema_migrations.c.revision), 0))).scalar_one()
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[int]:
+    """
+    Applique, dans l'ordre, les migrations non encore appliquées (jusqu'à `target`).
+    Chaque migration s'exécute dans sa propre transaction, avec l'enregistrement
+    de sa révision. Retourne les révisions appliquées.
+    """
+    _metadata.create_all(engine, checkfirst=True)
+    applied: List[int] = []
+    for migration in load_migrations():
+        if target is not None and migration.revision > target:
+            break
+        with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                conn.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": _PG_LOCK_KEY})
+            if migration.revision <= current_revision(conn):
+                continue
+            logger.info("migration %04d : %s", migration.revision, migration.description)
+            migration.upgrade(conn)
+            conn.execute(insert(schema_migrations).values(
+                revision=migration.revision,
+                description=migration.description,
+                applied_at=datetime.utcnow(),
+            ))
+        applied.append(migration.revision)
+    return applied
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.db.migrate")
+    parser.add_argument("command", nargs="?", default="upgrade", choices=["upgrade", "current", "history"])
+    parser.add_argument("--to", type=int, default=None, help="révision cible (upgrade)")
+    args = parser.parse_args()
+
+    if args.command == "history":
+        for m in load_migrations():
+            print(f"{m.revision:04d}  {m.description}")
+    elif args.command == "current":
+        _metadata.create_all(default_engine, checkfirst=True)
+        with default_engine.connect() as conn:
+            print(f"{current_revision(conn):04d}")
+    else:
+        applied = upgrade(default_engine, args.to)
+        print(f"migrations appliquées : {applied or 'aucune'}")
+
+
+if __name__ == "__main__":
+    main()
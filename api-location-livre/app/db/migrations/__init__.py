@@ -0,0 +1,25 @@
+"""
+Migrations versionnées du schéma.
+
+Chaque module `vNNNN_<nom>.py` définit `revision` (entier croissant),
+`description` et `upgrade(conn)`. Une migration est figée une fois livrée :
+toute évolution du schéma passe par un nouveau module.
+Application : `python -m app.db.migrate` (voir app.db.migrate).
+"""
+import importlib
+import pkgutil
+from types import ModuleType
+from typing import List
+
+
+def load_migrations() -> List[ModuleType]:
+    modules = [
+        importlib.import_module(f"{__name__}.{info.name}")
+        for info in pkgutil.iter_modules(__path__)
+        if info.name.startswith("v")
+    ]
+    modules.sort(key=lambda m: m.revision)
+    revisions = [m.revision for m in modules]
+    if len(set(revisions)) != len(revisions):
+        raise RuntimeError(f"révisions de migration en double : {revisions}")
+    return modules
@@ -0,0 +1,84 @@
+from sqlalchemy import (
+    JSON, Boolean, Column, Date, DateTime, ForeignKey, Index, Integer, MetaData, String, Table,
+)
+from sqlalchemy.engine import Connection
+
+revision = 1
+description = "schéma initial"
+
+# Tables telles qu'elles existaient à cette révision (indépendantes des modèles,
+# qui continueront d'évoluer). checkfirst : une base déjà créée par create_all
+# est simplement adoptée.
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("email", String, unique=True, index=True, nullable=False),
+    Column("full_name", String, nullable=False),
+    Column("password_hash", String, nullable=False),
+    Column("role", String, nullable=False),
+)
+
+Table(
+    "books", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String, nullable=False),
+    Column("author", String, nullable=False),
+    Column("year", Integer, nullable=False),
+    Column("total_copies", Integer, nullable=False),
+    Column("available_copies", Integer, nullable=False),
+)
+
+Table(
+    "prets", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("book_id", Integer, ForeignKey("books.id"), nullable=False),
+    Column("date_pret", Date, nullable=False),
+    Column("date_retour", Date, nullable=True),
+    Column("renouvellements", Integer, nullable=False),
+)
+
+Table(
+    "reservations", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("book_id", Integer, ForeignKey("books.id"), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+)
+
+Table(
+    "notifications", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("pret_id", Integer, nullable=True),
+    Column("type", String, nullable=False),
+    Column("message", String, nullable=False),
+    Column("lu", Boolean, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("delivered_at", DateTime, nullable=True),
+    Index("ix_notifications_user_id_id", "user_id", "id"),
+)
+
+Table(
+    "notification_outbox", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("notification_id", Integer, ForeignKey("notifications.id"), nullable=False),
+)
+
+Table(
+    "audit_events", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("action", String, nullable=False),
+    Column("user_id", Integer, nullable=True),
+    Column("target", String, nullable=True),
+    Column("target_id", Integer, nullable=True),
+    Column("details", JSON, nullable=True),
+    Index("ix_audit_events_created_at_id", "created_at", "id"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,10 @@
+from sqlalchemy.engine import Connection
+
+from app.db.search_index import install_search_index
+
+revision = 2
+description = "recherche plein texte (FTS5 / tsvector + trigrammes)"
+
+
+def upgrade(conn: Connection) -> None:
+    install_search_index(conn)
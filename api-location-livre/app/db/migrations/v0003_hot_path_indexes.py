@@ -0,0 +1,23 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+revision = 3
+description = "index des requêtes chaudes (prêts, réservations)"
+
+# IF NOT EXISTS : certaines bases ont déjà reçu une partie de ces index via create_all.
+INDEXES = [
+    # prêts d'un membre, amendes et retards : WHERE user_id = ? [AND date_retour < ?]
+    "CREATE INDEX IF NOT EXISTS ix_prets_user_id_date_retour ON prets (user_id, date_retour)",
+    # prêts actifs d'un livre (suppression admin)
+    "CREATE INDEX IF NOT EXISTS ix_prets_book_id ON prets (book_id)",
+    # prêts en retard, tous membres confondus : WHERE date_retour < ?
+    "CREATE INDEX IF NOT EXISTS ix_prets_date_retour ON prets (date_retour)",
+    # tête de file d'un livre : WHERE book_id = ? ORDER BY created_at, id LIMIT 1
+    "CREATE INDEX IF NOT EXISTS ix_reservations_book_id_created_at_id"
+    " ON reservations (book_id, created_at, id)",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for ddl in INDEXES:
+        conn.execute(text(ddl))
@@ -0,0 +1,27 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+revision = 4
+description = "historique des prêts (returned_at) et index partiels des prêts en cours"
+
+ADD_RETURNED_AT = "ALTER TABLE prets ADD COLUMN returned_at TIMESTAMP"
+
+STATEMENTS = [
+    # remplacés par leurs équivalents partiels : les prêts rendus n'y entrent plus
+    "DROP INDEX IF EXISTS ix_prets_user_id_date_retour",
+    "DROP INDEX IF EXISTS ix_prets_book_id",
+    "DROP INDEX IF EXISTS ix_prets_date_retour",
+    "CREATE INDEX IF NOT EXISTS ix_prets_active_user_id_date_retour ON prets (user_id, date_retour)"
+    " WHERE returned_at IS NULL",
+    "CREATE INDEX IF NOT EXISTS ix_prets_active_book_id ON prets (book_id) WHERE returned_at IS NULL",
+    "CREATE INDEX IF NOT EXISTS ix_prets_active_date_retour ON prets (date_retour) WHERE returned_at IS NULL",
+    "CREATE INDEX IF NOT EXISTS ix_prets_user_id ON prets (user_id)",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    # une base adoptée depuis create_all a déjà la colonne
+    if "returned_at" not in {c["name"] for c in inspect(conn).get_columns("prets")}:
+        conn.execute(text(ADD_RETURNED_AT))
+    for ddl in STATEMENTS:
+        conn.execute(text(ddl))
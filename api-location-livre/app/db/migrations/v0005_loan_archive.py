@@ -0,0 +1,45 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+revision = 5
+description = "archive des prêts clos (partitionnée par mois sur PostgreSQL)"
+
+COLUMNS = """
+    id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    book_id INTEGER NOT NULL,
+    date_pret DATE NOT NULL,
+    date_retour DATE,
+    renouvellements INTEGER NOT NULL,
+    returned_at TIMESTAMP NOT NULL,
+    archived_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (id, returned_at)
+"""
+
+POSTGRES = [
+    # partitions mensuelles créées à la demande par l'archivage ;
+    # la partition par défaut ne sert que de filet de sécurité
+    f"CREATE TABLE prets_archive ({COLUMNS}) PARTITION BY RANGE (returned_at)",
+    "CREATE TABLE prets_archive_default PARTITION OF prets_archive DEFAULT",
+]
+
+SQLITE = [
+    f"CREATE TABLE IF NOT EXISTS prets_archive ({COLUMNS})",
+]
+
+# IF NOT EXISTS : une base adoptée depuis create_all a déjà la table et ces index.
+COMMON = [
+    "CREATE INDEX IF NOT EXISTS ix_prets_archive_user_id ON prets_archive (user_id)",
+    "CREATE INDEX IF NOT EXISTS ix_prets_returned_at ON prets (returned_at) WHERE returned_at IS NOT NULL",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    if conn.dialect.name == "postgresql":
+        # pas de IF NOT EXISTS pour le couple table partitionnée / partition par défaut
+        exists = conn.execute(text("SELECT to_regclass('prets_archive')")).scalar() is not None
+        statements = [] if exists else POSTGRES
+    else:
+        statements = SQLITE
+    for ddl in statements + COMMON:
+        conn.execute(text(ddl))
@@ -0,0 +1,46 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+revision = 6
+description = "identifiants de prêts jamais réattribués (SQLite AUTOINCREMENT)"
+
+# Sans AUTOINCREMENT, SQLite attribue max(id) + 1 : un prêt archivé ou supprimé
+# avec le livre céderait son id au prêt suivant (doublons dans l'historique).
+# PostgreSQL (séquence) n'est pas concerné. SQLite ne sait pas modifier une clé
+# primaire : la table est reconstruite.
+REBUILD = [
+    "CREATE TABLE prets_new ("
+    " id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,"
+    " user_id INTEGER NOT NULL REFERENCES users (id),"
+    " book_id INTEGER NOT NULL REFERENCES books (id),"
+    " date_pret DATE NOT NULL,"
+    " date_retour DATE,"
+    " renouvellements INTEGER NOT NULL,"
+    " returned_at TIMESTAMP)",
+    "INSERT INTO prets_new (id, user_id, book_id, date_pret, date_retour, renouvellements, returned_at)"
+    " SELECT id, user_id, book_id, date_pret, date_retour, renouvellements, returned_at FROM prets",
+    "DROP TABLE prets",
+    "ALTER TABLE prets_new RENAME TO prets",
+    # reprend après le plus grand id déjà attribué, archive comprise
+    "DELETE FROM sqlite_sequence WHERE name = 'prets'",
+    "INSERT INTO sqlite_sequence (name, seq) SELECT 'prets', max("
+    " (SELECT coalesce(max(id), 0) FROM prets), (SELECT coalesce(max(id), 0) FROM prets_archive))",
+    "CREATE INDEX ix_prets_id ON prets (id)",
+    "CREATE INDEX ix_prets_active_user_id_date_retour ON prets (user_id, date_retour)"
+    " WHERE returned_at IS NULL",
+    "CREATE INDEX ix_prets_active_book_id ON prets (book_id) WHERE returned_at IS NULL",
+    "CREATE INDEX ix_prets_active_date_retour ON prets (date_retour) WHERE returned_at IS NULL",
+    "CREATE INDEX ix_prets_user_id ON prets (user_id)",
+    "CREATE INDEX ix_prets_returned_at ON prets (returned_at) WHERE returned_at IS NOT NULL",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    if conn.dialect.name != "sqlite":
+        return
+    ddl = conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'prets'")).scalar()
+    # une base adoptée depuis create_all a déjà AUTOINCREMENT (sqlite_autoincrement du modèle)
+    if "AUTOINCREMENT" in ddl.upper():
+        return
+    for statement in REBUILD:
+        conn.execute(text(statement))
@@ -0,0 +1,95 @@
+import time
+from typing import Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.metrics import Histogram
+
+
+class PoolMetrics:
+    """
+    Mesures d'un pool de connexions : attente pour obtenir une connexion,
+    latence d'ouverture des connexions physiques, compteurs d'événements.
+    """
+
+    def __init__(self):
+        self.wait = Histogram()
+        self.connect = Histogram()
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+
+    def snapshot(self, pool: Pool) -> Dict:
+        data = {
+            "pool": type(pool).__name__,
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "waitSeconds": self.wait.snapshot(),
+            "connectSeconds": self.connect.snapshot(),
+        }
+        if isinstance(pool, QueuePool):
+            data.update(
+                size=pool.size(),
+                checkedIn=pool.checkedin(),
+                checkedOut=pool.checkedout(),
+                overflow=pool.overflow(),
+                maxConnections=pool.size() + pool._max_overflow,
+            )
+        return data
+
+
+class _WaitTimingMixin:
+    """Chronomètre l'obtention d'une connexion (attente comprise quand le pool est plein)."""
+
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self.metrics is not None:
+                self.metrics.wait.observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine: Engine) -> PoolMetrics:
+    """
+    Branche les mesures sur le pool d'un moteur (sync ou `async_engine.sync_engine`).
+    """
+    metrics = PoolMetrics()
+    pool = engine.pool
+    if isinstance(pool, _WaitTimingMixin):
+        pool.metrics = metrics
+
+    @event.listens_for(engine, "do_connect")
+    def _before_connect(dialect, conn_rec, cargs, cparams):
+        conn_rec.info["connect_started"] = time.perf_counter()
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, conn_rec):
+        metrics.connects += 1
+        started = conn_rec.info.pop("connect_started", None)
+        if started is not None:
+            metrics.connect.observe(time.perf_counter() - started)
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, conn_rec, conn_proxy):
+        metrics.checkouts += 1
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(dbapi_connection, conn_rec, exception):
+        metrics.invalidations += 1
+
+    return metrics
+
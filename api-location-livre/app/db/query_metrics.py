@@ -0,0 +1,166 @@
+"""
+Comptage des requêtes SQL : métriques globales par moteur, et `QueryStats` de la
+requête HTTP (ou du bloc `capture_queries`) en cours.
+
+Avec l'inspection (QUERY_INSPECTION_ENABLED, développement et tests) :
+- les formes de requête sont relevées ; une même forme répétée dans un bloc
+  signale un N+1 probable ;
+- les requêtes plus lentes que QUERY_SLOW_MS sont journalisées avec leur plan
+  (EXPLAIN sur PostgreSQL, EXPLAIN QUERY PLAN sur SQLite).
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import CounterFamily, HistogramFamily, register
+
+logger = logging.getLogger(__name__)
+
+db_queries = register(CounterFamily(
+    "db_queries_total", "Requêtes SQL exécutées, par moteur", ("engine",),
+))
+db_query_seconds = register(HistogramFamily(
+    "db_query_duration_seconds", "Durée d'exécution des requêtes SQL, par moteur", ("engine",),
+))
+
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)"
+# (?, ?, ?) -> (?) : listes IN et lignes VALUES de longueur variable
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_SPACES = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+def statement_shape(statement: str) -> str:
+    """Forme d'une requête : espaces normalisés, listes de paramètres réduites à (?)."""
+    return _PLACEHOLDER_LIST.sub("(?)", _SPACES.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """
+    Requêtes SQL d'une requête HTTP ou d'un bloc `capture_queries` : nombre, durée
+    cumulée, et avec l'inspection formes de requête et requêtes lentes.
+    """
+
+    __slots__ = ("count", "seconds", "shapes", "slow")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+        self.slow: List[Tuple[str, float, str]] = []  # (requête, durée, plan)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Formes exécutées au moins `threshold` fois (N+1 probables), les plus fréquentes d'abord."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def describe(self) -> str:
+        lines = [f"{self.count} requêtes SQL ({self.seconds * 1000:.1f} ms)"]
+        lines += [f"  {n} × {shape}" for shape, n in self.shapes.most_common()]
+        return "\n".join(lines)
+
+
+# posé par le middleware de mesure pour la durée d'une requête HTTP ; la variable
+# suit la requête dans le pool de threads (endpoints sync) et dans asyncio.to_thread
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+@contextmanager
+def capture_queries(join: bool = False) -> Iterator[QueryStats]:
+    """
+    Relève les requêtes exécutées dans le bloc. Avec `join=True`, un relevé déjà
+    en cours (middleware de mesure) est réutilisé plutôt que masqué.
+    """
+    current = current_query_stats.get()
+    if join and current is not None:
+        yield current
+        return
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int, n_plus_one_threshold: Optional[int] = None) -> Iterator[QueryStats]:
+    """
+    Budget de requêtes d'un bloc (tests) : échoue si plus de `limit` requêtes SQL
+    y sont exécutées, ou si une même forme revient `n_plus_one_threshold` fois.
+    """
+    with capture_queries() as stats:
+        yield stats
+    assert stats.count <= limit, f"budget de {limit} requêtes dépassé : {stats.describe()}"
+    if n_plus_one_threshold:
+        assert not stats.repeated(n_plus_one_threshold), f"N+1 probable : {stats.describe()}"
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    """
+    Plan de la requête, lu sur la connexion DBAPI (hors événements SQLAlchemy).
+    Sur PostgreSQL, un point de sauvegarde protège la transaction en cours d'un échec de l'EXPLAIN.
+    """
+    postgres = conn.dialect.name == "postgresql"
+    prefix = "EXPLAIN " if postgres else "EXPLAIN QUERY PLAN "
+    cursor = conn.connection.cursor()
+    try:
+        if postgres:
+            cursor.execute("SAVEPOINT query_explain")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+        except Exception as exc:
+            if postgres:
+                cursor.execute("ROLLBACK TO SAVEPOINT query_explain")
+            return f"(EXPLAIN impossible : {exc})"
+        if postgres:
+            cursor.execute("RELEASE SAVEPOINT query_explain")
+        return "\n".join(str(row[-1]) for row in rows)
+    finally:
+        cursor.close()
+
+
+def _inspect(conn, statement: str, parameters, executemany: bool, elapsed: float,
+             slow_ms: float, stats: Optional[QueryStats]) -> None:
+    if stats is not None:
+        stats.shapes[statement_shape(statement)] += 1
+    if elapsed * 1000 < slow_ms or executemany:
+        return
+    if not statement.lstrip()[:6].upper().startswith(_EXPLAINABLE):
+        return
+    plan = _explain(conn, statement, parameters)
+    logger.warning("requête lente (%.1f ms) : %s\nplan :\n%s", elapsed * 1000, statement_shape(statement), plan)
+    if stats is not None:
+        stats.slow.append((statement, elapsed, plan))
+
+
+def instrument_queries(engine: Engine, name: str, inspection: bool = False, slow_ms: float = 200) -> None:
+    """
+    Compte et chronomètre chaque exécution SQL du moteur (sync ou `async_engine.sync_engine`),
+    globalement et pour la requête HTTP en cours. Avec `inspection`, relève aussi
+    les formes de requête et journalise le plan des requêtes de plus de `slow_ms`.
+    """
+    histogram = db_query_seconds.labels(name)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_started
+        histogram.observe(elapsed)
+        db_queries.inc(name)
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+        if inspection:
+            _inspect(conn, statement, parameters, executemany, elapsed, slow_ms, stats)
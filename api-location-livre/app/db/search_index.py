@@ -0,0 +1,71 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# SQLite : table FTS5 « external content » synchronisée par triggers.
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+        title, author,
+        content='books', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts(rowid, title, author) VALUES (new.id, new.title, new.author);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author) VALUES ('delete', old.id, old.title, old.author);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author) VALUES ('delete', old.id, old.title, old.author);
+        INSERT INTO books_fts(rowid, title, author) VALUES (new.id, new.title, new.author);
+    END
+    """,
+]
+
+# PostgreSQL : index GIN sur un tsvector sans accents + trigrammes pour les fautes de frappe.
+# unaccent() n'est pas IMMUTABLE, d'où l'enveloppe f_unaccent utilisable dans un index.
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text AS
+    $$ SELECT public.unaccent('public.unaccent', $1) $$
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_books_search_tsv ON books USING gin (
+        to_tsvector('simple', f_unaccent(lower(title || ' ' || author)))
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_books_search_trgm ON books USING gin (
+        f_unaccent(lower(title || ' ' || author)) gin_trgm_ops
+    )
+    """,
+]
+
+
+def install_search_index(conn: Connection) -> None:
+    """
+    Crée les structures de recherche plein texte propres au moteur de base de données,
+    dans la transaction de `conn` (migration 0002). Idempotent.
+    """
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'books_fts'")
+        ).first()
+        for ddl in SQLITE_DDL:
+            conn.execute(text(ddl))
+        if not exists:
+            # indexe les livres déjà présents
+            conn.execute(text("INSERT INTO books_fts(books_fts) VALUES ('rebuild')"))
+    elif dialect == "postgresql":
+        for ddl in POSTGRES_DDL:
+            conn.execute(text(ddl))
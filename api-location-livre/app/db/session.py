@@ -1,12 +1,69 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config.settings import get_settings
+from app.db.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine
+from app.db.query_metrics import instrument_queries
 
 settings = get_settings()
 connect_args = {}
 if settings.DATABASE_URL.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
 
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def pool_options(url: str, poolclass) -> dict:
+    """
+    Options de pool issues des Settings. Une base SQLite en mémoire garde le
+    pool par défaut (une seule connexion partagée) : un pool à file n'y a pas de sens.
+    """
+    if make_url(url).get_backend_name() == "sqlite" and make_url(url).database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    connect_args=connect_args,
+    **pool_options(settings.DATABASE_URL, InstrumentedQueuePool),
+)
+# expire_on_commit=False : les objets renvoyés par un service restent lisibles
+# après le commit sans SELECT supplémentaire (les clés viennent du flush / RETURNING).
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 Base = declarative_base()
+
+# Pilotes asynchrones : psycopg 3 gère nativement l'asynchrone, aiosqlite pour SQLite.
+ASYNC_DRIVERS = {"postgresql": "psycopg", "sqlite": "aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """
+    Dérive l'URL du moteur asynchrone de DATABASE_URL
+    (postgresql+psycopg:// est conservée, sqlite:// -> sqlite+aiosqlite://).
+    """
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        return url
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    **pool_options(settings.DATABASE_URL, InstrumentedAsyncQueuePool),
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+pool_metrics = {
+    "sync": instrument_engine(engine),
+    "async": instrument_engine(async_engine.sync_engine),
+}
+instrument_queries(engine, "sync", settings.QUERY_INSPECTION_ENABLED, settings.QUERY_SLOW_MS)
+instrument_queries(async_engine.sync_engine, "async", settings.QUERY_INSPECTION_ENABLED, settings.QUERY_SLOW_MS)
@@ -0,0 +1,79 @@
+import functools
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+_SCOPE_KEY = "transaction_scope"
+_AFTER_COMMIT_KEY = "after_commit"
+
+
+def transactional(fn: Callable) -> Callable:
+    """
+    Décorateur de service (unité de travail) : le premier argument est la Session.
+    Les repositories se contentent de flush ; le service décoré commit une seule
+    fois en sortie, ou rollback si une exception remonte.
+    Un service décoré appelé depuis un autre s'exécute dans la transaction englobante.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(db: Session, *args, **kwargs):
+        if db.info.get(_SCOPE_KEY):
+            return fn(db, *args, **kwargs)
+
+        db.info[_SCOPE_KEY] = True
+        try:
+            result = fn(db, *args, **kwargs)
+            db.commit()
+        except Exception:
+            db.rollback()
+            db.info.pop(_AFTER_COMMIT_KEY, None)
+            raise
+        finally:
+            db.info.pop(_SCOPE_KEY, None)
+
+        for callback in db.info.pop(_AFTER_COMMIT_KEY, []):
+            callback()
+        return result
+
+    return wrapper
+
+
+def transactional_async(fn: Callable) -> Callable:
+    """
+    Pendant de `transactional` pour les services asynchrones (AsyncSession).
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(db: AsyncSession, *args, **kwargs):
+        if db.info.get(_SCOPE_KEY):
+            return await fn(db, *args, **kwargs)
+
+        db.info[_SCOPE_KEY] = True
+        try:
+            result = await fn(db, *args, **kwargs)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            db.info.pop(_AFTER_COMMIT_KEY, None)
+            raise
+        finally:
+            db.info.pop(_SCOPE_KEY, None)
+
+        for callback in db.info.pop(_AFTER_COMMIT_KEY, []):
+            callback()
+        return result
+
+    return wrapper
+
+
+def on_commit(db: Session | AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Enregistre une action à exécuter après le commit de la transaction en cours
+    (invalidation de cache, etc.). Abandonnée en cas de rollback.
+    Hors de toute transaction décorée, l'action est exécutée immédiatement.
+    """
+    if db.info.get(_SCOPE_KEY):
+        db.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+    else:
+        callback()
@@ -1,7 +1,15 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
-from app.db.session import Base, engine
+from app.utils.passwords import shutdown_pool
+from app.core.compression import CompressionMiddleware
 from app.core.error_handlers import install_error_handlers
+from app.core.http_metrics import MetricsMiddleware
+from app.core.query_inspection import QueryInspectionMiddleware
+from app.config.settings import get_settings
+from app.services.notification_dispatcher import NotificationDispatcher
+from app.services.audit_service import audit_writer
+from app.services.archive_service import LoanArchiver
 
 from app.routers.catalogue import router as catalogue_router
 from app.routers.livres import router as livres_router
@@ -11,16 +19,47 @@ from app.routers.notifications import router as notifications_router
 from app.routers.audit import router as audit_router
 from app.routers.amendes import router as amendes_router
 from app.routers.auth import router as auth_router
+from app.routers.metrics import prometheus_router, router as metrics_router
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="API Location Livre")
+    # orjson pour toutes les réponses ; les listes volumineuses renvoient en plus
+    # directement leurs ReadModel (sans revalidation par response_model)
+    app = FastAPI(title="API Location Livre", default_response_class=ORJSONResponse)
 
+    install_error_handlers(app)
+    settings = get_settings()
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(CompressionMiddleware)
+    if settings.QUERY_INSPECTION_ENABLED:
+        app.add_middleware(QueryInspectionMiddleware)
+    if settings.METRICS_ENABLED:
+        # ajouté en dernier, donc le plus externe : la compression est comprise dans la durée
+        app.add_middleware(MetricsMiddleware)
+    dispatcher = NotificationDispatcher() if settings.NOTIFICATION_DISPATCH_ENABLED else None
+    archiver = LoanArchiver() if settings.LOAN_ARCHIVE_ENABLED else None
+
+    # Le schéma est géré par les migrations (python -m app.db.migrate), pas au démarrage.
     @app.on_event("startup")
     def on_startup() -> None:
-        Base.metadata.create_all(bind=engine)
+        audit_writer.start()
+
+    @app.on_event("startup")
+    async def start_workers() -> None:
+        for worker in (dispatcher, archiver):
+            if worker:
+                worker.start()
+
+    @app.on_event("shutdown")
+    async def stop_workers() -> None:
+        for worker in (dispatcher, archiver):
+            if worker:
+                await worker.stop()
 
-        install_error_handlers(app)
+    @app.on_event("shutdown")
+    def on_shutdown() -> None:
+        audit_writer.stop()
+        shutdown_pool()
 
     @app.get("/health")
     def health() -> dict:
@@ -34,6 +73,8 @@ def create_app() -> FastAPI:
     app.include_router(notifications_router, prefix="/api/v1")
     app.include_router(amendes_router, prefix="/api/v1")
     app.include_router(audit_router, prefix="/api/v1")
+    app.include_router(metrics_router, prefix="/api/v1")
+    app.include_router(prometheus_router)
 
     return app
 
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String
+from app.db.session import Base
+
+
+class AuditEvent(Base):
+    __tablename__ = "audit_events"
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    action = Column(String, nullable=False)  # CONNEXION | EMPRUNT | RETOUR | RESERVATION | LIVRE_* ...
+    user_id = Column(Integer, nullable=True)
+    target = Column(String, nullable=True)  # pret | livre | reservation
+    target_id = Column(Integer, nullable=True)
+    details = Column(JSON, nullable=True)
+
+    __table_args__ = (
+        # requêtes par plage de dates, les plus récents d'abord (curseur created_at, id)
+        Index("ix_audit_events_created_at_id", "created_at", "id"),
+    )
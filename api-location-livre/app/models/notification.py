@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
+from app.db.session import Base
+
+
+class Notification(Base):
+    __tablename__ = "notifications"
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    pret_id = Column(Integer, nullable=True)
+    type = Column(String, nullable=False)  # rappel_retour | retard | confirmation_emprunt
+    message = Column(String, nullable=False)
+    lu = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    delivered_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # notifications d'un membre, les plus récentes d'abord (pagination par id)
+        Index("ix_notifications_user_id_id", "user_id", "id"),
+    )
+
+
+class NotificationOutbox(Base):
+    """
+    File d'envoi : une ligne par notification à transmettre, supprimée une fois
+    l'envoi effectué par le worker.
+    """
+
+    __tablename__ = "notification_outbox"
+    id = Column(Integer, primary_key=True)
+    notification_id = Column(Integer, ForeignKey("notifications.id"), nullable=False)
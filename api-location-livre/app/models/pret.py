@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, ForeignKey, Date
+from sqlalchemy import Column, Integer, ForeignKey, Date, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 
+# Prêts en cours : les requêtes chaudes ne lisent que cet ensemble (index partiels)
+ACTIVE = text("returned_at IS NULL")
+
 class Pret(Base):
     __tablename__ = "prets"
     id = Column(Integer, primary_key=True, index=True)
@@ -10,6 +13,51 @@ class Pret(Base):
     date_pret = Column(Date, nullable=False)
     date_retour = Column(Date, nullable=True)
     renouvellements = Column(Integer, nullable=False, default=0)
+    returned_at = Column(DateTime, nullable=True)  # None tant que le prêt est en cours
 
     user = relationship("User")
     book = relationship("Book")
+
+    __table_args__ = (
+        # prêts en cours, amendes / retards d'un membre : WHERE user_id = ? AND date_retour < ?
+        Index(
+            "ix_prets_active_user_id_date_retour", "user_id", "date_retour",
+            postgresql_where=ACTIVE, sqlite_where=ACTIVE,
+        ),
+        # prêts en cours d'un livre (suppression admin)
+        Index("ix_prets_active_book_id", "book_id", postgresql_where=ACTIVE, sqlite_where=ACTIVE),
+        # prêts en retard, tous membres confondus
+        Index("ix_prets_active_date_retour", "date_retour", postgresql_where=ACTIVE, sqlite_where=ACTIVE),
+        # historique d'un membre (rapports)
+        Index("ix_prets_user_id", "user_id"),
+        # candidats à l'archivage, du plus ancien retour au plus récent
+        Index(
+            "ix_prets_returned_at", "returned_at",
+            postgresql_where=text("returned_at IS NOT NULL"),
+            sqlite_where=text("returned_at IS NOT NULL"),
+        ),
+        # SQLite : un id de prêt archivé ou supprimé n'est jamais réattribué
+        {"sqlite_autoincrement": True},
+    )
+
+
+class PretArchive(Base):
+    """
+    Prêts clos déplacés hors de `prets` par l'archivage (app.services.archive_service).
+    PostgreSQL : table partitionnée par mois de returned_at (migration v0005) ;
+    SQLite : table simple.
+    """
+    __tablename__ = "prets_archive"
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, nullable=False)
+    book_id = Column(Integer, nullable=False)
+    date_pret = Column(Date, nullable=False)
+    date_retour = Column(Date, nullable=True)
+    renouvellements = Column(Integer, nullable=False)
+    # clé de partition : fait partie de la clé primaire sur PostgreSQL
+    returned_at = Column(DateTime, primary_key=True)
+    archived_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_prets_archive_user_id", "user_id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.session import Base
@@ -12,3 +12,8 @@ class Reservation(Base):
 
     user = relationship("User")
     book = relationship("Book")
+
+    __table_args__ = (
+        # tête de file d'un livre : WHERE book_id = ? ORDER BY created_at, id LIMIT 1
+        Index("ix_reservations_book_id_created_at_id", "book_id", "created_at", "id"),
+    )
@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.audit import AuditEvent
+
+
+def insert_events(db: Session, rows: List[dict]) -> None:
+    """
+    Insertion groupée (INSERT multi-lignes), flush sans commit.
+    """
+    db.execute(insert(AuditEvent), rows)
+
+
+def list_events(
+    db: Session,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    before: Optional[Tuple[datetime, int]] = None,
+    action: Optional[str] = None,
+    limit: int = 50,
+) -> List[AuditEvent]:
+    """
+    Événements les plus récents d'abord, sur [since, until[, par curseur (created_at, id).
+    """
+    stmt = (
+        select(AuditEvent)
+        .order_by(AuditEvent.created_at.desc(), AuditEvent.id.desc())
+        .limit(limit)
+    )
+    if since is not None:
+        stmt = stmt.where(AuditEvent.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(AuditEvent.created_at < until)
+    if before is not None:
+        stmt = stmt.where(tuple_(AuditEvent.created_at, AuditEvent.id) < tuple_(*before))
+    if action is not None:
+        stmt = stmt.where(AuditEvent.action == action)
+    return db.execute(stmt).scalars().all()
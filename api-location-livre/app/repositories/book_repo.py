@@ -1,21 +1,181 @@
+from sqlalchemy import case, insert, select, text, update
 from sqlalchemy.orm import Session
 from app.models.book import Book
+from app.utils.text import search_terms
 
-def list_books(db: Session):
-    return db.query(Book).all()
+# Lectures des listes : colonnes seules (lignes Row, sans instance ORM ni identity map)
+BOOK_COLUMNS = (Book.id, Book.title, Book.author, Book.year, Book.total_copies, Book.available_copies)
+_BOOK_SELECT = ", ".join(f"books.{c.key}" for c in BOOK_COLUMNS)
 
-def search_books(db: Session, q: str):
+_PG_DOCUMENT = "f_unaccent(lower(books.title || ' ' || books.author))"
+
+_PG_SEARCH = f"""
+    SELECT {_BOOK_SELECT} FROM books, to_tsquery('simple', :tsquery) AS query
+    WHERE to_tsvector('simple', {_PG_DOCUMENT}) @@ query
+       OR {_PG_DOCUMENT} % :plain
+    ORDER BY greatest(
+        ts_rank(to_tsvector('simple', {_PG_DOCUMENT}), query),
+        similarity({_PG_DOCUMENT}, :plain)
+    ) DESC, books.id
+    LIMIT :limit OFFSET :offset
+"""
+
+_SQLITE_SEARCH = f"""
+    SELECT {_BOOK_SELECT} FROM books_fts JOIN books ON books.id = books_fts.rowid
+    WHERE books_fts MATCH :match
+    ORDER BY bm25(books_fts), books.id
+    LIMIT :limit OFFSET :offset
+"""
+
+# ========= REQUÊTES (partagées avec book_repo_async) =========
+
+def list_books_stmt(after_id: int | None = None, limit: int | None = None):
+    stmt = select(*BOOK_COLUMNS).order_by(Book.id.asc())
+    if after_id is not None:
+        stmt = stmt.where(Book.id > after_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+def search_books_stmt(dialect: str, q: str, offset: int, limit: int):
+    """
+    Requête de recherche plein texte adaptée au moteur, ou None si `q` ne contient
+    aucun mot.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return None
+
+    if dialect == "postgresql":
+        stmt = text(_PG_SEARCH).bindparams(
+            tsquery=" & ".join(f"{t}:*" for t in terms),
+            plain=" ".join(terms),
+            limit=limit,
+            offset=offset,
+        )
+        return stmt.columns(*BOOK_COLUMNS)
+    if dialect == "sqlite":
+        stmt = text(_SQLITE_SEARCH).bindparams(
+            match=" ".join(f'"{t}"*' for t in terms),
+            limit=limit,
+            offset=offset,
+        )
+        return stmt.columns(*BOOK_COLUMNS)
+
+    # autres moteurs : pas d'index dédié, simple filtre
     ql = f"%{q.lower()}%"
-    return db.query(Book).filter((Book.title.ilike(ql)) | (Book.author.ilike(ql))).all()
+    return (
+        select(*BOOK_COLUMNS)
+        .where((Book.title.ilike(ql)) | (Book.author.ilike(ql)))
+        .order_by(Book.id.asc())
+        .offset(offset)
+        .limit(limit)
+    )
+
+def decrement_copies_stmt(book_id: int):
+    return (
+        update(Book)
+        .where(Book.id == book_id, Book.available_copies > 0)
+        .values(available_copies=Book.available_copies - 1)
+        .returning(Book.available_copies)
+        .execution_options(synchronize_session=False)
+    )
+
+def increment_copies_stmt(book_id: int):
+    return (
+        update(Book)
+        .where(Book.id == book_id)
+        .values(available_copies=Book.available_copies + 1)
+        .returning(Book.available_copies)
+        .execution_options(synchronize_session=False)
+    )
+
+def decrement_copies_bulk_stmt(book_ids: list[int]):
+    """
+    Une copie de moins pour chaque livre qui en a encore ; RETURNING donne les
+    livres effectivement décrémentés.
+    """
+    return (
+        update(Book)
+        .where(Book.id.in_(book_ids), Book.available_copies > 0)
+        .values(available_copies=Book.available_copies - 1)
+        .returning(Book.id)
+        .execution_options(synchronize_session=False)
+    )
+
+def increment_copies_bulk_stmt(counts: dict[int, int]):
+    """
+    Rend `counts[book_id]` copies à chaque livre, en un seul UPDATE (CASE id ...).
+    """
+    return (
+        update(Book)
+        .where(Book.id.in_(list(counts)))
+        .values(available_copies=Book.available_copies + case(counts, value=Book.id, else_=0))
+        .returning(Book.id)
+        .execution_options(synchronize_session=False)
+    )
+
+def existing_book_ids_stmt(book_ids: list[int]):
+    return select(Book.id).where(Book.id.in_(book_ids))
+
+
+# ========= REPOSITORY =========
+
+def list_books(db: Session, after_id: int | None = None, limit: int | None = None):
+    """
+    Page du catalogue par id : lignes (Row) en lecture seule, mêmes attributs qu'un Book.
+    """
+    return db.execute(list_books_stmt(after_id, limit)).all()
+
+def iter_books(db: Session, batch_size: int = 1000):
+    """
+    Parcourt tous les livres par id via un curseur côté serveur (stream_results),
+    par lots de `batch_size` lignes, sans charger la table en mémoire.
+    Produit des tuples (id, title, author, year, total_copies, available_copies).
+    """
+    stmt = (
+        select(*BOOK_COLUMNS)
+        .order_by(Book.id.asc())
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in db.execute(stmt).partitions():
+        yield from partition
+
+
+def search_books(db: Session, q: str, offset: int = 0, limit: int = 50):
+    """
+    Recherche plein texte sur titre et auteur, triée par pertinence puis par id.
+    Insensible à la casse et aux accents ; chaque mot est traité comme un préfixe.
+    """
+    stmt = search_books_stmt(db.get_bind().dialect.name, q, offset, limit)
+    if stmt is None:
+        return []
+    return db.execute(stmt).all()
 
 def get_book(db: Session, book_id: int):
     return db.query(Book).get(book_id)
 
+IMPORT_COLUMNS = ("title", "author", "year", "total_copies", "available_copies")
+
+def bulk_insert_books(db: Session, rows: list[dict]) -> int:
+    """
+    Insère un lot de livres dans la transaction en cours (flush, sans commit) :
+    COPY FROM STDIN sur PostgreSQL, INSERT multi-lignes (executemany) ailleurs.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        raw = db.connection().connection.driver_connection
+        with raw.cursor() as cur:
+            with cur.copy(f"COPY books ({', '.join(IMPORT_COLUMNS)}) FROM STDIN") as copy:
+                for r in rows:
+                    copy.write_row([r[c] for c in IMPORT_COLUMNS])
+    else:
+        db.execute(insert(Book), rows)
+    return len(rows)
+
 def create_book(db: Session, **data):
     b = Book(**data)
     db.add(b)
-    db.commit()
-    db.refresh(b)
+    db.flush()
     return b
 
 def update_book(db: Session, book_id: int, **data):
@@ -24,13 +184,30 @@ def update_book(db: Session, book_id: int, **data):
         return None
     for k,v in data.items():
         setattr(b, k, v)
-    db.commit()
-    db.refresh(b)
+    db.flush()
     return b
 
 def delete_book(db: Session, book_id: int):
     b = db.query(Book).get(book_id)
     if not b: return False
     db.delete(b)
-    db.commit()
+    db.flush()
     return True
+
+def decrement_available_copies(db: Session, book_id: int) -> int | None:
+    """
+    Prend une copie en une seule requête conditionnelle :
+    UPDATE books SET available_copies = available_copies - 1
+    WHERE id = :id AND available_copies > 0 RETURNING available_copies.
+    Retourne le nouveau nombre de copies disponibles, ou None si le livre
+    n'existe pas ou n'a plus de copie. Ne commit pas.
+    """
+    return db.execute(decrement_copies_stmt(book_id)).scalar_one_or_none()
+
+def increment_available_copies(db: Session, book_id: int) -> int | None:
+    """
+    Rend une copie en une seule requête (pendant de decrement_available_copies).
+    Retourne le nouveau nombre de copies disponibles, ou None si le livre
+    n'existe pas. Ne commit pas.
+    """
+    return db.execute(increment_copies_stmt(book_id)).scalar_one_or_none()
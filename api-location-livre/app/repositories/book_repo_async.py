@@ -0,0 +1,59 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.book import Book
+from app.repositories.book_repo import (
+    decrement_copies_bulk_stmt,
+    decrement_copies_stmt,
+    existing_book_ids_stmt,
+    increment_copies_bulk_stmt,
+    increment_copies_stmt,
+    list_books_stmt,
+    search_books_stmt,
+)
+
+
+async def list_books(db: AsyncSession, after_id: int | None = None, limit: int | None = None):
+    return (await db.execute(list_books_stmt(after_id, limit))).all()
+
+
+async def search_books(db: AsyncSession, q: str, offset: int = 0, limit: int = 50):
+    """
+    Recherche plein texte (voir book_repo.search_books).
+    """
+    stmt = search_books_stmt(db.get_bind().dialect.name, q, offset, limit)
+    if stmt is None:
+        return []
+    return (await db.execute(stmt)).all()
+
+
+async def get_book(db: AsyncSession, book_id: int):
+    return await db.get(Book, book_id)
+
+
+async def decrement_available_copies(db: AsyncSession, book_id: int) -> int | None:
+    """
+    UPDATE conditionnel (voir book_repo.decrement_available_copies). Ne commit pas.
+    """
+    return (await db.execute(decrement_copies_stmt(book_id))).scalar_one_or_none()
+
+
+async def increment_available_copies(db: AsyncSession, book_id: int) -> int | None:
+    """
+    Rend une copie (voir book_repo.increment_available_copies). Ne commit pas.
+    """
+    return (await db.execute(increment_copies_stmt(book_id))).scalar_one_or_none()
+
+
+async def decrement_available_copies_bulk(db: AsyncSession, book_ids: list[int]) -> set[int]:
+    """
+    UPDATE conditionnel multi-lignes ; retourne les ids des livres décrémentés. Ne commit pas.
+    """
+    return set((await db.execute(decrement_copies_bulk_stmt(book_ids))).scalars().all())
+
+
+async def increment_available_copies_bulk(db: AsyncSession, counts: dict[int, int]) -> set[int]:
+    return set((await db.execute(increment_copies_bulk_stmt(counts))).scalars().all())
+
+
+async def existing_book_ids(db: AsyncSession, book_ids: list[int]) -> set[int]:
+    return set((await db.execute(existing_book_ids_stmt(book_ids))).scalars().all())
@@ -0,0 +1,84 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.models.notification import Notification, NotificationOutbox
+from app.models.user import User
+
+
+def create_notification(db: Session, **data) -> Notification:
+    """
+    Insère la notification et son entrée dans la file d'envoi (flush, sans commit).
+    """
+    n = Notification(**data)
+    db.add(n)
+    db.flush()
+    db.add(NotificationOutbox(notification_id=n.id))
+    db.flush()
+    return n
+
+
+def list_notifications(
+    db: Session,
+    user_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+    limit: int = 50,
+    unread_only: bool = False,
+) -> List[Notification]:
+    """
+    Notifications les plus récentes d'abord, par curseur sur l'id (keyset).
+    """
+    stmt = select(Notification).order_by(Notification.id.desc()).limit(limit)
+    if user_id is not None:
+        stmt = stmt.where(Notification.user_id == user_id)
+    if before_id is not None:
+        stmt = stmt.where(Notification.id < before_id)
+    if unread_only:
+        stmt = stmt.where(Notification.lu.is_(False))
+    return db.execute(stmt).scalars().all()
+
+
+def mark_read(db: Session, notification_id: int, user_id: int) -> Optional[Notification]:
+    n = db.get(Notification, notification_id)
+    if not n or n.user_id != user_id:
+        return None
+    n.lu = True
+    db.flush()
+    return n
+
+
+def claim_outbox_batch(db: Session, batch_size: int):
+    """
+    Réserve un lot de la file d'envoi. FOR UPDATE SKIP LOCKED sur PostgreSQL :
+    plusieurs workers (ou services) peuvent vider la file sans se gêner.
+    Retourne des tuples (outbox_id, notification_id, user_id, email, type, message).
+    """
+    stmt = (
+        select(
+            NotificationOutbox.id,
+            Notification.id,
+            Notification.user_id,
+            User.email,
+            Notification.type,
+            Notification.message,
+        )
+        .join(Notification, Notification.id == NotificationOutbox.notification_id)
+        .join(User, User.id == Notification.user_id)
+        .order_by(NotificationOutbox.id.asc())
+        .limit(batch_size)
+        .with_for_update(of=NotificationOutbox, skip_locked=True)
+    )
+    return db.execute(stmt).all()
+
+
+def complete_outbox_batch(db: Session, outbox_ids: List[int], notification_ids: List[int]) -> None:
+    db.execute(delete(NotificationOutbox).where(NotificationOutbox.id.in_(outbox_ids)))
+    db.execute(
+        update(Notification)
+        .where(Notification.id.in_(notification_ids))
+        .values(delivered_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.flush()
@@ -0,0 +1,78 @@
+from datetime import date, datetime
+from typing import Iterable, List, Set
+
+from sqlalchemy import delete, insert, literal, select, text
+from sqlalchemy.orm import Session
+
+from app.models.pret import Pret, PretArchive
+
+ARCHIVED_COLUMNS = ("id", "user_id", "book_id", "date_pret", "date_retour", "renouvellements", "returned_at")
+
+
+def archivable_prets(db: Session, cutoff: datetime, limit: int) -> List:
+    """
+    (id, returned_at) des `limit` prêts rendus avant `cutoff`, du plus ancien
+    retour au plus récent (index partiel ix_prets_returned_at).
+    Verrouillés avec SKIP LOCKED sur PostgreSQL : deux archiveurs ne se disputent pas un lot.
+    """
+    stmt = (
+        select(Pret.id, Pret.returned_at)
+        .where(Pret.returned_at.is_not(None), Pret.returned_at < cutoff)
+        .order_by(Pret.returned_at.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return db.execute(stmt).all()
+
+
+def returned_prets_for_book(db: Session, book_id: int) -> List:
+    """
+    (id, returned_at) des prêts rendus d'un livre encore présents dans `prets`.
+    """
+    stmt = (
+        select(Pret.id, Pret.returned_at)
+        .where(Pret.book_id == book_id, Pret.returned_at.is_not(None))
+        .with_for_update()
+    )
+    return db.execute(stmt).all()
+
+
+def _month_start(ts: datetime) -> date:
+    return date(ts.year, ts.month, 1)
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + d.month // 12, d.month % 12 + 1, 1)
+
+
+def ensure_partitions(db: Session, returned_at: Iterable[datetime]) -> Set[date]:
+    """
+    PostgreSQL : crée les partitions mensuelles de prets_archive couvrant `returned_at`
+    (`prets_archive_AAAA_MM`, bornes [1er du mois, 1er du mois suivant[).
+    Sans effet sur les autres moteurs. Retourne les mois couverts.
+    """
+    months = {_month_start(ts) for ts in returned_at}
+    if db.get_bind().dialect.name != "postgresql":
+        return months
+    for month in sorted(months):
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS prets_archive_{month:%Y_%m} PARTITION OF prets_archive"
+            f" FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_next_month(month):%Y-%m-%d}')"
+        ))
+    return months
+
+
+def move_to_archive(db: Session, pret_ids: List[int], archived_at: datetime) -> int:
+    """
+    Copie les prêts `pret_ids` dans prets_archive (INSERT ... SELECT) puis les
+    supprime de `prets`, dans la transaction courante. Retourne le nombre de prêts déplacés.
+    """
+    source = select(
+        *(getattr(Pret, name) for name in ARCHIVED_COLUMNS),
+        literal(archived_at).label("archived_at"),
+    ).where(Pret.id.in_(pret_ids))
+    db.execute(insert(PretArchive).from_select([*ARCHIVED_COLUMNS, "archived_at"], source))
+    result = db.execute(
+        delete(Pret).where(Pret.id.in_(pret_ids)).execution_options(synchronize_session=False)
+    )
+    return result.rowcount
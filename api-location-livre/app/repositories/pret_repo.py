@@ -1,9 +1,10 @@
-from datetime import date
+from datetime import date, datetime
 from typing import Optional, List
 
+from sqlalchemy import Date, Integer, Row, cast, func, insert, literal, literal_column, select, union_all, update
 from sqlalchemy.orm import Session
 
-from app.models.pret import Pret
+from app.models.pret import Pret, PretArchive
 
 
 def create_pret(db: Session, **data) -> Pret:
@@ -13,8 +14,7 @@ def create_pret(db: Session, **data) -> Pret:
     """
     pret = Pret(**data)
     db.add(pret)
-    db.commit()
-    db.refresh(pret)
+    db.flush()
     return pret
 
 
@@ -25,37 +25,67 @@ def get_pret(db: Session, pret_id: int) -> Optional[Pret]:
     return db.get(Pret, pret_id)
 
 
-def list_prets_by_user(db: Session, user_id: int) -> List[Pret]:
+# ========= LECTURE SEULE (lignes Row, sans instance ORM) =========
+
+
+def _pret_columns(model):
+    return (
+        model.id, model.user_id, model.book_id, model.date_pret,
+        model.date_retour, model.renouvellements, model.returned_at,
+    )
+
+
+PRET_COLUMNS = _pret_columns(Pret)
+
+
+def list_prets_by_user_stmt(user_id: int):
     """
-    Retourne la liste des prêts d'un utilisateur (liste éventuellement vide).
+    Prêts en cours par échéance (ordre de l'index partiel, sans tri).
     """
     return (
-        db.query(Pret)
-        .filter(Pret.user_id == user_id)
-        .all()
+        select(*PRET_COLUMNS)
+        .where(Pret.user_id == user_id, Pret.returned_at.is_(None))
+        .order_by(Pret.date_retour.asc(), Pret.id.asc())
     )
 
 
+def loan_history_stmt(user_id: int):
+    """
+    Historique complet d'un membre par id : `prets` (en cours et rendus récents)
+    UNION ALL `prets_archive`.
+    """
+    history = union_all(
+        select(*PRET_COLUMNS).where(Pret.user_id == user_id),
+        select(*_pret_columns(PretArchive)).where(PretArchive.user_id == user_id),
+    ).subquery()
+    return select(history).order_by(history.c.id.asc())
+
+
+def list_prets_by_user(db: Session, user_id: int, include_returned: bool = False) -> List[Row]:
+    """
+    Retourne les prêts en cours d'un utilisateur (liste éventuellement vide),
+    ou tout son historique, archive comprise, avec `include_returned`.
+    Lignes en lecture seule, mêmes attributs qu'un Pret.
+    """
+    stmt = loan_history_stmt(user_id) if include_returned else list_prets_by_user_stmt(user_id)
+    return db.execute(stmt).all()
+
+
 def update_pret(db: Session, pret: Pret) -> Pret:
     """
     Persiste les modifications faites sur un objet Pret déjà chargé.
     """
     db.add(pret)
-    db.commit()
-    db.refresh(pret)
+    db.flush()
     return pret
 
 
-def delete_pret(db: Session, pret_id: int) -> bool:
+def mark_returned(db: Session, pret_id: int) -> Optional[Pret]:
     """
-    Supprime un prêt. Retourne True si supprimé, False s'il n'existait pas.
+    Clôt un prêt en cours (returned_at) ; le prêt reste dans l'historique.
+    Retourne None si le prêt n'existe pas ou est déjà rendu.
     """
-    pret = db.get(Pret, pret_id)
-    if not pret:
-        return False
-    db.delete(pret)
-    db.commit()
-    return True
+    return db.execute(return_prets_stmt([pret_id])).scalars().first()
 
 
 def list_overdue_prets_for_user(db: Session, user_id: int, today: date) -> List[Pret]:
@@ -67,6 +97,7 @@ def list_overdue_prets_for_user(db: Session, user_id: int, today: date) -> List[
         .filter(
             Pret.user_id == user_id,
             Pret.date_retour < today,
+            Pret.returned_at.is_(None),
         )
         .all()
     )
@@ -74,7 +105,100 @@ def list_overdue_prets_for_user(db: Session, user_id: int, today: date) -> List[
 
 def count_active_prets_for_book(db: Session, book_id: int) -> int:
     """
-    Retourne le nombre de prêts associés à un livre.
-    À adapter si tu as une notion de prêt 'actif' (non retourné).
+    Retourne le nombre de prêts en cours d'un livre (index partiel ix_prets_active_book_id).
+    """
+    return db.query(Pret).filter(Pret.book_id == book_id, Pret.returned_at.is_(None)).count()
+
+
+# ========= TRAITEMENTS PAR LOT =========
+
+
+def insert_prets_stmt():
+    """
+    INSERT multi-lignes (une ligne de paramètres par prêt) avec RETURNING des
+    prêts créés, dans un ordre quelconque : les appelants les associent par book_id.
+    (sort_by_parameter_order forcerait un INSERT par ligne sur SQLite, faute de
+    colonne sentinelle.)
+    """
+    return insert(Pret).returning(Pret)
+
+
+def return_prets_stmt(pret_ids: List[int]):
+    """
+    Clôt les prêts encore en cours parmi `pret_ids` ; RETURNING donne ceux qui l'ont été.
+    """
+    return (
+        update(Pret)
+        .where(Pret.id.in_(pret_ids), Pret.returned_at.is_(None))
+        .values(returned_at=datetime.utcnow())
+        .returning(Pret)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+
+
+def _add_days(dialect: str, column, days: int):
+    if dialect == "sqlite":
+        return func.date(column, f"+{days} days", type_=Date)
+    # PostgreSQL : date + integer ; constante inline, pour ne pas dépendre du type du paramètre lié
+    return column + literal_column(str(int(days)), Integer)
+
+
+def renew_prets_stmt(dialect: str, pret_ids: List[int], days: int, max_renewals: int):
+    """
+    Prolonge en un UPDATE les prêts qui n'ont pas atteint `max_renewals`.
+    """
+    return (
+        update(Pret)
+        .where(
+            Pret.id.in_(pret_ids),
+            Pret.returned_at.is_(None),
+            Pret.renouvellements < max_renewals,
+        )
+        .values(
+            date_retour=_add_days(dialect, Pret.date_retour, days),
+            renouvellements=Pret.renouvellements + 1,
+        )
+        .returning(Pret)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+
+
+def pret_states_stmt(pret_ids: List[int]):
+    """
+    (id, returned_at) des prêts existants parmi `pret_ids` : qualifie les refus d'un lot.
+    """
+    return select(Pret.id, Pret.returned_at).where(Pret.id.in_(pret_ids))
+
+
+def _days_late(dialect: str, today: date):
+    # PostgreSQL : date - date donne directement un nombre de jours
+    if dialect == "sqlite":
+        return cast(func.julianday(literal(today)) - func.julianday(Pret.date_retour), Integer)
+    return literal(today) - Pret.date_retour
+
+
+def overdue_fines_stmt(dialect: str, user_id: int, today: date, fine_per_day: float):
+    """
+    Une seule requête : prêts en retard du membre, jours de retard, montant par
+    prêt et total (fonction fenêtre), via l'index (user_id, date_retour).
+    """
+    days = _days_late(dialect, today)
+    amount = days * literal(fine_per_day)
+    return (
+        select(
+            Pret.id,
+            days.label("jours_retard"),
+            amount.label("montant"),
+            func.sum(amount).over().label("total"),
+        )
+        .where(Pret.user_id == user_id, Pret.date_retour < today, Pret.returned_at.is_(None))
+        .order_by(Pret.date_retour.asc(), Pret.id.asc())
+    )
+
+
+def overdue_fines_for_user(db: Session, user_id: int, today: date, fine_per_day: float):
+    """
+    Retourne les lignes (id, jours_retard, montant, total) des prêts en retard.
     """
-    return db.query(Pret).filter(Pret.book_id == book_id).count()
+    stmt = overdue_fines_stmt(db.get_bind().dialect.name, user_id, today, fine_per_day)
+    return db.execute(stmt).all()
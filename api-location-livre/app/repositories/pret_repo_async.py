@@ -0,0 +1,72 @@
+from typing import List, Optional
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.pret import Pret
+from app.repositories.pret_repo import (
+    insert_prets_stmt,
+    list_prets_by_user_stmt,
+    loan_history_stmt,
+    pret_states_stmt,
+    renew_prets_stmt,
+    return_prets_stmt,
+)
+
+
+async def create_pret(db: AsyncSession, **data) -> Pret:
+    """
+    Crée un prêt à partir des champs passés en kwargs (flush, sans commit).
+    """
+    pret = Pret(**data)
+    db.add(pret)
+    await db.flush()
+    return pret
+
+
+async def get_pret(db: AsyncSession, pret_id: int) -> Optional[Pret]:
+    return await db.get(Pret, pret_id)
+
+
+async def list_prets_by_user(db: AsyncSession, user_id: int, include_returned: bool = False) -> List[Row]:
+    """
+    Prêts en cours d'un utilisateur, ou tout son historique archive comprise (voir pret_repo).
+    """
+    stmt = loan_history_stmt(user_id) if include_returned else list_prets_by_user_stmt(user_id)
+    return (await db.execute(stmt)).all()
+
+
+async def update_pret(db: AsyncSession, pret: Pret) -> Pret:
+    db.add(pret)
+    await db.flush()
+    return pret
+
+
+async def mark_returned(db: AsyncSession, pret_id: int) -> Optional[Pret]:
+    return (await db.execute(return_prets_stmt([pret_id]))).scalars().first()
+
+
+async def create_prets_bulk(db: AsyncSession, rows: List[dict]) -> List[Pret]:
+    """
+    Crée tous les prêts en un INSERT multi-lignes (flush, sans commit).
+    """
+    return (await db.execute(insert_prets_stmt(), rows)).scalars().all()
+
+
+async def return_prets_bulk(db: AsyncSession, pret_ids: List[int]) -> List[Pret]:
+    """
+    Clôt les prêts encore en cours parmi `pret_ids` ; retourne ceux qui l'ont été.
+    """
+    return (await db.execute(return_prets_stmt(pret_ids))).scalars().all()
+
+
+async def renew_prets_bulk(db: AsyncSession, pret_ids: List[int], days: int, max_renewals: int) -> List[Pret]:
+    stmt = renew_prets_stmt(db.get_bind().dialect.name, pret_ids, days, max_renewals)
+    return (await db.execute(stmt)).scalars().all()
+
+
+async def pret_states(db: AsyncSession, pret_ids: List[int]) -> dict:
+    """
+    {id: returned_at} des prêts existants parmi `pret_ids`.
+    """
+    return dict((await db.execute(pret_states_stmt(pret_ids))).all())
@@ -1,20 +1,55 @@
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 from app.models.reservation import Reservation
 
+
+def pop_next_reservation_stmt(book_id: int):
+    """
+    Retrait atomique de la tête de file d'un livre, en une seule requête :
+    DELETE ... WHERE id = (SELECT ... ORDER BY created_at, id LIMIT 1
+    FOR UPDATE SKIP LOCKED) RETURNING ...
+    Sur PostgreSQL, deux appels simultanés obtiennent deux réservations
+    différentes sans s'attendre (la ligne verrouillée par l'un est sautée par
+    l'autre). SQLite ignore FOR UPDATE : ses écritures sont sérialisées,
+    le DELETE ... RETURNING reste atomique.
+    L'index (book_id, created_at, id) sert directement la tête de file, sans tri.
+    """
+    head = (
+        select(Reservation.id)
+        .where(Reservation.book_id == book_id)
+        .order_by(Reservation.created_at.asc(), Reservation.id.asc())
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return (
+        delete(Reservation)
+        .where(Reservation.id == head)
+        .returning(Reservation)
+        .execution_options(synchronize_session=False)
+    )
+
+
+# file d'attente : colonnes seules (lignes Row, sans instance ORM)
+RESERVATION_COLUMNS = (Reservation.id, Reservation.user_id, Reservation.book_id, Reservation.created_at)
+
+
+def list_reservations_stmt(book_id: int):
+    return (
+        select(*RESERVATION_COLUMNS)
+        .where(Reservation.book_id == book_id)
+        .order_by(Reservation.created_at.asc(), Reservation.id.asc())
+    )
+
+
 def create_reservation(db: Session, **data) -> Reservation:
     r = Reservation(**data)
     db.add(r)
-    db.commit()
-    db.refresh(r)
+    db.flush()
     return r
 
 def pop_next_reservation(db: Session, book_id: int):
-    r = db.query(Reservation).filter(Reservation.book_id==book_id).order_by(Reservation.created_at.asc()).first()
-    if r:
-        db.delete(r)
-        db.commit()
-        return r
-    return None
+    return db.execute(pop_next_reservation_stmt(book_id)).scalars().first()
 
 def list_reservations(db: Session, book_id: int):
-    return db.query(Reservation).filter(Reservation.book_id==book_id).order_by(Reservation.created_at.asc()).all()
+    return db.execute(list_reservations_stmt(book_id)).all()
@@ -0,0 +1,22 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.reservation import Reservation
+from app.repositories.reservation_repo import list_reservations_stmt, pop_next_reservation_stmt
+
+
+async def create_reservation(db: AsyncSession, **data) -> Reservation:
+    r = Reservation(**data)
+    db.add(r)
+    await db.flush()
+    return r
+
+
+async def pop_next_reservation(db: AsyncSession, book_id: int):
+    """
+    Voir reservation_repo.pop_next_reservation_stmt (DELETE ... RETURNING, SKIP LOCKED).
+    """
+    return (await db.execute(pop_next_reservation_stmt(book_id))).scalars().first()
+
+
+async def list_reservations(db: AsyncSession, book_id: int):
+    return (await db.execute(list_reservations_stmt(book_id))).all()
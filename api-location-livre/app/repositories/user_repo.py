@@ -7,6 +7,11 @@ def get_by_email(db: Session, email: str) -> User | None:
 def create_user(db: Session, email: str, password_hash: str, full_name: str, role: str) -> User:
     u = User(email=email, password_hash=password_hash, full_name=full_name, role=role)
     db.add(u)
-    db.commit()
-    db.refresh(u)
+    db.flush()
     return u
+
+def update_password_hash(db: Session, user: User, password_hash: str) -> User:
+    user.password_hash = password_hash
+    db.add(user)
+    db.flush()
+    return user
@@ -1,7 +1,23 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session
+from app.db.deps import get_db
+from app.schemas.audit import AuditPage
+from app.services import audit_service
+from app.utils.pagination import DEFAULT_LIMIT, MAX_LIMIT
 from app.utils.security import require_role
 router = APIRouter(tags=["audit"])
 
-@router.get("/admin/audit", dependencies=[Depends(require_role("admin"))])
-def consulter_audit():
-    return [{"id": 1, "action": "CONNEXION"}]
+@router.get("/admin/audit", dependencies=[Depends(require_role("admin"))], response_model=AuditPage)
+def consulter_audit(
+    depuis: Optional[datetime] = Query(None),
+    jusqua: Optional[datetime] = Query(None),
+    action: Optional[str] = Query(None),
+    after: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    """Journal d'audit, les plus récents d'abord, filtrable par période [depuis, jusqua[ et par action."""
+    return ORJSONResponse(audit_service.list_page(db, after, limit, since=depuis, until=jusqua, action=action))
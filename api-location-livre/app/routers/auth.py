@@ -1,21 +1,23 @@
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import AliasChoices, BaseModel, EmailStr, Field
 from sqlalchemy.orm import Session
 
 from app.db.deps import get_db
+from app.services import audit_service, user_service
 from app.utils.security import (
-    hash_password,
-    verify_password,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
     decode_refresh_token,
     get_current_user,
 )
 from app.repositories import user_repo
-from app.models.user import User
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -31,7 +33,7 @@ class InscriptionRequest(BaseModel):
 
 class UserOut(BaseModel):
     id: int
-    nom: str
+    nom: str = Field(..., validation_alias=AliasChoices("nom", "full_name"))
     email: EmailStr
     role: str
 
@@ -57,25 +59,29 @@ class RefreshRequest(BaseModel):
     response_model=UserOut,
     status_code=status.HTTP_201_CREATED,
 )
-def inscription(
+async def inscription(
     data: InscriptionRequest,
     db: Session = Depends(get_db),
 ):
     """
     Inscription d'un nouvel utilisateur "membre".
+    Le hachage bcrypt part dans le pool de processus dédié ; les accès base
+    restent sur le threadpool.
     """
-    existing = user_repo.get_by_email(db, data.email)
+    existing = await run_in_threadpool(user_repo.get_by_email, db, data.email)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Un utilisateur existe déjà avec cet email",
         )
 
-    user = user_repo.create(
+    password_hash = await hash_password_async(data.motDePasse)
+    user = await run_in_threadpool(
+        user_service.register,
         db,
-        nom=data.nom,
         email=data.email,
-        password_hash=hash_password(data.motDePasse),
+        password_hash=password_hash,
+        full_name=data.nom,
         role="membre",
     )
 
@@ -87,21 +93,33 @@ def inscription(
     response_model=TokenResponse,
     status_code=status.HTTP_200_OK,
 )
-def login(
+async def login(
     form: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
 ):
     """
     Connexion avec email + mot de passe.
     Retourne un access_token + refresh_token.
+    Un hash produit avec d'anciens paramètres bcrypt est refait au passage.
     """
-    user = user_repo.get_by_email(db, form.username)
-    if not user or not verify_password(form.password, user.password_hash):
+    user = await run_in_threadpool(user_repo.get_by_email, db, form.username)
+    if not user or not await verify_password_async(form.password, user.password_hash):
+        audit_service.record(
+            "CONNEXION_ECHEC",
+            user_id=user.id if user else None,
+            details={"email": form.username},
+        )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Identifiants invalides",
         )
 
+    if needs_rehash(user.password_hash):
+        new_hash = await hash_password_async(form.password)
+        await run_in_threadpool(user_service.rehash_password, db, user, new_hash)
+
+    audit_service.record("CONNEXION", user_id=user.id)
+
     payload = {"sub": user.email, "role": user.role}
     access_token = create_access_token(payload)
     refresh_token = create_refresh_token(payload)
@@ -1,20 +1,40 @@
-from typing import List, Optional
-from fastapi import APIRouter, Query, Depends
-from sqlalchemy.orm import Session
-from app.db.deps import get_db
-from app.schemas.book import BookOut
+from typing import Optional
+from fastapi import APIRouter, Query, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.deps import get_async_db
+from app.schemas.book import BookPage
 from app.services import book_service
+from app.utils.http_cache import conditional_json
+from app.utils.pagination import DEFAULT_LIMIT, MAX_LIMIT
 
 router = APIRouter(tags=["catalogue"])
 
-@router.get("/catalogue", response_model=List[BookOut])
-def catalogue_simple(db: Session = Depends(get_db)):
-    return book_service.list_all(db)
+@router.get("/catalogue", response_model=BookPage)
+async def catalogue_simple(
+    request: Request,
+    after: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return conditional_json(request, await book_service.list_page_async(db, after, limit))
 
-@router.get("/membre/catalogue", response_model=List[BookOut])
-def catalogue_membre(db: Session = Depends(get_db)):
-    return book_service.list_all(db)
+@router.get("/membre/catalogue", response_model=BookPage)
+async def catalogue_membre(
+    request: Request,
+    after: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return conditional_json(request, await book_service.list_page_async(db, after, limit))
 
-@router.get("/catalogue/recherche", response_model=List[BookOut])
-def recherche_catalogue(q: Optional[str] = Query(None, min_length=1), db: Session = Depends(get_db)):
-    return book_service.search(db, q) if q else book_service.list_all(db)
+@router.get("/catalogue/recherche", response_model=BookPage)
+async def recherche_catalogue(
+    request: Request,
+    q: Optional[str] = Query(None, min_length=1),
+    after: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if not q:
+        return conditional_json(request, await book_service.list_page_async(db, after, limit))
+    return conditional_json(request, await book_service.search_async(db, q, after, limit))
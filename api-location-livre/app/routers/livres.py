@@ -1,13 +1,19 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, status, HTTPException
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from fastapi import APIRouter, Depends, Query, Request, status, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError, field_validator, ConfigDict
 from sqlalchemy.orm import Session
 
 from app.db.deps import get_db
-from app.schemas.book import BookOut
+from app.db.session import SessionLocal
+from app.schemas.book import BookOut, BookPage
 from app.services import book_service
-from app.utils.security import require_role
+from app.utils.bulk_io import iter_records
+from app.utils.http_cache import conditional_json
+from app.utils.pagination import DEFAULT_LIMIT, MAX_LIMIT
+from app.utils.security import Principal, get_current_user, require_role
 
 router = APIRouter(tags=["livres"])
 
@@ -44,12 +50,17 @@ class LivreUpdate(BaseModel):
 
 @router.get(
     "/livres",
-    response_model=list[BookOut],
+    response_model=BookPage,
     status_code=status.HTTP_200_OK,
 )
-def list_livres(db: Session = Depends(get_db)):
-    """Lister tous les livres."""
-    return book_service.list_all(db)
+def list_livres(
+    request: Request,
+    after: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    """Lister les livres, page par page (curseur `after`)."""
+    return conditional_json(request, book_service.list_page(db, after, limit))
 
 
 @router.get(
@@ -57,36 +68,131 @@ def list_livres(db: Session = Depends(get_db)):
     response_model=BookOut,
     status_code=status.HTTP_200_OK,
 )
-def get_livre(livre_id: int, db: Session = Depends(get_db)):
-    """Récupérer un livre par son ID."""
+def get_livre(livre_id: int, request: Request, db: Session = Depends(get_db)):
+    """Récupérer un livre par son ID (ETag / If-None-Match pris en charge)."""
     b = book_service.get_one(db, livre_id)
     if not b:
         raise HTTPException(status_code=404, detail="Livre introuvable")
-    return b
+    return conditional_json(request, b)
 
 
-# ========= ADMIN – CRÉATION / MISE À JOUR / SUPPRESSION =========
+# ========= ADMIN – EXPORT =========
 
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
 
-@router.post(
-    "/admin/livres",
+
+@router.get(
+    "/admin/livres/export",
     dependencies=[Depends(require_role("admin"))],
-    response_model=BookOut,
-    status_code=status.HTTP_201_CREATED,
+    status_code=status.HTTP_200_OK,
 )
-def admin_create_book(payload: LivreCreate, db: Session = Depends(get_db)):
-    data_in = payload.model_dump(by_alias=True)
+def admin_export_books(fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$")):
+    """
+    Exporter tout le catalogue en flux (NDJSON ou CSV).
+    Le flux ouvre sa propre session : celle de get_db est fermée avant l'envoi du corps.
+    """
 
+    def stream():
+        db = SessionLocal()
+        try:
+            yield from book_service.export_catalogue(db, fmt)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="catalogue.{fmt}"'},
+    )
+
+
+# ========= ADMIN – IMPORT =========
+
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_MAX_ERRORS = 1000
+
+
+def _book_data(payload: LivreCreate) -> dict:
     data = {
-        "title": data_in["titre"],
-        "author": data_in["auteur"],
-        "year": data_in["annee"],
-        "total_copies": data_in["nombreCopies"],
-        "available_copies": data_in.get("copiesDisponibles"),
+        "title": payload.titre,
+        "author": payload.auteur,
+        "year": payload.annee,
+        "total_copies": payload.nombre_copies,
+        "available_copies": payload.copies_disponibles,
     }
-
     if data["available_copies"] is None:
         data["available_copies"] = data["total_copies"]
+    return data
+
+
+@router.post(
+    "/admin/livres/import",
+    dependencies=[Depends(require_role("admin"))],
+    status_code=status.HTTP_200_OK,
+)
+async def admin_import_books(
+    request: Request,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Importer des livres depuis un fichier NDJSON ou CSV envoyé tel quel dans le corps
+    (champs de LivreCreate : titre, auteur, annee, nombreCopies, copiesDisponibles).
+    Le fichier est lu au fil de l'eau et inséré par lots de IMPORT_CHUNK_SIZE lignes valides,
+    une transaction par lot. Les lignes invalides sont ignorées et listées dans `erreurs`
+    (au plus IMPORT_MAX_ERRORS).
+    """
+    report = {"importes": 0, "rejetes": 0, "erreurs": []}
+    chunk: list = []
+
+    def reject(line_no: int, errors: list) -> None:
+        report["rejetes"] += 1
+        if len(report["erreurs"]) < IMPORT_MAX_ERRORS:
+            report["erreurs"].append({"ligne": line_no, "erreurs": errors})
+
+    async def flush() -> None:
+        report["importes"] += await run_in_threadpool(
+            book_service.import_books, db, chunk, actor_id=current_user.id
+        )
+        chunk.clear()
+
+    async for line_no, record, parse_error in iter_records(request.stream(), fmt):
+        if parse_error:
+            reject(line_no, [parse_error])
+            continue
+        try:
+            data = _book_data(LivreCreate.model_validate(record))
+        except ValidationError as e:
+            reject(line_no, [f"{'.'.join(map(str, err['loc']))} : {err['msg']}" for err in e.errors()])
+            continue
+        if data["available_copies"] > data["total_copies"]:
+            reject(line_no, ["copiesDisponibles ne peut pas être supérieure à nombreCopies"])
+            continue
+        chunk.append(data)
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            await flush()
+
+    if chunk:
+        await flush()
+    return report
+
+
+# ========= ADMIN – CRÉATION / MISE À JOUR / SUPPRESSION =========
+
+
+@router.post(
+    "/admin/livres",
+    dependencies=[Depends(require_role("admin"))],
+    response_model=BookOut,
+    status_code=status.HTTP_201_CREATED,
+)
+def admin_create_book(
+    payload: LivreCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    data = _book_data(payload)
 
     if data["available_copies"] > data["total_copies"]:
         raise HTTPException(
@@ -94,7 +200,7 @@ def admin_create_book(payload: LivreCreate, db: Session = Depends(get_db)):
             detail="copiesDisponibles ne peut pas être supérieure à nombreCopies",
         )
 
-    return book_service.admin_create(db, **data)
+    return book_service.admin_create(db, actor_id=current_user.id, **data)
 
 
 @router.put(
@@ -107,6 +213,7 @@ def admin_update_book(
     livre_id: int,
     payload: LivreUpdate,
     db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     din = {k: v for k, v in payload.model_dump(by_alias=True).items() if v is not None}
 
@@ -132,7 +239,7 @@ def admin_update_book(
             detail="copiesDisponibles ne peut pas être supérieure à nombreCopies",
         )
 
-    b = book_service.admin_update(db, livre_id, **data)
+    b = book_service.admin_update(db, livre_id, actor_id=current_user.id, **data)
     if not b:
         raise HTTPException(status_code=404, detail="Livre introuvable")
     return b
@@ -143,8 +250,12 @@ def admin_update_book(
     dependencies=[Depends(require_role("admin"))],
     status_code=status.HTTP_200_OK,
 )
-def admin_delete_book(livre_id: int, db: Session = Depends(get_db)):
-    ok, error = book_service.admin_delete(db, livre_id)
+def admin_delete_book(
+    livre_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    ok, error = book_service.admin_delete(db, livre_id, actor_id=current_user.id)
 
     if not ok:
         if error == "book_not_found":
@@ -0,0 +1,49 @@
+import os
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import PlainTextResponse
+
+from app.config.settings import get_settings
+from app.core.metrics import render_prometheus
+from app.db.session import async_engine, engine, pool_metrics
+from app.utils.security import require_role
+
+router = APIRouter(tags=["metrics"])
+# monté à la racine, comme /health : cible de scrape Prometheus
+prometheus_router = APIRouter(tags=["metrics"])
+
+
+@prometheus_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics():
+    """Latences, requêtes en cours, statuts par route et requêtes SQL (texte Prometheus)."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@router.get(
+    "/admin/metrics/pool",
+    dependencies=[Depends(require_role("admin"))],
+    status_code=status.HTTP_200_OK,
+)
+def pool_stats():
+    """
+    État des pools de connexions de ce processus (un pool sync + un pool async).
+    Pour dimensionner face au max_connections de PostgreSQL, multiplier
+    maxConnectionsPerProcess par le nombre de workers de chaque service.
+    """
+    settings = get_settings()
+    pools = {
+        "sync": pool_metrics["sync"].snapshot(engine.pool),
+        "async": pool_metrics["async"].snapshot(async_engine.sync_engine.pool),
+    }
+    return {
+        "pid": os.getpid(),
+        "config": {
+            "poolSize": settings.DB_POOL_SIZE,
+            "maxOverflow": settings.DB_MAX_OVERFLOW,
+            "poolTimeout": settings.DB_POOL_TIMEOUT,
+            "poolRecycle": settings.DB_POOL_RECYCLE,
+            "prePing": settings.DB_POOL_PRE_PING,
+        },
+        "maxConnectionsPerProcess": sum(p.get("maxConnections", 0) for p in pools.values()),
+        "pools": pools,
+    }
@@ -1,14 +1,18 @@
-from typing import List
-from fastapi import APIRouter, status, Depends
+from typing import Optional
+from fastapi import APIRouter, status, Depends, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field, ConfigDict
+from sqlalchemy.orm import Session
 
-from app.utils.security import require_role
+from app.db.deps import get_db
+from app.schemas.notification import NotificationOut, NotificationPage
+from app.services import notification_service
+from app.utils.pagination import DEFAULT_LIMIT, MAX_LIMIT
+from app.utils.security import require_role, get_current_user
 
 
 router = APIRouter(tags=["notifications"])
 
-NOTIFS: List[dict] = []
-
 
 class RappelRetour(BaseModel):
     model_config = ConfigDict(populate_by_name=True, extra="forbid")
@@ -30,62 +34,91 @@ class ConfirmationEmprunt(BaseModel):
 @router.get(
     "/admin/notifications",
     dependencies=[Depends(require_role("admin"))],
+    response_model=NotificationPage,
     status_code=status.HTTP_200_OK,
 )
-def admin_list_notifications():
-    """Voir toutes les notifications générées."""
-    return NOTIFS
+def admin_list_notifications(
+    after: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    """Voir les notifications générées, les plus récentes d'abord."""
+    return ORJSONResponse(notification_service.list_page(db, after, limit))
 
 
 @router.post(
     "/admin/notifications/rappel-retour",
     dependencies=[Depends(require_role("admin"))],
+    response_model=NotificationOut,
     status_code=status.HTTP_201_CREATED,
 )
-def admin_create_rappel_retour(payload: RappelRetour):
-    nid = len(NOTIFS) + 1
-    notif = {
-        "id": nid,
-        "type": "rappel_retour",
-        "pretId": payload.pret_id,
-        "message": f"Rappel : retour du prêt {payload.pret_id}",
-        "lu": False,
-    }
-    NOTIFS.append(notif)
-    return notif
+def admin_create_rappel_retour(payload: RappelRetour, db: Session = Depends(get_db)):
+    return notification_service.notify_pret(
+        db,
+        payload.pret_id,
+        "rappel_retour",
+        f"Rappel : retour du prêt {payload.pret_id}",
+    )
 
 
 @router.post(
     "/admin/notifications/retard",
     dependencies=[Depends(require_role("admin"))],
+    response_model=NotificationOut,
     status_code=status.HTTP_201_CREATED,
 )
-def admin_create_notification_retard(payload: Retard):
-    nid = len(NOTIFS) + 1
-    notif = {
-        "id": nid,
-        "type": "retard",
-        "pretId": payload.pret_id,
-        "message": f"Retard : prêt {payload.pret_id} ({payload.jours_retard} jours)",
-        "lu": False,
-    }
-    NOTIFS.append(notif)
-    return notif
+def admin_create_notification_retard(payload: Retard, db: Session = Depends(get_db)):
+    return notification_service.notify_pret(
+        db,
+        payload.pret_id,
+        "retard",
+        f"Retard : prêt {payload.pret_id} ({payload.jours_retard} jours)",
+    )
 
 
 @router.post(
     "/admin/notifications/confirmation-emprunt",
     dependencies=[Depends(require_role("admin"))],
+    response_model=NotificationOut,
     status_code=status.HTTP_201_CREATED,
 )
-def admin_confirm_emprunt(payload: ConfirmationEmprunt):
-    nid = len(NOTIFS) + 1
-    notif = {
-        "id": nid,
-        "type": "confirmation_emprunt",
-        "pretId": payload.pret_id,
-        "message": f"Confirmation : prêt {payload.pret_id} enregistré",
-        "lu": False,
-    }
-    NOTIFS.append(notif)
-    return notif
+def admin_confirm_emprunt(payload: ConfirmationEmprunt, db: Session = Depends(get_db)):
+    return notification_service.notify_pret(
+        db,
+        payload.pret_id,
+        "confirmation_emprunt",
+        f"Confirmation : prêt {payload.pret_id} enregistré",
+    )
+
+
+@router.get(
+    "/membre/notifications",
+    dependencies=[Depends(require_role("membre", "bibliothecaire", "admin"))],
+    response_model=NotificationPage,
+    status_code=status.HTTP_200_OK,
+)
+def membre_list_notifications(
+    after: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    non_lues: bool = Query(False, alias="nonLues"),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """Notifications de l'utilisateur connecté ; `nonLues=true` pour les seules non lues."""
+    return ORJSONResponse(
+        notification_service.list_page(db, after, limit, user_id=user.id, unread_only=non_lues)
+    )
+
+
+@router.put(
+    "/membre/notifications/{notification_id}/lu",
+    dependencies=[Depends(require_role("membre", "bibliothecaire", "admin"))],
+    response_model=NotificationOut,
+    status_code=status.HTTP_200_OK,
+)
+def membre_marquer_lue(
+    notification_id: int,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    return notification_service.mark_read(db, notification_id, user.id)
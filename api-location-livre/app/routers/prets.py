@@ -1,14 +1,14 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field, ConfigDict
 
-from app.db.deps import get_db
-from app.models.user import User
-from app.schemas.pret import PretOut
+from app.db.deps import get_async_db
+from app.schemas.pret import PretLotResult, PretOut
 from app.services import pret_service
-from app.utils.security import get_current_user
+from app.utils.security import Principal, get_current_user_async, require_role_async
 
 
 router = APIRouter(tags=["prets"])
@@ -19,11 +19,16 @@ router = APIRouter(tags=["prets"])
     response_model=List[PretOut],
     status_code=status.HTTP_200_OK,
 )
-def membre_list_prets(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def membre_list_prets(
+    historique: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async),
 ):
-    return pret_service.list_prets_by_user(db, user_id=current_user.id)
+    """Prêts en cours du membre ; `historique=true` inclut les prêts rendus."""
+    prets = await pret_service.list_prets_by_user_async(
+        db, user_id=current_user.id, include_returned=historique
+    )
+    return ORJSONResponse(PretOut.dump_many(prets))
 
 
 class PretCreatePayload(BaseModel):
@@ -37,9 +42,83 @@ class PretCreatePayload(BaseModel):
     response_model=PretOut,
     status_code=status.HTTP_201_CREATED,
 )
-def membre_create_pret(
+async def membre_create_pret(
     payload: PretCreatePayload,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async),
 ):
-    return pret_service.create_pret(db, user_id=current_user.id, book_id=payload.livre_id)
+    return await pret_service.create_pret_async(db, user_id=current_user.id, book_id=payload.livre_id)
+
+
+# ========= TRAITEMENTS PAR LOT (BANQUE DE PRÊT) =========
+
+LOT_MAX = 50
+
+
+class PretLotEmprunt(BaseModel):
+    livre_ids: List[int] = Field(..., alias="livreIds", min_length=1, max_length=LOT_MAX)
+
+    model_config = ConfigDict(populate_by_name=True, extra="forbid")
+
+
+class PretLotEmpruntPourMembre(PretLotEmprunt):
+    utilisateur_id: int = Field(..., alias="utilisateurId")
+
+
+class PretLotIds(BaseModel):
+    pret_ids: List[int] = Field(..., alias="pretIds", min_length=1, max_length=LOT_MAX)
+
+    model_config = ConfigDict(populate_by_name=True, extra="forbid")
+
+
+@router.post(
+    "/membre/prets/lot",
+    response_model=PretLotResult,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK,
+)
+async def membre_create_prets_lot(
+    payload: PretLotEmprunt,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    """Emprunter plusieurs livres en une fois ; un résultat par livre."""
+    results = await pret_service.checkout_batch_async(db, current_user.id, payload.livre_ids)
+    return {"resultats": results}
+
+
+@router.post(
+    "/bibliothecaire/prets/lot",
+    dependencies=[Depends(require_role_async("bibliothecaire", "admin"))],
+    response_model=PretLotResult,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK,
+)
+async def biblio_create_prets_lot(payload: PretLotEmpruntPourMembre, db: AsyncSession = Depends(get_async_db)):
+    """Enregistrer au comptoir plusieurs emprunts pour un membre."""
+    results = await pret_service.checkout_batch_async(db, payload.utilisateur_id, payload.livre_ids)
+    return {"resultats": results}
+
+
+@router.post(
+    "/bibliothecaire/prets/retours",
+    dependencies=[Depends(require_role_async("bibliothecaire", "admin"))],
+    response_model=PretLotResult,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK,
+)
+async def biblio_retours_lot(payload: PretLotIds, db: AsyncSession = Depends(get_async_db)):
+    """Enregistrer le retour de plusieurs prêts."""
+    return {"resultats": await pret_service.return_batch_async(db, payload.pret_ids)}
+
+
+@router.post(
+    "/bibliothecaire/prets/renouvellements",
+    dependencies=[Depends(require_role_async("bibliothecaire", "admin"))],
+    response_model=PretLotResult,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK,
+)
+async def biblio_renouvellements_lot(payload: PretLotIds, db: AsyncSession = Depends(get_async_db)):
+    """Renouveler plusieurs prêts."""
+    return {"resultats": await pret_service.renew_batch_async(db, payload.pret_ids)}
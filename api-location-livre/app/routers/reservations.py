@@ -1,25 +1,26 @@
 from typing import List
 from fastapi import APIRouter, Depends, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
-from app.db.deps import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.deps import get_async_db
 from app.schemas.reservation import ReservationOut
 from app.services import reservation_service
-from app.utils.security import require_role, get_current_user
+from app.utils.security import require_role_async, get_current_user_async
 
 router = APIRouter(tags=["reservations"])
 
 class ReservationCreate(BaseModel):
     livre_id: int = Field(..., alias="livreId")
 
-@router.post("/reservations", dependencies=[Depends(require_role("membre","bibliothecaire","admin"))], response_model=ReservationOut, status_code=status.HTTP_201_CREATED)
-def create_reservation(payload: ReservationCreate, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    return reservation_service.create_reservation(db, user_id=user.id, book_id=payload.livre_id)
+@router.post("/reservations", dependencies=[Depends(require_role_async("membre","bibliothecaire","admin"))], response_model=ReservationOut, status_code=status.HTTP_201_CREATED)
+async def create_reservation(payload: ReservationCreate, db: AsyncSession = Depends(get_async_db), user=Depends(get_current_user_async)):
+    return await reservation_service.create_reservation_async(db, user_id=user.id, book_id=payload.livre_id)
 
-@router.get("/bibliothecaire/reservations/file-attente/{livre_id}", dependencies=[Depends(require_role("bibliothecaire","admin"))], response_model=List[ReservationOut], status_code=status.HTTP_200_OK)
-def biblio_file_attente(livre_id: int, db: Session = Depends(get_db)):
-    return reservation_service.list_queue(db, livre_id)
+@router.get("/bibliothecaire/reservations/file-attente/{livre_id}", dependencies=[Depends(require_role_async("bibliothecaire","admin"))], response_model=List[ReservationOut], status_code=status.HTTP_200_OK)
+async def biblio_file_attente(livre_id: int, db: AsyncSession = Depends(get_async_db)):
+    return ORJSONResponse(ReservationOut.dump_many(await reservation_service.list_queue_async(db, livre_id)))
 
-@router.post("/bibliothecaire/reservations/next/{livre_id}", dependencies=[Depends(require_role("bibliothecaire","admin"))], response_model=ReservationOut | None, status_code=status.HTTP_200_OK)
-def biblio_reservation_disponible(livre_id: int, db: Session = Depends(get_db)):
-    return reservation_service.next_in_queue(db, livre_id)
+@router.post("/bibliothecaire/reservations/next/{livre_id}", dependencies=[Depends(require_role_async("bibliothecaire","admin"))], response_model=ReservationOut | None, status_code=status.HTTP_200_OK)
+async def biblio_reservation_disponible(livre_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await reservation_service.next_in_queue_async(db, livre_id)
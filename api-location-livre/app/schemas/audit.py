@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Any, List, Optional
+from pydantic import Field
+from app.schemas.base import APIModel, ReadModel
+
+
+class AuditEventOut(APIModel, ReadModel):
+    id: int
+    action: str
+    user_id: Optional[int] = Field(None, alias="utilisateurId")
+    target: Optional[str] = Field(None, alias="cible")
+    target_id: Optional[int] = Field(None, alias="cibleId")
+    details: Optional[Any] = None
+    created_at: datetime = Field(..., alias="date")
+
+
+class AuditPage(APIModel):
+    items: List[AuditEventOut]
+    next: Optional[str] = None
@@ -1,3 +1,5 @@
+from typing import Any, ClassVar, Iterable, List, Tuple
+
 from pydantic import BaseModel, ConfigDict
 from app.utils.naming import to_camel
 
@@ -7,3 +9,33 @@ class APIModel(BaseModel):
         populate_by_name=True,
         from_attributes=True
     )
+
+
+class ReadModel(BaseModel):
+    """
+    Modèle de sortie alimenté par des données de confiance (lignes lues en base).
+    `dump` / `dump_many` construisent directement les dicts par alias, sans
+    validation ni model_dump : les routes qui les renvoient dans une
+    ORJSONResponse ne repassent pas par la validation de response_model
+    (qui reste déclaré pour la documentation OpenAPI).
+    Les valeurs sont laissées telles quelles (date, datetime...) : orjson les encode.
+    """
+
+    # (attribut, clé JSON), calculé une fois par classe
+    __dump_fields__: ClassVar[Tuple[Tuple[str, str], ...]] = ()
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        cls.__dump_fields__ = tuple(
+            (name, field.alias or name) for name, field in cls.model_fields.items()
+        )
+
+    @classmethod
+    def dump(cls, obj: Any) -> dict:
+        return {key: getattr(obj, name) for name, key in cls.__dump_fields__}
+
+    @classmethod
+    def dump_many(cls, rows: Iterable[Any]) -> List[dict]:
+        fields = cls.__dump_fields__
+        return [{key: getattr(row, name) for name, key in fields} for row in rows]
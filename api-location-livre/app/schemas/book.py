@@ -1,5 +1,6 @@
+from typing import List, Optional
 from pydantic import field_validator
-from app.schemas.base import APIModel
+from app.schemas.base import APIModel, ReadModel
 from datetime import datetime
 
 class BookBase(APIModel):
@@ -23,7 +24,11 @@ class BookBase(APIModel):
             raise ValueError("available_copies ne peut pas être négatif")
         return v
 
-class BookOut(BookBase):
+class BookOut(BookBase, ReadModel):
     id: int
     class Config:
         from_attributes = True
+
+class BookPage(APIModel):
+    items: List[BookOut]
+    next: Optional[str] = None
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import Field
+from app.schemas.base import APIModel, ReadModel
+
+
+class NotificationOut(APIModel, ReadModel):
+    id: int
+    user_id: int = Field(..., alias="utilisateurId")
+    pret_id: Optional[int] = None
+    type: str
+    message: str
+    lu: bool
+    created_at: datetime = Field(..., alias="creeLe")
+    delivered_at: Optional[datetime] = Field(None, alias="envoyeeLe")
+
+
+class NotificationPage(APIModel):
+    items: List[NotificationOut]
+    next: Optional[str] = None
@@ -1,12 +1,27 @@
-from datetime import date
-from pydantic import BaseModel, ConfigDict
+from datetime import date, datetime
+from typing import List, Optional
+from pydantic import ConfigDict
+from app.schemas.base import APIModel, ReadModel
 
 
-class PretOut(BaseModel):
+class PretOut(ReadModel):
     id: int
     user_id: int
     book_id: int
     date_pret: date
     date_retour: date
     renouvellements: int
+    returned_at: Optional[datetime] = None
     model_config = ConfigDict(from_attributes=True)
+
+
+class PretLotItem(APIModel):
+    livre_id: Optional[int] = None
+    pret_id: Optional[int] = None
+    statut: str  # ok | erreur
+    erreur: Optional[str] = None
+    pret: Optional[PretOut] = None
+
+
+class PretLotResult(APIModel):
+    resultats: List[PretLotItem]
@@ -1,7 +1,7 @@
 from pydantic import Field
-from app.schemas.base import APIModel
+from app.schemas.base import APIModel, ReadModel
 
-class ReservationOut(APIModel):
+class ReservationOut(APIModel, ReadModel):
     id: int
     user_id: int = Field(..., alias="utilisateurId")
     book_id: int = Field(..., alias="livreId")
@@ -0,0 +1,70 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.config.settings import get_settings
+from app.core.worker import PeriodicWorker
+from app.db.session import SessionLocal
+from app.db.transaction import transactional
+from app.repositories import pret_archive_repo
+
+logger = logging.getLogger(__name__)
+
+
+def _move(db: Session, rows) -> int:
+    pret_archive_repo.ensure_partitions(db, [r.returned_at for r in rows])
+    return pret_archive_repo.move_to_archive(db, [r.id for r in rows], archived_at=datetime.utcnow())
+
+
+@transactional
+def archive_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+    """
+    Déplace au plus `batch_size` prêts rendus avant `cutoff` vers prets_archive,
+    en une transaction (copie + suppression). Retourne le nombre de prêts déplacés.
+    """
+    rows = pret_archive_repo.archivable_prets(db, cutoff, batch_size)
+    if not rows:
+        return 0
+    return _move(db, rows)
+
+
+@transactional
+def archive_book_loans(db: Session, book_id: int) -> int:
+    """
+    Archive sans attendre tous les prêts rendus d'un livre (suppression du livre :
+    prets.book_id référence books, prets_archive non). Retourne le nombre de prêts déplacés.
+    """
+    rows = pret_archive_repo.returned_prets_for_book(db, book_id)
+    if not rows:
+        return 0
+    return _move(db, rows)
+
+
+def archive_cutoff(now: Optional[datetime] = None) -> datetime:
+    """Date de retour en deçà de laquelle un prêt est archivé (LOAN_ARCHIVE_AFTER_DAYS)."""
+    return (now or datetime.utcnow()) - timedelta(days=get_settings().LOAN_ARCHIVE_AFTER_DAYS)
+
+
+class LoanArchiver(PeriodicWorker):
+    """
+    Tâche de fond : archive les prêts clos par lots de LOAN_ARCHIVE_BATCH, lot
+    après lot tant qu'il en reste, puis attend LOAN_ARCHIVE_INTERVAL_SEC.
+    Des transactions courtes : les retours et emprunts ne restent jamais bloqués
+    derrière un archivage complet.
+    """
+
+    name = "archivage des prêts"
+
+    def __init__(self):
+        s = get_settings()
+        super().__init__(s.LOAN_ARCHIVE_INTERVAL_SEC)
+        self.batch_size = s.LOAN_ARCHIVE_BATCH
+
+    def run_once(self) -> bool:
+        with SessionLocal() as db:
+            moved = archive_batch(db, archive_cutoff(), self.batch_size)
+        if moved:
+            logger.info("%s prêts archivés", moved)
+        return moved == self.batch_size
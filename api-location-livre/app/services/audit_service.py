@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config.settings import get_settings
+from app.db.session import SessionLocal
+from app.db.transaction import transactional
+from app.repositories import audit_repo
+from app.schemas.audit import AuditEventOut
+from app.utils.pagination import decode_keyset_cursor, encode_keyset_cursor
+
+logger = logging.getLogger(__name__)
+
+_WAKE = object()  # réveille le thread d'écriture pendant son attente (arrêt)
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+@transactional
+def store_batch(db: Session, rows: List[dict]) -> None:
+    audit_repo.insert_events(db, rows)
+
+
+class AuditWriter:
+    """
+    Journal d'audit bufferisé : `record` se contente d'empiler l'événement en
+    mémoire ; un thread dédié l'écrit par INSERT multi-lignes dès que `batch_size`
+    événements sont en attente ou au plus tard toutes les `interval_ms`.
+
+    La file est bornée : quand elle est pleine, `record` attend au plus
+    `enqueue_timeout_ms` (contre-pression) puis abandonne l'événement, compté
+    dans `dropped`. Appelé depuis la boucle asyncio (routes async, callbacks
+    on_commit des services `transactional_async`), `record` ne doit pas bloquer :
+    l'événement est alors abandonné sans attente si la file est pleine.
+    `stop` écrit tout ce qui reste avant de rendre la main.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        interval_ms: int,
+        queue_max: int,
+        enqueue_timeout_ms: int,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.batch_size = batch_size
+        self.interval = interval_ms / 1000
+        self.enqueue_timeout = enqueue_timeout_ms / 1000
+        self.session_factory = session_factory
+        self.written = 0
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_max)
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(self, event: dict) -> None:
+        try:
+            if _on_event_loop():
+                self._queue.put_nowait(event)
+            else:
+                self._queue.put(event, timeout=self.enqueue_timeout)
+        except queue.Full:
+            self.dropped += 1
+            logger.warning("file d'audit pleine, événement %s abandonné", event.get("action"))
+
+    def _collect(self, block: bool) -> List[dict]:
+        batch: List[dict] = []
+        deadline = time.monotonic() + self.interval
+        while len(batch) < self.batch_size:
+            try:
+                if block:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _WAKE:
+                if block:
+                    break
+                continue
+            batch.append(item)
+        return batch
+
+    def _write(self, batch: List[dict]) -> None:
+        try:
+            with self.session_factory() as db:
+                store_batch(db, batch)
+            self.written += len(batch)
+        except Exception:
+            self.dropped += len(batch)
+            logger.exception("échec de l'écriture de %d événements d'audit", len(batch))
+
+    def flush(self) -> None:
+        """Écrit immédiatement tout ce qui est en attente (thread appelant)."""
+        while batch := self._collect(block=False):
+            self._write(batch)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            batch = self._collect(block=True)
+            if batch:
+                self._write(batch)
+        self.flush()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            self.flush()
+            return
+        self._stopping.set()
+        self._queue.put(_WAKE)
+        self._thread.join()
+        self._thread = None
+
+
+_settings = get_settings()
+
+audit_writer = AuditWriter(
+    batch_size=_settings.AUDIT_FLUSH_BATCH,
+    interval_ms=_settings.AUDIT_FLUSH_INTERVAL_MS,
+    queue_max=_settings.AUDIT_QUEUE_MAX,
+    enqueue_timeout_ms=_settings.AUDIT_ENQUEUE_TIMEOUT_MS,
+)
+
+
+def record(
+    action: str,
+    user_id: Optional[int] = None,
+    target: Optional[str] = None,
+    target_id: Optional[int] = None,
+    details: Optional[dict] = None,
+) -> None:
+    """
+    Trace un événement d'audit sans accès base sur le chemin de la requête.
+    Dans un service transactionnel, passer par on_commit pour ne tracer que
+    ce qui a été validé.
+    """
+    audit_writer.record({
+        "created_at": datetime.utcnow(),
+        "action": action,
+        "user_id": user_id,
+        "target": target,
+        "target_id": target_id,
+        "details": details,
+    })
+
+
+def list_page(
+    db: Session,
+    after: Optional[str],
+    limit: int,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    action: Optional[str] = None,
+) -> dict:
+    rows = audit_repo.list_events(
+        db,
+        since=since,
+        until=until,
+        before=decode_keyset_cursor(after),
+        action=action,
+        limit=limit + 1,
+    )
+    page = rows[:limit]
+    return {
+        "items": AuditEventOut.dump_many(page),
+        "next": encode_keyset_cursor(page[-1].created_at, page[-1].id) if len(rows) > limit else None,
+    }
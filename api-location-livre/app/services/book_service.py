@@ -1,6 +1,20 @@
+import csv
+import io
+import itertools
+import json
+from functools import partial
+from typing import Iterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.config.settings import get_settings
+from app.core.cache import LRUCache
+from app.db.transaction import on_commit, transactional
+from app.services import archive_service, audit_service
 from app.repositories.book_repo import (
+    bulk_insert_books,
+    iter_books,
     list_books,
     search_books,
     get_book,
@@ -8,30 +22,201 @@ from app.repositories.book_repo import (
     update_book,
     delete_book,
 )
-from app.repositories import pret_repo  
+from app.repositories import book_repo_async, pret_repo
+from app.schemas.book import BookOut
+from app.utils.http_cache import CachedJSON
+from app.utils.pagination import encode_cursor, decode_cursor
+
+# ========= CACHE CATALOGUE =========
+
+_settings = get_settings()
+_cache = LRUCache(_settings.CATALOGUE_CACHE_SIZE, ttl=_settings.CATALOGUE_CACHE_TTL_SEC)
+_version_counter = itertools.count(1)
+_version = 0
+
+
+def catalogue_version() -> int:
+    """Version courante du catalogue ; change à chaque écriture sur `books`."""
+    return _version
+
+
+def bump_catalogue_version() -> int:
+    """
+    À appeler après le commit de toute modification du catalogue (livre ou
+    copies disponibles) : les entrées mises en cache sous l'ancienne version
+    ne sont plus lues et finissent évincées par le LRU.
+    """
+    global _version
+    _version = next(_version_counter)
+    return _version
+
+
+def _serialize(book) -> dict:
+    # ligne lue en base : pas de revalidation (voir ReadModel)
+    return BookOut.dump(book)
+
+
+def _page(rows, limit: int, next_cursor) -> CachedJSON:
+    return CachedJSON({
+        "items": BookOut.dump_many(rows[:limit]),
+        "next": next_cursor if len(rows) > limit else None,
+    })
+
+
+def _list_page(rows, limit: int) -> CachedJSON:
+    # rows contient limit + 1 lignes s'il existe une page suivante
+    next_cursor = encode_cursor(rows[limit - 1].id) if len(rows) > limit else None
+    return _page(rows, limit, next_cursor)
+
+
+# ========= LECTURE =========
 
 
 def list_all(db: Session):
     return list_books(db)
 
 
-def search(db: Session, q: str):
-    return search_books(db, q)
+def list_page(db: Session, after: str | None, limit: int) -> CachedJSON:
+    """
+    Retourne une page du catalogue triée par id et le curseur de la page suivante
+    (None s'il n'y a plus rien à lire), déjà sérialisée.
+    """
+    after_id = decode_cursor(after)
+    key = ("page", catalogue_version(), after_id, limit)
+    page = _cache.get(key)
+    if page is None:
+        page = _list_page(list_books(db, after_id=after_id, limit=limit + 1), limit)
+        _cache.set(key, page)
+    return page
+
+
+async def list_page_async(db: AsyncSession, after: str | None, limit: int) -> CachedJSON:
+    """Version asynchrone de list_page (même cache)."""
+    after_id = decode_cursor(after)
+    key = ("page", catalogue_version(), after_id, limit)
+    page = _cache.get(key)
+    if page is None:
+        rows = await book_repo_async.list_books(db, after_id=after_id, limit=limit + 1)
+        page = _list_page(rows, limit)
+        _cache.set(key, page)
+    return page
+
+
+def search(db: Session, q: str, after: str | None, limit: int) -> CachedJSON:
+    """
+    Page de résultats de recherche, par pertinence. Le curseur encode le rang
+    du prochain résultat.
+    """
+    offset = decode_cursor(after) or 0
+    key = ("search", catalogue_version(), q, offset, limit)
+    page = _cache.get(key)
+    if page is None:
+        rows = search_books(db, q, offset=offset, limit=limit + 1)
+        page = _page(rows, limit, encode_cursor(offset + limit))
+        _cache.set(key, page)
+    return page
+
+
+async def search_async(db: AsyncSession, q: str, after: str | None, limit: int) -> CachedJSON:
+    """Version asynchrone de search (même cache)."""
+    offset = decode_cursor(after) or 0
+    key = ("search", catalogue_version(), q, offset, limit)
+    page = _cache.get(key)
+    if page is None:
+        rows = await book_repo_async.search_books(db, q, offset=offset, limit=limit + 1)
+        page = _page(rows, limit, encode_cursor(offset + limit))
+        _cache.set(key, page)
+    return page
+
+
+def get_one(db: Session, book_id: int) -> CachedJSON | None:
+    key = ("book", catalogue_version(), book_id)
+    book = _cache.get(key)
+    if book is None:
+        row = get_book(db, book_id)
+        if row is None:
+            return None
+        book = CachedJSON(_serialize(row))
+        _cache.set(key, book)
+    return book
+
+
+# ========= EXPORT =========
+
+EXPORT_FIELDS = ["id", "title", "author", "year", "totalCopies", "availableCopies"]
+EXPORT_BATCH_SIZE = 1000
+
+
+def export_catalogue(db: Session, fmt: str) -> Iterator[str]:
+    """
+    Produit le catalogue complet en NDJSON ou CSV, morceau par morceau
+    (un morceau par lot lu en base). La mémoire utilisée ne dépend pas
+    de la taille du catalogue.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf) if fmt == "csv" else None
+    if writer:
+        writer.writerow(EXPORT_FIELDS)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+
+    count = 0
+    for row in iter_books(db, batch_size=EXPORT_BATCH_SIZE):
+        if writer:
+            writer.writerow(row)
+        else:
+            buf.write(json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False))
+            buf.write("\n")
+        count += 1
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
 
+    if buf.tell():
+        yield buf.getvalue()
 
-def get_one(db: Session, book_id: int):
-    return get_book(db, book_id)
 
+# ========= ÉCRITURE =========
 
-def admin_create(db: Session, **data):
-    return create_book(db, **data)
 
+def _audit(action: str, actor_id: int | None, book_id: int, details: dict | None) -> None:
+    audit_service.record(action, user_id=actor_id, target="livre", target_id=book_id, details=details)
 
-def admin_update(db: Session, book_id: int, **data):
-    return update_book(db, book_id, **data)
+
+@transactional
+def admin_create(db: Session, actor_id: int | None = None, **data):
+    book = create_book(db, **data)
+    on_commit(db, bump_catalogue_version)
+    on_commit(db, partial(_audit, "LIVRE_CREATION", actor_id, book.id, {"titre": book.title}))
+    return book
+
+
+@transactional
+def admin_update(db: Session, book_id: int, actor_id: int | None = None, **data):
+    book = update_book(db, book_id, **data)
+    if book:
+        on_commit(db, bump_catalogue_version)
+        on_commit(db, partial(_audit, "LIVRE_MODIFICATION", actor_id, book_id, {"champs": sorted(data)}))
+    return book
+
+
+@transactional
+def import_books(db: Session, rows: list[dict], actor_id: int | None = None) -> int:
+    """
+    Import d'un lot de livres déjà validés, en une transaction par lot.
+    """
+    count = bulk_insert_books(db, rows)
+    on_commit(db, bump_catalogue_version)
+    on_commit(db, partial(
+        audit_service.record, "LIVRE_IMPORT", user_id=actor_id, target="livre", details={"livres": count},
+    ))
+    return count
 
 
-def admin_delete(db: Session, book_id: int):
+@transactional
+def admin_delete(db: Session, book_id: int, actor_id: int | None = None):
     """
     Returns a tuple: (success: bool, error: str or None)
 
@@ -48,5 +233,10 @@ def admin_delete(db: Session, book_id: int):
     if active_loans_count > 0:
         return False, "book_has_loans"
 
+    # les prêts rendus référencent encore le livre : ils passent dans l'archive
+    # (historique conservé) dans la même transaction que la suppression
+    archive_service.archive_book_loans(db, book_id)
     delete_book(db, book_id)
+    on_commit(db, bump_catalogue_version)
+    on_commit(db, partial(_audit, "LIVRE_SUPPRESSION", actor_id, book_id, None))
     return True, None
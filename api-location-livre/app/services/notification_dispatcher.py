@@ -0,0 +1,112 @@
+import json
+import logging
+import smtplib
+import threading
+from email.message import EmailMessage
+from typing import List, Optional, Protocol
+
+from app.config.settings import get_settings
+from app.core.worker import PeriodicWorker
+from app.db.session import SessionLocal
+from app.db.transaction import transactional
+from app.repositories import notification_repo
+
+logger = logging.getLogger(__name__)
+
+
+class Transport(Protocol):
+    def send(self, batch: List[dict]) -> None:
+        """Transmet un lot de notifications ; lève une exception en cas d'échec."""
+
+
+class LogTransport:
+    def send(self, batch: List[dict]) -> None:
+        for n in batch:
+            logger.info("notification %s -> %s : %s", n["id"], n["email"], n["message"])
+
+
+class FileTransport:
+    """
+    Ajoute chaque notification en NDJSON dans un fichier (développement, tests).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, batch: List[dict]) -> None:
+        lines = "".join(json.dumps(n, ensure_ascii=False) + "\n" for n in batch)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class SmtpTransport:
+    """
+    Un courriel par notification, une seule connexion SMTP par lot.
+    """
+
+    def __init__(self, host: str, port: int, sender: str):
+        self.host = host
+        self.port = port
+        self.sender = sender
+
+    def send(self, batch: List[dict]) -> None:
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            for n in batch:
+                msg = EmailMessage()
+                msg["From"] = self.sender
+                msg["To"] = n["email"]
+                msg["Subject"] = f"Bibliothèque : {n['type']}"
+                msg.set_content(n["message"])
+                smtp.send_message(msg)
+
+
+def build_transport() -> Transport:
+    s = get_settings()
+    if s.NOTIFICATION_TRANSPORT == "file":
+        return FileTransport(s.NOTIFICATION_FILE)
+    if s.NOTIFICATION_TRANSPORT == "smtp":
+        return SmtpTransport(s.SMTP_HOST, s.SMTP_PORT, s.SMTP_SENDER)
+    return LogTransport()
+
+
+@transactional
+def dispatch_batch(db, transport: Transport, batch_size: int) -> int:
+    """
+    Vide un lot de la file d'envoi. Les lignes restent verrouillées pendant l'envoi
+    et ne sont supprimées qu'au commit : en cas d'échec du transport, le lot est
+    rejoué au passage suivant (livraison au moins une fois).
+    """
+    rows = notification_repo.claim_outbox_batch(db, batch_size)
+    if not rows:
+        return 0
+    transport.send([
+        {"id": nid, "utilisateurId": uid, "email": email, "type": type_, "message": message}
+        for _, nid, uid, email, type_, message in rows
+    ])
+    notification_repo.complete_outbox_batch(
+        db, [r[0] for r in rows], [r[1] for r in rows]
+    )
+    return len(rows)
+
+
+class NotificationDispatcher(PeriodicWorker):
+    """
+    Tâche de fond : vide la file d'envoi par lots tant qu'elle n'est pas vide,
+    puis attend NOTIFICATION_DISPATCH_INTERVAL_MS avant de revérifier.
+    """
+
+    name = "notifications"
+
+    def __init__(self, transport: Optional[Transport] = None):
+        s = get_settings()
+        super().__init__(s.NOTIFICATION_DISPATCH_INTERVAL_MS / 1000)
+        self.transport = transport or build_transport()
+        self.batch_size = s.NOTIFICATION_DISPATCH_BATCH
+
+    def drain_once(self) -> int:
+        with SessionLocal() as db:
+            return dispatch_batch(db, self.transport, self.batch_size)
+
+    def run_once(self) -> bool:
+        return self.drain_once() == self.batch_size
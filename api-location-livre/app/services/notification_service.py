@@ -0,0 +1,60 @@
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import NotFoundError
+from app.db.transaction import transactional
+from app.repositories import notification_repo, pret_repo
+from app.schemas.notification import NotificationOut
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+@transactional
+def notify_pret(db: Session, pret_id: int, kind: str, message: str):
+    """
+    Enregistre une notification pour l'emprunteur du prêt, ainsi que son entrée
+    dans la file d'envoi. L'envoi lui-même est fait par le worker de dispatch.
+    """
+    pret = pret_repo.get_pret(db, pret_id)
+    if not pret:
+        raise NotFoundError("Prêt introuvable", code="pret_not_found")
+
+    return notification_repo.create_notification(
+        db,
+        user_id=pret.user_id,
+        pret_id=pret_id,
+        type=kind,
+        message=message,
+    )
+
+
+def list_page(
+    db: Session,
+    after: Optional[str],
+    limit: int,
+    user_id: Optional[int] = None,
+    unread_only: bool = False,
+) -> dict:
+    """
+    Page de notifications (les plus récentes d'abord) ; `next` vaut None sur la dernière page.
+    """
+    rows = notification_repo.list_notifications(
+        db,
+        user_id=user_id,
+        before_id=decode_cursor(after),
+        limit=limit + 1,
+        unread_only=unread_only,
+    )
+    page = rows[:limit]
+    return {
+        "items": NotificationOut.dump_many(page),
+        "next": encode_cursor(page[-1].id) if len(rows) > limit else None,
+    }
+
+
+@transactional
+def mark_read(db: Session, notification_id: int, user_id: int):
+    n = notification_repo.mark_read(db, notification_id, user_id)
+    if not n:
+        raise NotFoundError("Notification introuvable", code="notification_not_found")
+    return n
@@ -1,33 +1,63 @@
+from collections import Counter
 from datetime import date, timedelta
+from functools import partial
 from typing import List
 
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.config.settings import get_settings
 from app.core.exceptions import NotFoundError, ValidationRuleError
-from app.repositories import pret_repo, book_repo
+from app.db.transaction import on_commit, transactional, transactional_async
+from app.repositories import pret_repo, book_repo, pret_repo_async, book_repo_async, user_repo_async
+from app.services import audit_service, book_service
 from app.models.pret import Pret
 
 LOAN_DAYS_DEFAULT = 14
 MAX_RENEWALS = 2
 
 
-def list_prets_by_user(db: Session, user_id: int) -> List[Pret]:
-    """Liste les prêts du membre."""
-    return pret_repo.list_prets_by_user(db, user_id=user_id)
+def list_prets_by_user(db: Session, user_id: int, include_returned: bool = False) -> List[Row]:
+    """Liste les prêts en cours du membre (tout l'historique avec include_returned)."""
+    return pret_repo.list_prets_by_user(db, user_id=user_id, include_returned=include_returned)
 
 
-def create_pret(db: Session, user_id: int, book_id: int) -> Pret:
+async def list_prets_by_user_async(db: AsyncSession, user_id: int, include_returned: bool = False) -> List[Row]:
+    """Liste les prêts du membre (version asynchrone)."""
+    return await pret_repo_async.list_prets_by_user(db, user_id=user_id, include_returned=include_returned)
+
+
+def get_amendes(db: Session, user_id: int, today: date | None = None) -> dict:
     """
-    Créer un prêt pour un utilisateur :
-    - Le livre doit exister
-    - Il doit rester des copies disponibles
-    - On décrémente les copies disponibles
+    Amendes du membre : seuls les prêts en retard sont lus, montants et total
+    calculés par la base.
     """
-    book = book_repo.get_book(db, book_id)
-    if not book:
-        raise NotFoundError("Livre introuvable", code="book_not_found")
+    settings = get_settings()
+    rows = pret_repo.overdue_fines_for_user(
+        db, user_id, today or date.today(), settings.FINE_PER_DAY
+    )
+    details = [
+        {"pretId": r.id, "joursRetard": r.jours_retard, "montant": round(r.montant, 2), "statut": "due"}
+        for r in rows
+    ]
+    total = rows[0].total if rows else 0.0
+    return {"total": round(total, 2), "details": details}
+
 
-    if book.available_copies <= 0:
+@transactional
+def create_pret(db: Session, user_id: int, book_id: int) -> Pret:
+    """
+    Créer un prêt pour un utilisateur, en une seule transaction :
+    - On décrémente les copies disponibles par un UPDATE conditionnel
+      (aucune survente possible en cas d'emprunts simultanés)
+    - Si rien n'a été décrémenté : livre inexistant ou plus de copie
+    - On insère le prêt ; le commit unique valide les deux
+    """
+    remaining = book_repo.decrement_available_copies(db, book_id)
+    if remaining is None:
+        if not book_repo.get_book(db, book_id):
+            raise NotFoundError("Livre introuvable", code="book_not_found")
         raise ValidationRuleError(
             "Aucune copie disponible, réessayez plus tard",
             code="no_copies",
@@ -44,9 +74,43 @@ def create_pret(db: Session, user_id: int, book_id: int) -> Pret:
         date_retour=due_date,
         renouvellements=0,
     )
+    on_commit(db, book_service.bump_catalogue_version)
+    on_commit(db, partial(
+        audit_service.record, "EMPRUNT", user_id=user_id, target="pret", target_id=pret.id,
+        details={"livreId": book_id},
+    ))
+
+    return pret
+
+
+@transactional_async
+async def create_pret_async(db: AsyncSession, user_id: int, book_id: int) -> Pret:
+    """
+    Version asynchrone de create_pret (mêmes règles, même transaction unique).
+    """
+    remaining = await book_repo_async.decrement_available_copies(db, book_id)
+    if remaining is None:
+        if not await book_repo_async.get_book(db, book_id):
+            raise NotFoundError("Livre introuvable", code="book_not_found")
+        raise ValidationRuleError(
+            "Aucune copie disponible, réessayez plus tard",
+            code="no_copies",
+        )
 
-    # décrémenter les copies dispo
-    book_repo.update_book(db, book.id, available_copies=book.available_copies - 1)
+    today = date.today()
+    pret = await pret_repo_async.create_pret(
+        db,
+        user_id=user_id,
+        book_id=book_id,
+        date_pret=today,
+        date_retour=today + timedelta(days=LOAN_DAYS_DEFAULT),
+        renouvellements=0,
+    )
+    on_commit(db, book_service.bump_catalogue_version)
+    on_commit(db, partial(
+        audit_service.record, "EMPRUNT", user_id=user_id, target="pret", target_id=pret.id,
+        details={"livreId": book_id},
+    ))
 
     return pret
 
@@ -58,34 +122,41 @@ def get_pret_or_404(db: Session, pret_id: int) -> Pret:
     return pret
 
 
+@transactional
 def return_pret(db: Session, pret_id: int) -> Pret:
     """
-    Retourner un prêt :
-    - on retrouve le prêt
-    - on supprime le prêt
-    - on incrémente les copies dispo du livre
+    Retourner un prêt, en une seule transaction :
+    - on clôt le prêt s'il est en cours (returned_at) ; il reste dans l'historique
+    - on incrémente les copies dispo du livre (UPDATE ... RETURNING)
+    - le commit unique valide les deux
     """
     pret = get_pret_or_404(db, pret_id)
 
-    book = book_repo.get_book(db, pret.book_id)
-    if not book:
-        raise NotFoundError("Livre introuvable", code="book_not_found")
+    if not pret_repo.mark_returned(db, pret_id):
+        raise ValidationRuleError("Prêt déjà retourné", code="pret_already_returned")
 
-    deleted = pret_repo.delete_pret(db, pret_id)
-    if not deleted:
-        raise NotFoundError("Prêt introuvable", code="pret_not_found")
+    if book_repo.increment_available_copies(db, pret.book_id) is None:
+        raise NotFoundError("Livre introuvable", code="book_not_found")
 
-    book_repo.update_book(db, book.id, available_copies=book.available_copies + 1)
+    on_commit(db, book_service.bump_catalogue_version)
+    on_commit(db, partial(
+        audit_service.record, "RETOUR", user_id=pret.user_id, target="pret", target_id=pret_id,
+        details={"livreId": pret.book_id},
+    ))
 
     return pret
 
 
+@transactional
 def renew_pret(db: Session, pret_id: int) -> Pret:
     """
     Renouveler un prêt s'il n'a pas dépassé le maximum autorisé.
     """
     pret = get_pret_or_404(db, pret_id)
 
+    if pret.returned_at is not None:
+        raise ValidationRuleError("Prêt déjà retourné", code="pret_already_returned")
+
     if pret.renouvellements >= MAX_RENEWALS:
         raise ValidationRuleError(
             "Nombre maximal de renouvellements atteint",
@@ -94,5 +165,128 @@ def renew_pret(db: Session, pret_id: int) -> Pret:
 
     pret.date_retour = pret.date_retour + timedelta(days=LOAN_DAYS_DEFAULT)
     pret.renouvellements += 1
+    on_commit(db, partial(
+        audit_service.record, "RENOUVELLEMENT", user_id=pret.user_id, target="pret", target_id=pret_id,
+    ))
 
     return pret_repo.update_pret(db, pret)
+
+
+# ========= TRAITEMENTS PAR LOT (BANQUE DE PRÊT) =========
+# Un lot = une transaction et un nombre constant de requêtes, quel que soit le
+# nombre d'éléments. Chaque élément reçoit son propre résultat (ok / code d'erreur) ;
+# les éléments valides sont traités même si d'autres sont refusés.
+
+
+def _results(ids: List[int], key: str, outcome) -> List[dict]:
+    seen = set()
+    results = []
+    for i in ids:
+        if i in seen:
+            results.append({key: i, "statut": "erreur", "erreur": "duplicate_item"})
+            continue
+        seen.add(i)
+        results.append({key: i, **outcome(i)})
+    return results
+
+
+@transactional_async
+async def checkout_batch_async(db: AsyncSession, user_id: int, book_ids: List[int]) -> List[dict]:
+    """
+    Emprunt de plusieurs livres : un UPDATE conditionnel multi-lignes sur les copies,
+    un INSERT multi-lignes des prêts, un SELECT pour qualifier les refus.
+    """
+    if not await user_repo_async.get_user(db, user_id):
+        raise NotFoundError("Utilisateur introuvable", code="user_not_found")
+
+    unique = list(dict.fromkeys(book_ids))
+    decremented = await book_repo_async.decrement_available_copies_bulk(db, unique)
+    refused = [b for b in unique if b not in decremented]
+    existing = await book_repo_async.existing_book_ids(db, refused) if refused else set()
+
+    today = date.today()
+    prets = []
+    if decremented:
+        prets = await pret_repo_async.create_prets_bulk(db, [
+            {
+                "user_id": user_id,
+                "book_id": b,
+                "date_pret": today,
+                "date_retour": today + timedelta(days=LOAN_DAYS_DEFAULT),
+                "renouvellements": 0,
+            }
+            for b in unique if b in decremented
+        ])
+        on_commit(db, book_service.bump_catalogue_version)
+        for p in prets:
+            on_commit(db, partial(
+                audit_service.record, "EMPRUNT", user_id=user_id, target="pret", target_id=p.id,
+                details={"livreId": p.book_id},
+            ))
+
+    by_book = {p.book_id: p for p in prets}
+
+    def outcome(b):
+        if b in by_book:
+            return {"statut": "ok", "pret": by_book[b]}
+        return {"statut": "erreur", "erreur": "no_copies" if b in existing else "book_not_found"}
+
+    return _results(book_ids, "livre_id", outcome)
+
+
+@transactional_async
+async def return_batch_async(db: AsyncSession, pret_ids: List[int]) -> List[dict]:
+    """
+    Retour de plusieurs prêts : un UPDATE ... RETURNING qui clôt les prêts en cours,
+    puis un seul UPDATE qui rend à chaque livre autant de copies que de prêts retournés.
+    """
+    unique = list(dict.fromkeys(pret_ids))
+    returned = {r.id: r for r in await pret_repo_async.return_prets_bulk(db, unique)}
+    refused = [i for i in unique if i not in returned]
+    existing = await pret_repo_async.pret_states(db, refused) if refused else {}
+    if returned:
+        counts = Counter(r.book_id for r in returned.values())
+        await book_repo_async.increment_available_copies_bulk(db, dict(counts))
+        on_commit(db, book_service.bump_catalogue_version)
+        for r in returned.values():
+            on_commit(db, partial(
+                audit_service.record, "RETOUR", user_id=r.user_id, target="pret", target_id=r.id,
+                details={"livreId": r.book_id},
+            ))
+
+    def outcome(i):
+        if i in returned:
+            return {"statut": "ok", "livre_id": returned[i].book_id}
+        return {"statut": "erreur", "erreur": "pret_already_returned" if i in existing else "pret_not_found"}
+
+    return _results(pret_ids, "pret_id", outcome)
+
+
+@transactional_async
+async def renew_batch_async(db: AsyncSession, pret_ids: List[int]) -> List[dict]:
+    """
+    Renouvellement de plusieurs prêts : un UPDATE ... RETURNING limité aux prêts
+    en cours sous le maximum de renouvellements, un SELECT pour qualifier les refus.
+    """
+    unique = list(dict.fromkeys(pret_ids))
+    renewed = {
+        p.id: p
+        for p in await pret_repo_async.renew_prets_bulk(db, unique, LOAN_DAYS_DEFAULT, MAX_RENEWALS)
+    }
+    refused = [i for i in unique if i not in renewed]
+    existing = await pret_repo_async.pret_states(db, refused) if refused else {}
+    for p in renewed.values():
+        on_commit(db, partial(
+            audit_service.record, "RENOUVELLEMENT", user_id=p.user_id, target="pret", target_id=p.id,
+        ))
+
+    def outcome(i):
+        if i in renewed:
+            return {"statut": "ok", "pret": renewed[i]}
+        if i not in existing:
+            return {"statut": "erreur", "erreur": "pret_not_found"}
+        if existing[i] is not None:
+            return {"statut": "erreur", "erreur": "pret_already_returned"}
+        return {"statut": "erreur", "erreur": "max_renewals_reached"}
+
+    return _results(pret_ids, "pret_id", outcome)
@@ -1,10 +1,24 @@
+from functools import partial
+
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.repositories import reservation_repo
+from app.repositories import book_repo_async, reservation_repo, reservation_repo_async
 from app.repositories.book_repo import get_book
 from app.core.exceptions import NotFoundError
+from app.db.transaction import on_commit, transactional, transactional_async
+from app.services import audit_service
+
+
+def _audit(db, action: str, reservation) -> None:
+    if reservation is not None:
+        on_commit(db, partial(
+            audit_service.record, action, user_id=reservation.user_id, target="reservation",
+            target_id=reservation.id, details={"livreId": reservation.book_id},
+        ))
 
 
+@transactional
 def create_reservation(db: Session, user_id: int, book_id: int):
     """
     Crée une réservation pour un utilisateur et un livre :
@@ -14,18 +28,23 @@ def create_reservation(db: Session, user_id: int, book_id: int):
     if not book:
         raise NotFoundError("Livre introuvable", code="book_not_found")
 
-    return reservation_repo.create_reservation(
+    reservation = reservation_repo.create_reservation(
         db,
         user_id=user_id,
         book_id=book_id,
     )
+    _audit(db, "RESERVATION", reservation)
+    return reservation
 
 
+@transactional
 def next_in_queue(db: Session, book_id: int):
     """
     Récupère et retire la prochaine réservation dans la file pour ce livre.
     """
-    return reservation_repo.pop_next_reservation(db, book_id)
+    reservation = reservation_repo.pop_next_reservation(db, book_id)
+    _audit(db, "RESERVATION_SERVIE", reservation)
+    return reservation
 
 
 def list_queue(db: Session, book_id: int):
@@ -33,3 +52,31 @@ def list_queue(db: Session, book_id: int):
     Liste les réservations pour un livre donné.
     """
     return reservation_repo.list_reservations(db, book_id)
+
+
+# ========= VERSIONS ASYNCHRONES =========
+
+
+@transactional_async
+async def create_reservation_async(db: AsyncSession, user_id: int, book_id: int):
+    if not await book_repo_async.get_book(db, book_id):
+        raise NotFoundError("Livre introuvable", code="book_not_found")
+
+    reservation = await reservation_repo_async.create_reservation(
+        db,
+        user_id=user_id,
+        book_id=book_id,
+    )
+    _audit(db, "RESERVATION", reservation)
+    return reservation
+
+
+@transactional_async
+async def next_in_queue_async(db: AsyncSession, book_id: int):
+    reservation = await reservation_repo_async.pop_next_reservation(db, book_id)
+    _audit(db, "RESERVATION_SERVIE", reservation)
+    return reservation
+
+
+async def list_queue_async(db: AsyncSession, book_id: int):
+    return await reservation_repo_async.list_reservations(db, book_id)
@@ -0,0 +1,27 @@
+from sqlalchemy.orm import Session
+
+from app.db.transaction import transactional
+from app.models.user import User
+from app.repositories import user_repo
+
+
+@transactional
+def register(db: Session, email: str, password_hash: str, full_name: str, role: str = "membre") -> User:
+    """
+    Crée un compte utilisateur (le mot de passe est déjà haché).
+    """
+    return user_repo.create_user(
+        db,
+        email=email,
+        password_hash=password_hash,
+        full_name=full_name,
+        role=role,
+    )
+
+
+@transactional
+def rehash_password(db: Session, user: User, password_hash: str) -> User:
+    """
+    Remplace un hash produit avec d'anciens paramètres (coût bcrypt modifié).
+    """
+    return user_repo.update_password_hash(db, user, password_hash)
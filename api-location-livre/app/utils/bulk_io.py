@@ -0,0 +1,77 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Optional, Tuple
+
+# (numéro de ligne, enregistrement ou None, erreur de lecture ou None)
+ParsedRecord = Tuple[int, Optional[dict], Optional[str]]
+
+
+async def iter_text_records(stream: AsyncIterator[bytes], csv_mode: bool) -> AsyncIterator[Tuple[int, str]]:
+    """
+    Découpe un flux d'octets UTF-8 en enregistrements texte (numéro de ligne de
+    début, texte), au fil de l'eau : seul l'enregistrement en cours est gardé en mémoire.
+    En CSV, un champ entre guillemets peut contenir des retours à la ligne :
+    l'enregistrement ne se termine qu'une fois les guillemets équilibrés.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    record = ""
+    start = line_no = 0
+
+    def lines(text: str):
+        nonlocal pending
+        pending += text
+        *complete, pending = pending.split("\n")
+        return complete
+
+    async def chunks():
+        async for chunk in stream:
+            yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True) + "\n"
+
+    async for text in chunks():
+        for line in lines(text):
+            line_no += 1
+            if not record:
+                start = line_no
+            record += line + "\n"
+            if csv_mode and record.count('"') % 2:
+                continue
+            if record.strip():
+                yield start, record
+            record = ""
+    if record.strip():
+        yield start, record
+
+
+async def iter_records(stream: AsyncIterator[bytes], fmt: str) -> AsyncIterator[ParsedRecord]:
+    """
+    Enregistrements d'un fichier NDJSON (un objet JSON par ligne) ou CSV (première
+    ligne = en-têtes). Les cellules CSV vides valent None.
+    """
+    header = None
+    async for line_no, text in iter_text_records(stream, csv_mode=fmt == "csv"):
+        if fmt == "csv":
+            try:
+                row = next(csv.reader([text]))
+            except csv.Error as e:
+                yield line_no, None, f"CSV illisible : {e}"
+                continue
+            if header is None:
+                header = [h.strip() for h in row]
+                continue
+            if len(row) != len(header):
+                yield line_no, None, f"{len(row)} colonnes au lieu de {len(header)}"
+                continue
+            yield line_no, {k: (v if v != "" else None) for k, v in zip(header, row)}, None
+        else:
+            try:
+                obj = json.loads(text)
+            except ValueError as e:
+                yield line_no, None, f"JSON illisible : {e}"
+                continue
+            if not isinstance(obj, dict):
+                yield line_no, None, "objet JSON attendu"
+                continue
+            yield line_no, obj, None
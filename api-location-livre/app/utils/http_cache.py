@@ -0,0 +1,63 @@
+import hashlib
+from typing import Any, Dict, Optional
+
+import orjson
+from fastapi import Request, Response
+
+from app.core.compression import choose_encoding, compress
+
+
+class CachedJSON:
+    """
+    Réponse JSON sérialisée une seule fois : données, octets du corps et ETag fort
+    (empreinte du corps). Destinée à être conservée dans un cache.
+    Les variantes compressées sont calculées à la première demande puis gardées
+    avec l'entrée : chaque version n'est compressée qu'une fois par encodage.
+    """
+
+    __slots__ = ("data", "body", "etag", "_encoded")
+
+    def __init__(self, data: Any):
+        self.data = data
+        # même encodage que la réponse par défaut de l'application (ORJSONResponse)
+        self.body = orjson.dumps(data)
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        self._encoded: Dict[str, bytes] = {}
+
+    def encoded(self, encoding: str) -> bytes:
+        data = self._encoded.get(encoding)
+        if data is None:
+            data = self._encoded[encoding] = compress(self.body, encoding)
+        return data
+
+    def variant_etag(self, encoding: Optional[str]) -> str:
+        """ETag fort propre à chaque encodage (représentations différentes, RFC 9110)."""
+        return self.etag if encoding is None else f'{self.etag[:-1]}-{encoding}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Comparaison faible (RFC 9110) entre l'en-tête If-None-Match et un ETag.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [t.strip() for t in if_none_match.split(",")]
+    return any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def conditional_json(request: Request, entry: CachedJSON) -> Response:
+    """
+    Renvoie 304 sans corps si le client possède déjà cette version, sinon le
+    corps déjà sérialisé, compressé si le client l'accepte (variante mise en cache).
+    """
+    encoding = choose_encoding(request.headers.get("accept-encoding"), len(entry.body))
+    etag = entry.variant_etag(encoding)
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if encoding is None:
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+    headers["Content-Encoding"] = encoding
+    return Response(content=entry.encoded(encoding), media_type="application/json", headers=headers)
@@ -0,0 +1,48 @@
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from app.core.exceptions import ValidationRuleError
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Encode l'id du dernier élément d'une page en curseur opaque.
+    """
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """
+    Décode un curseur `after`. Retourne None si aucun curseur n'est fourni.
+    Lève ValidationRuleError si le curseur est illisible.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationRuleError("Curseur de pagination invalide", code="invalid_cursor")
+
+
+def encode_keyset_cursor(created_at: datetime, last_id: int) -> str:
+    """
+    Curseur opaque pour un tri (date, id) : date ISO et id du dernier élément.
+    """
+    raw = f"{created_at.isoformat()}|{last_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_keyset_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts, last_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(ts), int(last_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationRuleError("Curseur de pagination invalide", code="invalid_cursor")
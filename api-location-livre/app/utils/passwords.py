@@ -0,0 +1,98 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from passlib.context import CryptContext
+
+from app.config.settings import get_settings
+from app.core.exceptions import OverloadedError
+
+# Module volontairement léger (ni FastAPI ni SQLAlchemy) : il est réimporté
+# par chaque processus du pool de hachage.
+
+_settings = get_settings()
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=_settings.BCRYPT_ROUNDS,
+)
+
+
+def hash_password(password: str) -> str:
+    """
+    Hash le mot de passe en utilisant bcrypt.
+    """
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Vérifie qu'un mot de passe en clair correspond au hash stocké.
+    """
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Vrai si le hash a été produit avec d'autres paramètres (coût bcrypt modifié...).
+    """
+    return pwd_context.needs_update(hashed_password)
+
+
+# ========= POOL DE HACHAGE =========
+
+_pool: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+_inflight = 0
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=_settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+async def _run_in_pool(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Exécute fn dans le pool de processus. Au-delà de PASSWORD_HASH_WORKERS calculs
+    en cours + PASSWORD_HASH_QUEUE_LIMIT en attente, on refuse (OverloadedError -> 429)
+    plutôt que de laisser les requêtes s'empiler.
+    """
+    global _inflight
+    limit = _settings.PASSWORD_HASH_WORKERS + _settings.PASSWORD_HASH_QUEUE_LIMIT
+    with _lock:
+        if _inflight >= limit:
+            raise OverloadedError(
+                "Trop de connexions simultanées, réessayez dans un instant",
+                code="auth_overloaded",
+            )
+        _inflight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_pool(), fn, *args)
+    finally:
+        with _lock:
+            _inflight -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_pool(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_pool(verify_password, plain_password, hashed_password)
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
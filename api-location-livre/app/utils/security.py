@@ -1,39 +1,32 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.config.settings import get_settings
-from app.db.deps import get_db
+from app.core.cache import LRUCache
+from app.db.deps import get_async_db, get_db
 from app.models.user import User
-from app.repositories import user_repo
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.repositories import user_repo, user_repo_async
+from app.utils.passwords import (  # noqa: F401  (ré-exportés)
+    hash_password,
+    hash_password_async,
+    needs_rehash,
+    pwd_context,
+    verify_password,
+    verify_password_async,
+)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/connexion")
 
 
-# ========= PASSWORDS =========
-
-
-def hash_password(password: str) -> str:
-    """
-    Hash le mot de passe en utilisant bcrypt.
-    """
-    return pwd_context.hash(password)
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """
-    Vérifie qu'un mot de passe en clair correspond au hash stocké.
-    """
-    return pwd_context.verify(plain_password, hashed_password)
-
-
 # ========= JWT HELPERS =========
 
 
@@ -108,42 +101,162 @@ def decode_refresh_token(token: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-# ========= CURRENT USER & ROLES =========
+# ========= CACHE DES UTILISATEURS AUTHENTIFIÉS =========
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
+class Principal:
     """
-    Récupère l'utilisateur courant à partir de l'access token Bearer.
-    Lève 401 si token invalide / expiré / type incorrect.
+    Instantané de l'utilisateur authentifié, indépendant de toute session,
+    pour pouvoir être mis en cache entre les requêtes.
     """
-    settings = get_settings()
-    credentials_exception = HTTPException(
+
+    __slots__ = ("id", "email", "full_name", "role")
+
+    def __init__(self, id: int, email: str, full_name: str, role: str):
+        self.id = id
+        self.email = email
+        self.full_name = full_name
+        self.role = role
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(user.id, user.email, user.full_name, user.role)
+
+
+_settings = get_settings()
+# Cache local au processus. Les modifications d'un compte l'invalident aussitôt
+# dans le processus qui les fait ; les autres processus (workers uvicorn, autres
+# services) ne les voient qu'à l'expiration de l'entrée, au plus AUTH_CACHE_TTL_SEC
+# secondes plus tard : garder cette durée courte.
+# empreinte du token -> (Principal, instant du début de la lecture en base)
+_principal_cache = LRUCache(_settings.AUTH_CACHE_SIZE, ttl=_settings.AUTH_CACHE_TTL_SEC)
+# email -> instant de la dernière modification du compte. Même durée de vie que
+# les Principal : passé ce délai, toute entrée antérieure à la modification a expiré.
+_invalidations = LRUCache(_settings.AUTH_CACHE_SIZE, ttl=_settings.AUTH_CACHE_TTL_SEC)
+
+
+def invalidate_principal(email: str) -> None:
+    """
+    Invalide les entrées en cache d'un utilisateur (rôle modifié, compte supprimé...).
+    Appelée automatiquement sur toute mise à jour / suppression ORM d'un User.
+    """
+    if len(_invalidations) >= _invalidations.maxsize:
+        # une invalidation évincée rendrait valides des entrées périmées : tout oublier
+        _principal_cache.clear()
+        _invalidations.clear()
+    _invalidations.set(email, time.monotonic())
+
+
+def _invalidated_since(email: str, read_at: float) -> bool:
+    return _invalidations.get(email, 0.0) >= read_at
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_user_change(mapper, connection, target: User) -> None:
+    invalidate_principal(target.email)
+    for old_email in inspect(target).attrs.email.history.deleted:
+        invalidate_principal(old_email)
+
+
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+# ========= CURRENT USER & ROLES =========
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Impossible de valider les identifiants",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def _cached_principal(digest: str) -> Optional[Principal]:
+    cached = _principal_cache.get(digest)
+    if cached is not None:
+        principal, read_at = cached
+        if not _invalidated_since(principal.email, read_at):
+            return principal
+    return None
+
+
+def _access_payload(token: str) -> Dict[str, Any]:
+    """Payload d'un access token valide portant un `sub` ; lève 401 sinon."""
+    settings = get_settings()
     try:
         payload = jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM],
         )
-        if payload.get("type") != "access":
-            raise credentials_exception
-        email: Optional[str] = payload.get("sub")
-        if email is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
+    if payload.get("type") != "access" or payload.get("sub") is None:
+        raise _credentials_exception()
+    return payload
+
 
-    user = user_repo.get_by_email(db, email)
+def _remember(digest: str, user: Optional[User], read_at: float, payload: Dict[str, Any]) -> Principal:
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    principal = Principal.from_user(user)
+    ttl = payload.get("exp", 0) - time.time()
+    # compte modifié pendant la lecture : la valeur lue peut déjà être périmée
+    if ttl > 0 and not _invalidated_since(principal.email, read_at):
+        _principal_cache.set(digest, (principal, read_at), ttl=ttl)
+    return principal
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> Principal:
+    """
+    Récupère l'utilisateur courant à partir de l'access token Bearer.
+    Lève 401 si token invalide / expiré / type incorrect.
+    Les tokens déjà vérifiés sont servis depuis un cache borné, jamais au-delà
+    de leur date d'expiration.
+    """
+    digest = _token_digest(token)
+    principal = _cached_principal(digest)
+    if principal is not None:
+        return principal
+
+    payload = _access_payload(token)
+    email = payload["sub"]
+    read_at = time.monotonic()
+    return _remember(digest, user_repo.get_by_email(db, email), read_at, payload)
 
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    """
+    Pendant de `get_current_user` pour les routes async : même cache, lecture
+    de l'utilisateur par la session asynchrone (pas de session sync ni de
+    requête bloquante sur la boucle).
+    """
+    digest = _token_digest(token)
+    principal = _cached_principal(digest)
+    if principal is not None:
+        return principal
+
+    payload = _access_payload(token)
+    email = payload["sub"]
+    read_at = time.monotonic()
+    return _remember(digest, await user_repo_async.get_by_email(db, email), read_at, payload)
+
+
+def _check_role(user: Principal, roles: tuple) -> Principal:
+    if user.role not in roles:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient role",
+        )
     return user
 
 
@@ -155,12 +268,16 @@ def require_role(*roles: str):
         @router.get("/admin/truc", dependencies=[Depends(require_role("admin"))])
     """
 
-    def dep(user: User = Depends(get_current_user)):
-        if user.role not in roles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Insufficient role",
-            )
-        return user
+    def dep(user: Principal = Depends(get_current_user)):
+        return _check_role(user, roles)
+
+    return dep
+
+
+def require_role_async(*roles: str):
+    """Pendant de `require_role` pour les routes async (voir `get_current_user_async`)."""
+
+    async def dep(user: Principal = Depends(get_current_user_async)):
+        return _check_role(user, roles)
 
     return dep
@@ -0,0 +1,19 @@
+import re
+import unicodedata
+from typing import List
+
+
+def strip_accents(s: str) -> str:
+    """
+    Retire les accents (é -> e, Ç -> C) en passant par la forme NFKD.
+    """
+    decomposed = unicodedata.normalize("NFKD", s)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def search_terms(q: str) -> List[str]:
+    """
+    Découpe une requête de recherche en mots normalisés (minuscules, sans accents).
+    La ponctuation, y compris l'apostrophe typographique de « L’Alchimiste », sert de séparateur.
+    """
+    return re.findall(r"\w+", strip_accents(q).lower())
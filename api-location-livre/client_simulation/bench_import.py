@@ -0,0 +1,64 @@
+"""
+Benchmark de /admin/livres/import : génère un fichier de N titres et l'envoie en flux.
+
+    python client_simulation/bench_import.py --books 100000 --format ndjson
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import time
+
+import httpx
+
+BASE = os.getenv("API_BASE", "http://localhost:8000/api/v1")
+FIELDS = ["titre", "auteur", "annee", "nombreCopies"]
+
+
+def generate(n_books: int, fmt: str, batch: int = 10_000):
+    """Produit le fichier morceau par morceau (jamais entièrement en mémoire)."""
+    for start in range(0, n_books, batch):
+        buf = io.StringIO()
+        writer = csv.writer(buf) if fmt == "csv" else None
+        if writer and start == 0:
+            writer.writerow(FIELDS)
+        for i in range(start, min(start + batch, n_books)):
+            row = [f"Titre importé {i}", f"Auteur {i % 997}", 1900 + i % 120, 1 + i % 5]
+            if writer:
+                writer.writerow(row)
+            else:
+                buf.write(json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False) + "\n")
+        yield buf.getvalue().encode()
+
+
+def main(n_books: int, fmt: str):
+    with httpx.Client(timeout=600) as client:
+        r = client.post(
+            f"{BASE}/auth/connexion",
+            data={"username": "admin@example.com", "password": "admin"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        r.raise_for_status()
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+        start = time.perf_counter()
+        r = client.post(
+            f"{BASE}/admin/livres/import",
+            params={"format": fmt},
+            content=generate(n_books, fmt),
+            headers=headers,
+        )
+        elapsed = time.perf_counter() - start
+
+    report = r.json()
+    print(f"Statut : {r.status_code}, importés : {report['importes']}, rejetés : {report['rejetes']}")
+    print(f"{n_books} titres en {elapsed:.2f}s, soit {report['importes'] / elapsed:.0f} titres/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=100_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    args = parser.parse_args()
+    main(args.books, args.format)
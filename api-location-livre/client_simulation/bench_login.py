@@ -0,0 +1,50 @@
+"""
+Benchmark de /auth/connexion : connexions par seconde, et par cœur alloué au hachage.
+
+    python client_simulation/bench_login.py --requests 400 --concurrency 32 --cores 2
+
+--cores correspond au nombre de processus de hachage côté serveur
+(PASSWORD_HASH_WORKERS). Les réponses 429 (délestage) sont comptées à part.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+BASE = os.getenv("API_BASE", "http://localhost:8000/api/v1")
+
+
+async def main(n_requests: int, concurrency: int, cores: int):
+    sem = asyncio.Semaphore(concurrency)
+    statuses: dict = {}
+
+    async with httpx.AsyncClient(timeout=60) as client:
+
+        async def one():
+            async with sem:
+                r = await client.post(
+                    f"{BASE}/auth/connexion",
+                    data={"username": "membre@example.com", "password": "membre"},
+                    headers={"Content-Type": "application/x-www-form-urlencoded"},
+                )
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(n_requests)))
+        elapsed = time.perf_counter() - start
+
+    ok = statuses.get(200, 0)
+    print(f"Requêtes : {n_requests} en {elapsed:.2f}s, statuts : {statuses}")
+    print(f"Connexions réussies/s : {ok / elapsed:.1f}")
+    print(f"Connexions réussies/s/cœur : {ok / elapsed / cores:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--cores", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.cores))
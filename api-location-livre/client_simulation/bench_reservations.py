@@ -0,0 +1,81 @@
+"""
+Benchmark de /bibliothecaire/reservations/next/{livre_id} : retraits par seconde
+avec plusieurs bibliothécaires en parallèle sur la même file.
+
+    python client_simulation/bench_reservations.py --reservations 500 --concurrency 16
+
+Crée un livre et remplit sa file, puis vide la file en parallèle. Vérifie au
+passage qu'aucune réservation n'est servie deux fois et qu'aucune n'est perdue.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+BASE = os.getenv("API_BASE", "http://localhost:8000/api/v1")
+
+
+async def token(client: httpx.AsyncClient, email: str, password: str) -> dict:
+    r = await client.post(
+        f"{BASE}/auth/connexion",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def main(n_reservations: int, concurrency: int):
+    async with httpx.AsyncClient(timeout=60) as client:
+        admin = await token(client, "admin@example.com", "admin")
+        membre = await token(client, "membre@example.com", "membre")
+        biblio = await token(client, "biblio@example.com", "biblio")
+
+        r = await client.post(
+            f"{BASE}/admin/livres",
+            json={"titre": "Banc d'essai file", "auteur": "Bench", "annee": 2020, "nombreCopies": 1},
+            headers=admin,
+        )
+        r.raise_for_status()
+        livre_id = r.json()["id"]
+
+        sem = asyncio.Semaphore(concurrency)
+
+        async def reserve():
+            async with sem:
+                r = await client.post(f"{BASE}/reservations", json={"livreId": livre_id}, headers=membre)
+                r.raise_for_status()
+                return r.json()["id"]
+
+        created = set(await asyncio.gather(*(reserve() for _ in range(n_reservations))))
+
+        served: list = []
+        statuses: dict = {}
+
+        async def librarian():
+            while True:
+                r = await client.post(f"{BASE}/bibliothecaire/reservations/next/{livre_id}", headers=biblio)
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+                if r.status_code != 200 or r.json() is None:
+                    return
+                served.append(r.json()["id"])
+
+        start = time.perf_counter()
+        await asyncio.gather(*(librarian() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    duplicates = len(served) - len(set(served))
+    print(f"Réservations : {n_reservations}, bibliothécaires en parallèle : {concurrency}")
+    print(f"Retraits : {len(served)} en {elapsed:.2f}s, statuts : {statuses}")
+    print(f"Retraits/s : {len(served) / elapsed:.1f}")
+    print(f"Servies deux fois : {duplicates}, perdues : {len(created - set(served))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reservations", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(main(args.reservations, args.concurrency))
@@ -0,0 +1,122 @@
+"""
+Benchmark de la sérialisation des listes du catalogue, en lignes/s.
+
+Sans option : compare en mémoire l'ancien chemin (validation pydantic de chaque
+ligne, model_dump, json.dumps) au chemin rapide (BookOut.dump_many + orjson).
+Avec --hydration : compare la lecture de la table en instances ORM à la lecture
+en colonnes seules (lignes Row, book_repo.BOOK_COLUMNS), en temps et en mémoire.
+Avec --http : parcourt /catalogue page par page sur une API démarrée.
+
+    python client_simulation/bench_serialization.py --books 5000
+    python client_simulation/bench_serialization.py --hydration --books 20000
+    python client_simulation/bench_serialization.py --http --limit 200
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+BASE = os.getenv("API_BASE", "http://localhost:8000/api/v1")
+
+
+def _rows(n_books: int):
+    return [
+        SimpleNamespace(
+            id=i, title=f"Titre {i}", author=f"Auteur {i % 997}", year=1900 + i % 120,
+            total_copies=1 + i % 5, available_copies=i % 5,
+        )
+        for i in range(1, n_books + 1)
+    ]
+
+
+def validated(rows) -> bytes:
+    from app.schemas.book import BookOut
+
+    items = [BookOut.model_validate(b).model_dump(by_alias=True) for b in rows]
+    return json.dumps(
+        {"items": items, "next": None}, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def lean(rows) -> bytes:
+    import orjson
+    from app.schemas.book import BookOut
+
+    return orjson.dumps({"items": BookOut.dump_many(rows), "next": None})
+
+
+def bench_memory(n_books: int, repeat: int) -> None:
+    rows = _rows(n_books)
+    assert json.loads(validated(rows)) == json.loads(lean(rows))
+    for name, fn in (("validé + json", validated), ("ReadModel + orjson", lean)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(rows)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<20} {n_books * repeat / elapsed:>12,.0f} lignes/s")
+
+
+def bench_hydration(n_books: int) -> None:
+    from sqlalchemy import create_engine, insert, select
+    from sqlalchemy.orm import Session
+
+    import app.main  # noqa: F401  (enregistre tous les modèles)
+    from app.db.session import Base
+    from app.models.book import Book
+    from app.repositories.book_repo import BOOK_COLUMNS
+
+    engine = create_engine("sqlite://")
+    Base.metadata.tables["books"].create(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Book), [
+            {k: v for k, v in vars(b).items() if k != "id"} for b in _rows(n_books)
+        ])
+
+    for name, stmt, scalars in (("instances ORM", select(Book), True), ("lignes Row", select(*BOOK_COLUMNS), False)):
+        with Session(engine) as db:
+            tracemalloc.start()
+            start = time.perf_counter()
+            result = db.execute(stmt)
+            rows = result.scalars().all() if scalars else result.all()
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        print(f"{name:<15} {len(rows) / elapsed:>12,.0f} lignes/s {peak / len(rows):>8,.0f} octets/ligne (pic)")
+
+
+def bench_http(limit: int) -> None:
+    import httpx
+
+    rows, after = 0, None
+    start = time.perf_counter()
+    with httpx.Client(timeout=60) as client:
+        while True:
+            params = {"limit": limit, **({"after": after} if after else {})}
+            page = client.get(f"{BASE}/catalogue", params=params).json()
+            rows += len(page["items"])
+            after = page["next"]
+            if not after:
+                break
+    elapsed = time.perf_counter() - start
+    print(f"/catalogue : {rows} livres en {elapsed:.2f}s, soit {rows / elapsed:,.0f} lignes/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--http", action="store_true")
+    parser.add_argument("--hydration", action="store_true")
+    parser.add_argument("--limit", type=int, default=200)
+    args = parser.parse_args()
+    if args.http:
+        bench_http(args.limit)
+    elif args.hydration:
+        bench_hydration(args.books)
+    else:
+        bench_memory(args.books, args.repeat)
@@ -1,8 +1,44 @@
-
 import os
 import sys
 
+import pytest
+
 ROOT_DIR = os.path.abspath(os.path.dirname(__file__))
 
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
+
+
+class QueryBudget:
+    """
+    Budget de requêtes SQL par endpoint.
+
+    - `query_budget.check(response, 3)` : réponse d'une API démarrée avec
+      QUERY_INSPECTION_ENABLED=true (en-têtes X-Query-*) ; le test est ignoré
+      si l'API ne les envoie pas.
+    - `with query_budget(3): ...` : code exécuté dans le processus du test, sur
+      un moteur instrumenté par app.db.query_metrics.instrument_queries
+      avec `inspection=True`.
+
+    Les deux échouent aussi sur un N+1 probable, sauf `allow_repeated=True`.
+    """
+
+    def __call__(self, limit: int, allow_repeated: bool = False):
+        from app.config.settings import get_settings
+        from app.db.query_metrics import assert_max_queries
+
+        return assert_max_queries(limit, None if allow_repeated else get_settings().QUERY_N_PLUS_ONE_THRESHOLD)
+
+    def check(self, response, limit: int, allow_repeated: bool = False) -> None:
+        count = response.headers.get("X-Query-Count")
+        if count is None:
+            pytest.skip("API démarrée sans QUERY_INSPECTION_ENABLED")
+        endpoint = f"{response.request.method} {response.request.url}"
+        assert int(count) <= limit, f"{endpoint} : {count} requêtes SQL pour un budget de {limit}"
+        if not allow_repeated:
+            assert response.headers["X-Query-Repeated"] == "0", f"{endpoint} : N+1 probable (voir les logs de l'API)"
+
+
+@pytest.fixture
+def query_budget() -> QueryBudget:
+    return QueryBudget()
@@ -1,4 +1,7 @@
+import json
 import os
+import time
+import uuid
 import requests
 
 BASE = os.getenv("API_BASE", "http://localhost:8000/api/v1")
@@ -59,6 +62,21 @@ def test_auth_connexion_bad_password():
     assert token is None
 
 
+def test_auth_inscription_puis_connexion():
+    email = f"inscrit_{uuid.uuid4().hex[:8]}@example.com"
+    payload = {"nom": "Nouveau Membre", "email": email, "motDePasse": "secret123"}
+
+    r = requests.post(f"{AUTH_BASE}/auth/inscription", json=payload)
+    assert r.status_code == 201
+    assert r.json()["nom"] == "Nouveau Membre"
+    assert r.json()["role"] == "membre"
+
+    r = requests.post(f"{AUTH_BASE}/auth/inscription", json=payload)
+    assert r.status_code == 409
+
+    assert get_token(email, "secret123") is not None
+
+
 def test_auth_whoami_membre():
     token = get_token("membre@example.com", "membre")
     headers = {"Authorization": f"Bearer {token}"} if token else {}
@@ -91,11 +109,63 @@ def test_catalogue_public():
     assert r.status_code == 200
 
 
+def test_catalogue_pagination_curseur():
+    r = requests.get(f"{BASE}/catalogue", params={"limit": 1})
+    assert r.status_code == 200
+    page = r.json()
+    assert len(page["items"]) <= 1
+
+    if page["next"]:
+        r2 = requests.get(f"{BASE}/catalogue", params={"limit": 1, "after": page["next"]})
+        assert r2.status_code == 200
+        assert r2.json()["items"][0]["id"] > page["items"][0]["id"]
+
+
+def test_catalogue_curseur_invalide():
+    r = requests.get(f"{BASE}/catalogue", params={"after": "%%%"})
+    assert r.status_code == 422
+
+
+def test_catalogue_etag_304():
+    r = requests.get(f"{BASE}/catalogue")
+    etag = r.headers.get("ETag")
+    assert etag
+
+    r2 = requests.get(f"{BASE}/catalogue", headers={"If-None-Match": etag})
+    assert r2.status_code == 304
+    assert r2.content == b""
+
+
+def test_livre_detail_etag_304():
+    r = requests.get(f"{BASE}/livres/1")
+    assert r.status_code == 200
+    etag = r.headers["ETag"]
+
+    r2 = requests.get(f"{BASE}/livres/1", headers={"If-None-Match": etag})
+    assert r2.status_code == 304
+
+    r3 = requests.get(f"{BASE}/livres/1", headers={"If-None-Match": '"autre"'})
+    assert r3.status_code == 200
+
+
 def test_catalogue_recherche():
     r = requests.get(f"{BASE}/catalogue/recherche", params={"q": "Harry"})
     assert r.status_code in (200, 404)
 
 
+def test_catalogue_recherche_sans_accents_ni_casse():
+    r = requests.get(f"{BASE}/catalogue/recherche", params={"q": "ALCHIMÌSTE"})
+    assert r.status_code == 200
+    titres = [b["title"] for b in r.json()["items"]]
+    assert "L’Alchimiste" in titres
+
+
+def test_catalogue_recherche_prefixe_auteur():
+    r = requests.get(f"{BASE}/catalogue/recherche", params={"q": "orw"})
+    assert r.status_code == 200
+    assert any(b["author"] == "George Orwell" for b in r.json()["items"])
+
+
 # ========= LIVRES ADMIN =========
 
 
@@ -133,6 +203,103 @@ def test_admin_delete_book():
     assert r.status_code in (200, 401, 403, 404)
 
 
+def test_catalogue_reflete_modification_admin():
+    admin_token = get_token("admin@example.com", "admin")
+    headers = {"Authorization": f"Bearer {admin_token}"} if admin_token else {}
+
+    r = requests.post(
+        f"{BASE}/admin/livres",
+        json={"titre": "Cache Avant", "auteur": "Auteur Cache", "annee": 2020, "nombreCopies": 1},
+        headers=headers,
+    )
+    assert r.status_code == 201
+    livre_id = r.json()["id"]
+    assert requests.get(f"{BASE}/livres/{livre_id}").json()["title"] == "Cache Avant"
+
+    r = requests.put(f"{BASE}/admin/livres/{livre_id}", json={"titre": "Cache Après"}, headers=headers)
+    assert r.status_code == 200
+    assert requests.get(f"{BASE}/livres/{livre_id}").json()["title"] == "Cache Après"
+
+    requests.delete(f"{BASE}/admin/livres/{livre_id}", headers=headers)
+    assert requests.get(f"{BASE}/livres/{livre_id}").status_code == 404
+
+
+def test_admin_export_ndjson():
+    admin_token = get_token("admin@example.com", "admin")
+    headers = {"Authorization": f"Bearer {admin_token}"} if admin_token else {}
+
+    r = requests.get(f"{BASE}/admin/livres/export", headers=headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lignes = [json.loads(line) for line in r.text.splitlines()]
+    assert any(b["title"] == "L’Alchimiste" for b in lignes)
+
+
+def test_admin_export_csv():
+    admin_token = get_token("admin@example.com", "admin")
+    headers = {"Authorization": f"Bearer {admin_token}"} if admin_token else {}
+
+    r = requests.get(f"{BASE}/admin/livres/export", params={"format": "csv"}, headers=headers)
+    assert r.status_code == 200
+    lignes = r.text.splitlines()
+    assert lignes[0] == "id,title,author,year,totalCopies,availableCopies"
+    assert len(lignes) > 1
+
+
+def test_export_interdit_pour_membre():
+    token = get_token("membre@example.com", "membre")
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+    r = requests.get(f"{BASE}/admin/livres/export", headers=headers)
+    assert r.status_code in (401, 403)
+
+
+def test_admin_import_ndjson_avec_rapport_d_erreurs():
+    admin = {"Authorization": f"Bearer {get_token('admin@example.com', 'admin')}"}
+    marque = uuid.uuid4().hex[:8]
+    lignes = [
+        {"titre": f"Import {marque} A", "auteur": "Fournisseur", "annee": 2001, "nombreCopies": 2},
+        {"titre": f"Import {marque} B", "auteur": "Fournisseur", "annee": 2002, "nombreCopies": 0},
+        {"titre": f"Import {marque} C", "auteur": "Fournisseur", "annee": 2003, "nombreCopies": 1, "copiesDisponibles": 3},
+        {"titre": f"Import {marque} D", "auteur": "Fournisseur", "annee": 2004, "nombreCopies": 3, "copiesDisponibles": 1},
+    ]
+    corps = "\n".join(json.dumps(ligne) for ligne in lignes) + "\n{pas du json\n"
+
+    r = requests.post(
+        f"{BASE}/admin/livres/import", data=corps.encode(),
+        headers={**admin, "Content-Type": "application/x-ndjson"},
+    )
+    assert r.status_code == 200
+    rapport = r.json()
+    assert rapport["importes"] == 2 and rapport["rejetes"] == 3
+    assert [e["ligne"] for e in rapport["erreurs"]] == [2, 3, 5]
+
+    r = requests.get(f"{BASE}/catalogue/recherche", params={"q": marque})
+    titres = sorted(b["title"] for b in r.json()["items"])
+    assert titres == [f"Import {marque} A", f"Import {marque} D"]
+
+
+def test_admin_import_csv():
+    admin = {"Authorization": f"Bearer {get_token('admin@example.com', 'admin')}"}
+    marque = uuid.uuid4().hex[:8]
+    corps = f'titre,auteur,annee,nombreCopies,copiesDisponibles\n"Csv {marque}, tome 1",Auteur CSV,1999,4,\n'
+
+    r = requests.post(
+        f"{BASE}/admin/livres/import", params={"format": "csv"}, data=corps.encode(),
+        headers={**admin, "Content-Type": "text/csv"},
+    )
+    assert r.json() == {"importes": 1, "rejetes": 0, "erreurs": []}
+
+    livre = requests.get(f"{BASE}/catalogue/recherche", params={"q": marque}).json()["items"][0]
+    assert livre["title"] == f"Csv {marque}, tome 1" and livre["availableCopies"] == 4
+
+
+def test_import_interdit_pour_membre():
+    token = get_token("membre@example.com", "membre")
+    r = requests.post(f"{BASE}/admin/livres/import", data=b"", headers={"Authorization": f"Bearer {token}"})
+    assert r.status_code == 403
+
+
 # ========= PRETS (MEMBRE) =========
 
 
@@ -148,6 +315,35 @@ def test_membre_emprunter():
     assert r.status_code in (201, 400, 401, 403, 404, 500)
 
 
+def test_membre_emprunter_decremente_les_copies():
+    admin_token = get_token("admin@example.com", "admin")
+    token = get_token("membre@example.com", "membre")
+    r = requests.post(
+        f"{BASE}/admin/livres",
+        json={"titre": "Exemplaire Unique", "auteur": "Auteur Prêt", "annee": 2021, "nombreCopies": 1},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert r.status_code == 201
+    livre_id = r.json()["id"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    r = requests.post(f"{BASE}/membre/prets", json={"livreId": livre_id}, headers=headers)
+    assert r.status_code == 201
+    assert requests.get(f"{BASE}/livres/{livre_id}").json()["availableCopies"] == 0
+
+    r = requests.post(f"{BASE}/membre/prets", json={"livreId": livre_id}, headers=headers)
+    assert r.status_code == 422
+    assert r.json()["error"] == "no_copies"
+
+
+def test_membre_emprunter_livre_inexistant():
+    token = get_token("membre@example.com", "membre")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    r = requests.post(f"{BASE}/membre/prets", json={"livreId": 999999}, headers=headers)
+    assert r.status_code == 404
+
+
 def test_membre_lister_prets():
     token = get_token("membre@example.com", "membre")
     headers = {"Authorization": f"Bearer {token}"} if token else {}
@@ -164,6 +360,66 @@ def test_membre_emprunter_sans_token():
     assert r.status_code in (401, 403)
 
 
+def test_emprunts_retours_renouvellements_par_lot():
+    admin = {"Authorization": f"Bearer {get_token('admin@example.com', 'admin')}"}
+    membre = {"Authorization": f"Bearer {get_token('membre@example.com', 'membre')}"}
+    biblio = {"Authorization": f"Bearer {get_token('biblio@example.com', 'biblio')}"}
+    livres = []
+    for copies in (2, 1):
+        r = requests.post(
+            f"{BASE}/admin/livres",
+            json={"titre": "Livre Comptoir", "auteur": "Auteur Lot", "annee": 2015, "nombreCopies": copies},
+            headers=admin,
+        )
+        livres.append(r.json()["id"])
+    a, b = livres
+
+    r = requests.post(f"{BASE}/membre/prets/lot", json={"livreIds": [a, b, a, 999999]}, headers=membre)
+    assert r.status_code == 200
+    res = r.json()["resultats"]
+    assert [x["statut"] for x in res] == ["ok", "ok", "erreur", "erreur"]
+    assert [x.get("erreur") for x in res[2:]] == ["duplicate_item", "book_not_found"]
+    pret_a, pret_b = res[0]["pret"]["id"], res[1]["pret"]["id"]
+    assert requests.get(f"{BASE}/livres/{b}").json()["availableCopies"] == 0
+
+    r = requests.post(f"{BASE}/membre/prets/lot", json={"livreIds": [b]}, headers=membre)
+    assert r.json()["resultats"][0]["erreur"] == "no_copies"
+
+    for attendu in ("ok", "ok", "erreur"):
+        r = requests.post(f"{BASE}/bibliothecaire/prets/renouvellements", json={"pretIds": [pret_a]}, headers=biblio)
+        assert r.json()["resultats"][0]["statut"] == attendu
+    assert r.json()["resultats"][0]["erreur"] == "max_renewals_reached"
+
+    r = requests.post(f"{BASE}/bibliothecaire/prets/retours", json={"pretIds": [pret_a, pret_b, 999999]}, headers=biblio)
+    res = r.json()["resultats"]
+    assert [x["statut"] for x in res] == ["ok", "ok", "erreur"]
+    assert res[0]["livreId"] == a and res[2]["erreur"] == "pret_not_found"
+    assert requests.get(f"{BASE}/livres/{a}").json()["availableCopies"] == 2
+    assert requests.get(f"{BASE}/livres/{b}").json()["availableCopies"] == 1
+
+    # les prêts rendus restent dans l'historique, hors des prêts en cours
+    r = requests.post(f"{BASE}/bibliothecaire/prets/retours", json={"pretIds": [pret_a]}, headers=biblio)
+    assert r.json()["resultats"][0]["erreur"] == "pret_already_returned"
+    r = requests.post(f"{BASE}/bibliothecaire/prets/renouvellements", json={"pretIds": [pret_b]}, headers=biblio)
+    assert r.json()["resultats"][0]["erreur"] == "pret_already_returned"
+    en_cours = requests.get(f"{BASE}/membre/prets", headers=membre).json()
+    assert pret_a not in [p["id"] for p in en_cours]
+    historique = requests.get(f"{BASE}/membre/prets", params={"historique": "true"}, headers=membre).json()
+    rendu = next(p for p in historique if p["id"] == pret_a)
+    assert rendu["returned_at"] is not None and rendu["renouvellements"] == 2
+
+
+def test_emprunts_par_lot_au_comptoir():
+    biblio = {"Authorization": f"Bearer {get_token('biblio@example.com', 'biblio')}"}
+    membre = {"Authorization": f"Bearer {get_token('membre@example.com', 'membre')}"}
+    r = requests.post(f"{BASE}/bibliothecaire/prets/lot", json={"utilisateurId": 999999, "livreIds": [1]}, headers=biblio)
+    assert r.status_code == 404
+    r = requests.post(f"{BASE}/bibliothecaire/prets/retours", json={"pretIds": [1]}, headers=membre)
+    assert r.status_code == 403
+    r = requests.post(f"{BASE}/membre/prets/lot", json={"livreIds": []}, headers=membre)
+    assert r.status_code == 422
+
+
 # ========= RESERVATIONS =========
 
 
@@ -179,6 +435,47 @@ def test_reserver_livre():
     assert r.status_code in (201, 400, 401, 403, 404)
 
 
+def test_file_attente_et_reservation_suivante():
+    token = get_token("membre@example.com", "membre")
+    biblio = get_token("biblio@example.com", "biblio")
+    biblio_headers = {"Authorization": f"Bearer {biblio}"}
+
+    r = requests.post(f"{BASE}/reservations", json={"livreId": 1}, headers={"Authorization": f"Bearer {token}"})
+    assert r.status_code == 201
+    reservation_id = r.json()["id"]
+
+    r = requests.get(f"{BASE}/bibliothecaire/reservations/file-attente/1", headers=biblio_headers)
+    assert r.status_code == 200
+    assert reservation_id in [res["id"] for res in r.json()]
+
+    r = requests.post(f"{BASE}/bibliothecaire/reservations/next/1", headers=biblio_headers)
+    assert r.status_code == 200
+    assert r.json()["id"] <= reservation_id
+
+
+def test_reservations_servies_dans_l_ordre_sans_doublon():
+    admin = {"Authorization": f"Bearer {get_token('admin@example.com', 'admin')}"}
+    membre = {"Authorization": f"Bearer {get_token('membre@example.com', 'membre')}"}
+    biblio = {"Authorization": f"Bearer {get_token('biblio@example.com', 'biblio')}"}
+    r = requests.post(
+        f"{BASE}/admin/livres",
+        json={"titre": "File Ordonnée", "auteur": "Auteur File", "annee": 2018, "nombreCopies": 1},
+        headers=admin,
+    )
+    livre_id = r.json()["id"]
+    ids = [
+        requests.post(f"{BASE}/reservations", json={"livreId": livre_id}, headers=membre).json()["id"]
+        for _ in range(3)
+    ]
+
+    servies = [
+        requests.post(f"{BASE}/bibliothecaire/reservations/next/{livre_id}", headers=biblio).json()
+        for _ in range(4)
+    ]
+    assert [s["id"] for s in servies[:3]] == ids
+    assert servies[3] is None
+
+
 # ========= AMENDES =========
 
 
@@ -190,6 +487,16 @@ def test_lister_amendes_membre():
     assert r.status_code in (200, 401, 404)
 
 
+def test_amendes_membre_format():
+    token = get_token("membre@example.com", "membre")
+    r = requests.get(f"{BASE}/membre/amendes", headers={"Authorization": f"Bearer {token}"})
+    assert r.status_code == 200
+    body = r.json()
+    assert isinstance(body["total"], float)
+    assert body["total"] == round(sum(d["montant"] for d in body["details"]), 2)
+    assert all(d["joursRetard"] > 0 for d in body["details"])
+
+
 def test_payer_amende():
     token = get_token("membre@example.com", "membre")
     headers = {"Authorization": f"Bearer {token}"} if token else {}
@@ -253,6 +560,56 @@ def test_notifications_marquer_lue():
     assert r.status_code in (200, 401, 403, 404)
 
 
+def test_notifications_persistees_et_lues():
+    admin = {"Authorization": f"Bearer {get_token('admin@example.com', 'admin')}"}
+    membre = {"Authorization": f"Bearer {get_token('membre@example.com', 'membre')}"}
+    r = requests.post(
+        f"{BASE}/admin/livres",
+        json={"titre": "Livre Notifié", "auteur": "Auteur Notif", "annee": 2020, "nombreCopies": 1},
+        headers=admin,
+    )
+    r = requests.post(f"{BASE}/membre/prets", json={"livreId": r.json()["id"]}, headers=membre)
+    assert r.status_code == 201
+    pret_id = r.json()["id"]
+
+    r = requests.post(
+        f"{BASE}/admin/notifications/confirmation-emprunt", json={"pretId": pret_id}, headers=admin
+    )
+    assert r.status_code == 201
+    notif = r.json()
+    assert notif["pretId"] == pret_id and notif["lu"] is False
+
+    r = requests.get(f"{BASE}/membre/notifications", params={"nonLues": "true"}, headers=membre)
+    assert r.status_code == 200
+    assert r.json()["items"][0]["id"] == notif["id"]
+
+    r = requests.put(f"{BASE}/membre/notifications/{notif['id']}/lu", headers=membre)
+    assert r.status_code == 200 and r.json()["lu"] is True
+    r = requests.get(f"{BASE}/membre/notifications", params={"nonLues": "true"}, headers=membre)
+    assert notif["id"] not in [n["id"] for n in r.json()["items"]]
+
+    # la notification d'un autre utilisateur n'est pas visible
+    r = requests.put(f"{BASE}/membre/notifications/{notif['id']}/lu", headers=admin)
+    assert r.status_code == 404
+
+
+def test_notification_pret_inexistant():
+    admin = {"Authorization": f"Bearer {get_token('admin@example.com', 'admin')}"}
+    r = requests.post(f"{BASE}/admin/notifications/retard", json={"pretId": 999999, "joursRetard": 2}, headers=admin)
+    assert r.status_code == 404
+
+
+def test_notifications_admin_pagination():
+    admin = {"Authorization": f"Bearer {get_token('admin@example.com', 'admin')}"}
+    r = requests.get(f"{BASE}/admin/notifications", params={"limit": 1}, headers=admin)
+    assert r.status_code == 200
+    page = r.json()
+    assert len(page["items"]) <= 1
+    if page["next"]:
+        r = requests.get(f"{BASE}/admin/notifications", params={"limit": 1, "after": page["next"]}, headers=admin)
+        assert r.json()["items"][0]["id"] < page["items"][0]["id"]
+
+
 # ========= AUDIT =========
 
 
@@ -262,3 +619,133 @@ def test_audit_admin():
 
     r = requests.get(f"{BASE}/admin/audit", headers=headers)
     assert r.status_code in (200, 401, 403)
+
+
+def _attendre_evenement_audit(headers, action, cible_id, details=None):
+    for _ in range(20):
+        r = requests.get(f"{BASE}/admin/audit", params={"action": action}, headers=headers)
+        assert r.status_code == 200
+        for e in r.json()["items"]:
+            if e["cibleId"] == cible_id and (details is None or e["details"] == details):
+                return e
+        time.sleep(0.1)
+    return None
+
+
+def test_audit_trace_edition_admin_et_emprunt():
+    admin = {"Authorization": f"Bearer {get_token('admin@example.com', 'admin')}"}
+    membre = {"Authorization": f"Bearer {get_token('membre@example.com', 'membre')}"}
+    r = requests.post(
+        f"{BASE}/admin/livres",
+        json={"titre": "Livre Audité", "auteur": "Auteur Audit", "annee": 2019, "nombreCopies": 2},
+        headers=admin,
+    )
+    livre_id = r.json()["id"]
+    r = requests.post(f"{BASE}/membre/prets", json={"livreId": livre_id}, headers=membre)
+    assert r.status_code == 201
+
+    e = _attendre_evenement_audit(admin, "LIVRE_CREATION", livre_id)
+    assert e is not None and e["cible"] == "livre" and e["utilisateurId"] is not None
+    e = _attendre_evenement_audit(admin, "EMPRUNT", r.json()["id"], {"livreId": livre_id})
+    assert e is not None
+
+
+def test_audit_pagination_et_periode():
+    admin = {"Authorization": f"Bearer {get_token('admin@example.com', 'admin')}"}
+    time.sleep(0.5)  # laisse le writer vider la file (connexions précédentes)
+    r = requests.get(f"{BASE}/admin/audit", params={"limit": 2}, headers=admin)
+    page = r.json()
+    assert len(page["items"]) == 2 and page["next"]
+    r = requests.get(f"{BASE}/admin/audit", params={"limit": 2, "after": page["next"]}, headers=admin)
+    suivante = r.json()["items"]
+    assert suivante and suivante[0]["date"] <= page["items"][-1]["date"]
+    assert {e["id"] for e in suivante}.isdisjoint(e["id"] for e in page["items"])
+
+    r = requests.get(f"{BASE}/admin/audit", params={"depuis": "2999-01-01T00:00:00"}, headers=admin)
+    assert r.json() == {"items": [], "next": None}
+    r = requests.get(f"{BASE}/admin/audit", params={"after": "%%%"}, headers=admin)
+    assert r.status_code == 422
+
+
+# ========= METRIQUES =========
+
+
+def test_admin_metrics_pool():
+    admin_token = get_token("admin@example.com", "admin")
+    headers = {"Authorization": f"Bearer {admin_token}"} if admin_token else {}
+
+    r = requests.get(f"{BASE}/admin/metrics/pool", headers=headers)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["pools"]["sync"]["checkouts"] > 0
+    assert "+Inf" in body["pools"]["sync"]["waitSeconds"]["buckets"]
+
+
+def test_metrics_pool_interdit_pour_membre():
+    token = get_token("membre@example.com", "membre")
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+    r = requests.get(f"{BASE}/admin/metrics/pool", headers=headers)
+    assert r.status_code in (401, 403)
+
+
+def test_metrics_prometheus():
+    requests.get(f"{BASE}/catalogue")
+
+    r = requests.get(BASE.replace("/api/v1", "") + "/metrics")
+    assert r.status_code == 200
+    assert r.headers["Content-Type"].startswith("text/plain")
+    assert 'http_responses_total{method="GET",route="/api/v1/catalogue",status="200"}' in r.text
+    assert "# TYPE http_request_duration_seconds histogram" in r.text
+    assert 'db_queries_total{engine="async"}' in r.text
+
+
+# ========= BUDGET DE REQUÊTES SQL =========
+# Vérifiés sur une API démarrée avec QUERY_INSPECTION_ENABLED=true, ignorés sinon.
+# Le principal est mis en cache par token : une première requête l'y place,
+# pour que le budget ne compte que l'endpoint lui-même.
+
+
+def _en_tetes_en_cache(username, password):
+    headers = {"Authorization": f"Bearer {get_token(username, password)}"}
+    requests.get(f"{BASE}/membre/prets", headers=headers)
+    return headers
+
+
+def test_budget_connexion(query_budget):
+    r = requests.post(
+        f"{AUTH_BASE}/auth/connexion",
+        data={"username": "membre@example.com", "password": "membre"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    query_budget.check(r, 1)
+
+
+def test_budget_recherche_catalogue(query_budget):
+    query_budget.check(requests.get(f"{BASE}/catalogue/recherche", params={"q": "budget"}), 1)
+
+
+def test_budget_prets_membre(query_budget):
+    membre = _en_tetes_en_cache("membre@example.com", "membre")
+
+    query_budget.check(requests.get(f"{BASE}/membre/prets", headers=membre), 1)
+    query_budget.check(requests.get(f"{BASE}/membre/prets", params={"historique": "true"}, headers=membre), 1)
+    query_budget.check(requests.get(f"{BASE}/membre/amendes", headers=membre), 1)
+
+
+def test_budget_emprunt_par_lot_independant_de_la_taille(query_budget):
+    admin = {"Authorization": f"Bearer {get_token('admin@example.com', 'admin')}"}
+    livres = [
+        requests.post(
+            f"{BASE}/admin/livres",
+            json={"titre": "Livre Budget", "auteur": "Auteur Budget", "annee": 2020, "nombreCopies": 1},
+            headers=admin,
+        ).json()["id"]
+        for _ in range(8)
+    ]
+    membre = _en_tetes_en_cache("membre@example.com", "membre")
+
+    for lot in (livres[:1], livres[1:]):
+        r = requests.post(f"{BASE}/membre/prets/lot", json={"livreIds": lot}, headers=membre)
+        assert r.status_code == 200
+        query_budget.check(r, 5)
@@ -0,0 +1,36 @@
+import time
+
+from app.core.cache import LRUCache
+
+
+def test_cache_get_set():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("absent") is None
+
+
+def test_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_cache_ttl_expires_entries():
+    cache = LRUCache(maxsize=2, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+
+def test_cache_clear():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.clear()
+    assert len(cache) == 0
@@ -0,0 +1,70 @@
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, negotiate
+
+BIG = b'{"items":[' + b",".join(b'{"id":%d,"title":"Titre"}' % i for i in range(200)) + b"]}"
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/big")
+    def big():
+        return Response(BIG, media_type="application/json")
+
+    @app.get("/small")
+    def small():
+        return Response(b'{"a":1}', media_type="application/json")
+
+    @app.get("/html")
+    def html():
+        return PlainTextResponse("x" * 5000, media_type="text/html")
+
+    @app.get("/flux")
+    def flux():
+        return StreamingResponse((b'{"n":%d}\n' % i for i in range(1000)), media_type="application/x-ndjson")
+
+    @app.get("/deja")
+    def deja():
+        return Response(gzip.compress(BIG), media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+    return TestClient(app)
+
+
+def test_negotiate():
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("gzip;q=0, deflate") is None
+    assert negotiate("*") is not None
+    assert negotiate("identity") is None
+    assert negotiate(None) is None
+
+
+def test_compresses_large_allowed_responses_only():
+    client = _client()
+    headers = {"Accept-Encoding": "gzip"}
+
+    r = client.get("/big", headers=headers)
+    assert r.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["vary"]
+    assert r.content == BIG
+    assert int(r.headers["content-length"]) < len(BIG)
+
+    assert "content-encoding" not in client.get("/small", headers=headers).headers
+    assert "content-encoding" not in client.get("/html", headers=headers).headers
+    assert "content-encoding" not in client.get("/big", headers={"Accept-Encoding": "identity"}).headers
+
+
+def test_streaming_and_precompressed_responses():
+    client = _client()
+
+    r = client.get("/flux", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.text.splitlines()[-1] == '{"n":999}'
+
+    r = client.get("/deja", headers={"Accept-Encoding": "gzip"})
+    assert r.content == BIG  # décodé une seule fois : pas de double compression
@@ -0,0 +1,50 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.http_metrics import MetricsMiddleware
+from app.core.metrics import CounterFamily, HistogramFamily, render_prometheus
+from app.db.query_metrics import instrument_queries
+
+
+def test_families_render_prometheus_text():
+    counter = CounterFamily("t_total", "aide", ("route",))
+    counter.inc('/a"b')
+    histogram = HistogramFamily("t_seconds", "aide", ("route",), buckets=(0.1, 1.0))
+    histogram.labels("/a").observe(0.5)
+
+    assert counter.render() == ["# HELP t_total aide", "# TYPE t_total counter", 't_total{route="/a\\"b"} 1']
+    lines = histogram.render()
+    assert 't_seconds_bucket{route="/a",le="0.1"} 0' in lines
+    assert 't_seconds_bucket{route="/a",le="+Inf"} 1' in lines
+    assert 't_seconds_count{route="/a"} 1' in lines
+
+
+def test_middleware_records_route_status_and_queries():
+    engine = create_engine("sqlite://")
+    instrument_queries(engine, "test")
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/unite/livres/{livre_id}")
+    def livre(livre_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {"id": livre_id}
+
+    client = TestClient(app)
+    client.get("/unite/livres/1")
+    client.get("/unite/livres/2")
+    client.post("/unite/livres/3")
+
+    out = render_prometheus()
+    route = 'route="/unite/livres/{livre_id}"'
+    assert f'http_responses_total{{method="GET",{route},status="200"}} 2' in out
+    assert f'http_responses_total{{method="POST",{route},status="405"}} 1' in out
+    assert f'http_requests_in_flight{{method="GET",{route}}} 0' in out
+    assert f'http_request_duration_seconds_count{{method="GET",{route}}} 2' in out
+    # deux requêtes SQL par appel
+    assert f'http_request_db_queries_bucket{{method="GET",{route},le="1"}} 0' in out
+    assert f'http_request_db_queries_bucket{{method="GET",{route},le="2"}} 2' in out
+    assert 'db_queries_total{engine="test"} 4' in out
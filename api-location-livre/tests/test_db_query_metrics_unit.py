@@ -0,0 +1,74 @@
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.query_metrics import capture_queries, instrument_queries, statement_shape
+from app.db.session import Base
+from app.models.book import Book
+from app.repositories import pret_repo
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    instrument_queries(engine, "inspection", inspection=True, slow_ms=10_000)
+    with sessionmaker(bind=engine)() as session:
+        session.add_all([Book(id=i, title=f"T{i}", author="A", year=2000, total_copies=1, available_copies=1) for i in range(1, 7)])
+        session.commit()
+        yield session
+
+
+def test_statement_shape_collapses_parameter_lists():
+    a = statement_shape("SELECT id FROM books\n WHERE id IN (?, ?, ?)")
+    b = statement_shape("SELECT id FROM books WHERE id IN (?)")
+    assert a == b == "SELECT id FROM books WHERE id IN (?)"
+    assert statement_shape("WHERE id IN (%(id_1_1)s, %(id_1_2)s)") == "WHERE id IN (?)"
+
+
+def test_repeated_shapes_flag_n_plus_one(db):
+    db.expunge_all()
+    with capture_queries() as stats:
+        for book_id in range(1, 7):
+            db.get(Book, book_id)  # un SELECT par livre
+
+    assert stats.count == 6
+    [(shape, n)] = stats.repeated(5)
+    assert n == 6 and shape.startswith("SELECT books.id")
+
+
+def test_query_budget_fixture(db, query_budget):
+    with query_budget(1):
+        pret_repo.list_prets_by_user(db, 1, include_returned=True)
+
+    with pytest.raises(AssertionError, match="N\\+1"):
+        with query_budget(10):
+            for book_id in range(1, 7):
+                db.execute(text("SELECT title FROM books WHERE id = :id"), {"id": book_id})
+
+
+def test_slow_queries_are_logged_with_plan(caplog):
+    engine = create_engine("sqlite://")
+    Base.metadata.tables["books"].create(engine)
+    instrument_queries(engine, "inspection", inspection=True, slow_ms=0)
+
+    with caplog.at_level(logging.WARNING, logger="app.db.query_metrics"), capture_queries() as stats:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT title FROM books WHERE id = :id"), {"id": 1})
+
+    [(statement, _, plan)] = stats.slow
+    assert "SEARCH books" in plan
+    assert "requête lente" in caplog.text
+
+
+def test_capture_queries_join_reuses_current_stats(db):
+    with capture_queries() as outer:
+        with capture_queries(join=True) as inner:
+            db.execute(text("SELECT 1"))
+        with capture_queries() as isolated:
+            db.execute(text("SELECT 2"))
+
+    assert inner is outer and outer.count == 1
+    assert isolated.count == 1
@@ -0,0 +1,58 @@
+import pytest
+
+from app.db.transaction import on_commit, transactional
+
+
+class FakeSession:
+    def __init__(self):
+        self.info = {}
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def test_transactional_commits_once_and_runs_after_commit():
+    calls = []
+
+    @transactional
+    def inner(db):
+        on_commit(db, lambda: calls.append(("after", db.commits)))
+        return "inner"
+
+    @transactional
+    def outer(db):
+        inner(db)
+        return "ok"
+
+    db = FakeSession()
+    assert outer(db) == "ok"
+    assert db.commits == 1
+    assert calls == [("after", 1)]
+
+
+def test_transactional_rolls_back_and_drops_callbacks():
+    calls = []
+
+    @transactional
+    def failing(db):
+        on_commit(db, lambda: calls.append("after"))
+        raise ValueError("boom")
+
+    db = FakeSession()
+    with pytest.raises(ValueError):
+        failing(db)
+    assert db.commits == 0
+    assert db.rollbacks == 1
+    assert calls == []
+    assert db.info == {}
+
+
+def test_on_commit_outside_transaction_runs_now():
+    calls = []
+    on_commit(FakeSession(), lambda: calls.append("now"))
+    assert calls == ["now"]
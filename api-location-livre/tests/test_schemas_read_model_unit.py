@@ -0,0 +1,34 @@
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import orjson
+
+from app.schemas.book import BookOut
+from app.schemas.notification import NotificationOut
+from app.schemas.pret import PretOut
+
+
+def _validated(model, obj) -> dict:
+    return model.model_validate(obj).model_dump(mode="json", by_alias=True)
+
+
+def test_dump_matches_validated_output():
+    book = SimpleNamespace(id=1, title="Dune", author="Frank Herbert", year=1965, total_copies=3, available_copies=2)
+    pret = SimpleNamespace(
+        id=7, user_id=1, book_id=1, date_pret=date(2025, 1, 1), date_retour=date(2025, 1, 15),
+        renouvellements=1, returned_at=datetime(2025, 1, 10, 8, 30, 0, 125000),
+    )
+    notification = SimpleNamespace(
+        id=3, user_id=1, pret_id=None, type="retard", message="Retard : prêt 7", lu=False,
+        created_at=datetime(2025, 1, 16), delivered_at=None,
+    )
+
+    for model, obj in [(BookOut, book), (PretOut, pret), (NotificationOut, notification)]:
+        assert orjson.loads(orjson.dumps(model.dump(obj))) == _validated(model, obj)
+    assert list(BookOut.dump(book)) == list(_validated(BookOut, book))
+
+
+def test_dump_many_skips_validation():
+    # donnée de confiance : aucune règle d'entrée (année plausible) n'est rejouée
+    book = SimpleNamespace(id=1, title="T", author="A", year=3000, total_copies=1, available_copies=1)
+    assert BookOut.dump_many([book])[0]["year"] == 3000
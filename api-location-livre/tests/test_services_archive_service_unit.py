@@ -0,0 +1,54 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.models.book import Book
+from app.models.pret import Pret, PretArchive
+from app.models.user import User
+from app.repositories import pret_repo
+from app.services.archive_service import archive_batch
+
+NOW = datetime(2026, 6, 1)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine, expire_on_commit=False)() as session:
+        session.add(User(id=1, email="m@example.com", full_name="M", password_hash="x", role="membre"))
+        session.add(Book(id=1, title="Dune", author="Frank Herbert", year=1965, total_copies=9, available_copies=9))
+        # 1..4 rendus il y a 400 jours, 5 rendu hier, 6 en cours
+        for i in range(1, 7):
+            returned_at = None if i == 6 else NOW - timedelta(days=1 if i == 5 else 400 + i)
+            session.add(Pret(
+                id=i, user_id=1, book_id=1, date_pret=date(2025, 1, i),
+                date_retour=date(2025, 1, 15), renouvellements=0, returned_at=returned_at,
+            ))
+        session.commit()
+        yield session
+
+
+def test_archive_batch_moves_old_closed_loans_in_batches(db):
+    cutoff = NOW - timedelta(days=365)
+
+    assert archive_batch(db, cutoff, 3) == 3
+    assert archive_batch(db, cutoff, 3) == 1
+    assert archive_batch(db, cutoff, 3) == 0
+
+    assert sorted(p.id for p in db.query(Pret).all()) == [5, 6]
+    archived = db.query(PretArchive).order_by(PretArchive.id).all()
+    assert [a.id for a in archived] == [1, 2, 3, 4]
+    assert all(a.archived_at and a.returned_at < cutoff for a in archived)
+
+
+def test_history_reads_across_loans_and_archive(db):
+    archive_batch(db, NOW - timedelta(days=365), 10)
+
+    history = pret_repo.list_prets_by_user(db, 1, include_returned=True)
+    assert [p.id for p in history] == [1, 2, 3, 4, 5, 6]
+    assert history[5].returned_at is None
+    assert [p.id for p in pret_repo.list_prets_by_user(db, 1)] == [6]
@@ -0,0 +1,82 @@
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.session import Base
+from app.models.audit import AuditEvent
+from app.services.audit_service import AuditWriter
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine, tables=[AuditEvent.__table__])
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def event(i):
+    return {"created_at": datetime.utcnow(), "action": "TEST", "user_id": i}
+
+
+def count(session_factory):
+    with session_factory() as db:
+        return db.query(AuditEvent).count()
+
+
+def test_writer_flushes_full_batch_without_waiting_interval(session_factory):
+    writer = AuditWriter(3, 60_000, 100, 10, session_factory=session_factory)
+    writer.start()
+    try:
+        for i in range(3):
+            writer.record(event(i))
+        for _ in range(50):
+            if writer.written == 3:
+                break
+            time.sleep(0.02)
+        assert count(session_factory) == 3
+    finally:
+        writer.stop()
+
+
+def test_writer_stop_flushes_pending_events(session_factory):
+    writer = AuditWriter(100, 60_000, 1000, 10, session_factory=session_factory)
+    writer.start()
+    for i in range(7):
+        writer.record(event(i))
+    writer.stop()
+
+    assert count(session_factory) == 7
+    assert writer.written == 7 and writer.dropped == 0
+
+
+def test_writer_drops_when_queue_full(session_factory):
+    writer = AuditWriter(10, 1000, 2, 1, session_factory=session_factory)
+    for i in range(3):
+        writer.record(event(i))
+
+    assert writer.dropped == 1
+    writer.stop()
+    assert count(session_factory) == 2
+
+
+def test_writer_never_blocks_event_loop_when_queue_full(session_factory):
+    writer = AuditWriter(10, 1000, 2, 5_000, session_factory=session_factory)
+
+    async def record_on_loop():
+        for i in range(3):
+            writer.record(event(i))
+
+    started = time.monotonic()
+    asyncio.run(record_on_loop())
+
+    assert time.monotonic() - started < 1
+    assert writer.dropped == 1
+    writer.stop()
+    assert count(session_factory) == 2
@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.models.book import Book
+from app.models.pret import Pret, PretArchive
+from app.models.user import User
+from app.repositories import pret_repo
+from app.services import book_service, pret_service
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def _foreign_keys(dbapi_connection, _):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine, expire_on_commit=False)() as session:
+        session.add(User(id=1, email="m@example.com", full_name="M", password_hash="x", role="membre"))
+        session.add(Book(id=1, title="Dune", author="Frank Herbert", year=1965, total_copies=1, available_copies=1))
+        session.commit()
+        yield session
+
+
+def test_admin_delete_refuses_book_with_active_loan(db):
+    pret_service.create_pret(db, user_id=1, book_id=1)
+
+    assert book_service.admin_delete(db, 1) == (False, "book_has_loans")
+
+
+def test_admin_delete_after_return_archives_loan_history(db):
+    pret = pret_service.create_pret(db, user_id=1, book_id=1)
+    pret_service.return_pret(db, pret.id)
+
+    assert book_service.admin_delete(db, 1) == (True, None)
+
+    assert db.get(Book, 1) is None
+    assert db.query(Pret).count() == 0
+    assert [a.id for a in db.query(PretArchive).all()] == [pret.id]
+    assert [p.id for p in pret_repo.list_prets_by_user(db, 1, include_returned=True)] == [pret.id]
+
+
+def test_loan_after_book_delete_never_reuses_archived_id(db):
+    pret = pret_service.create_pret(db, user_id=1, book_id=1)
+    pret_service.return_pret(db, pret.id)
+    book_service.admin_delete(db, 1)
+    db.add(Book(id=2, title="Fondation", author="Isaac Asimov", year=1951, total_copies=1, available_copies=1))
+    db.commit()
+
+    nouveau = pret_service.create_pret(db, user_id=1, book_id=2)
+
+    assert nouveau.id != pret.id
+    history = pret_repo.list_prets_by_user(db, 1, include_returned=True)
+    assert sorted(p.id for p in history) == sorted([pret.id, nouveau.id])
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.models.notification import Notification, NotificationOutbox
+from app.models.user import User
+from app.repositories import notification_repo
+from app.services.notification_dispatcher import FileTransport, dispatch_batch
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine, expire_on_commit=False)() as session:
+        session.add(User(id=1, email="m@example.com", full_name="M", password_hash="x", role="membre"))
+        for i in range(3):
+            notification_repo.create_notification(session, user_id=1, pret_id=i, type="retard", message=f"m{i}")
+        session.commit()
+        yield session
+
+
+def test_dispatch_batch_drains_outbox_in_batches(db, tmp_path):
+    transport = FileTransport(str(tmp_path / "out.ndjson"))
+
+    assert dispatch_batch(db, transport, 2) == 2
+    assert dispatch_batch(db, transport, 2) == 1
+    assert dispatch_batch(db, transport, 2) == 0
+
+    lines = [json.loads(ligne) for ligne in (tmp_path / "out.ndjson").read_text().splitlines()]
+    assert [ligne["message"] for ligne in lines] == ["m0", "m1", "m2"]
+    assert lines[0]["email"] == "m@example.com"
+    assert db.query(NotificationOutbox).count() == 0
+    assert all(n.delivered_at for n in db.query(Notification).all())
+
+
+def test_dispatch_batch_keeps_outbox_when_transport_fails(db):
+    class Failing:
+        def send(self, batch):
+            raise ConnectionError("smtp down")
+
+    with pytest.raises(ConnectionError):
+        dispatch_batch(db, Failing(), 10)
+
+    assert db.query(NotificationOutbox).count() == 3
+    assert not any(n.delivered_at for n in db.query(Notification).all())
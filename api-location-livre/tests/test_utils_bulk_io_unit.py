@@ -0,0 +1,38 @@
+import asyncio
+
+from app.utils.bulk_io import iter_records
+
+
+def parse(chunks, fmt):
+    async def stream():
+        for c in chunks:
+            yield c
+
+    async def collect():
+        return [r async for r in iter_records(stream(), fmt)]
+
+    return asyncio.run(collect())
+
+
+def test_ndjson_records_split_across_chunks():
+    records = parse([b'{"titre": "A"}\n{"ti', b'tre": "B"}\n\n', b"pas du json\n"], "ndjson")
+
+    assert records[0] == (1, {"titre": "A"}, None)
+    assert records[1] == (2, {"titre": "B"}, None)
+    line_no, record, error = records[2]
+    assert line_no == 4 and record is None and error.startswith("JSON illisible")
+
+
+def test_csv_header_quotes_multiline_and_empty_cells():
+    data = 'titre,auteur,copiesDisponibles\n"Guerre, et paix",Tolstoï,\n"Sur\ndeux lignes",X,2\nseul\n'.encode()
+    # découpage au milieu d'un caractère multi-octets et d'un champ entre guillemets
+    cut = data.index("ï".encode()) + 1
+    records = parse([b"\xef\xbb\xbf" + data[:cut], data[cut:]], "csv")
+
+    assert records[0] == (2, {"titre": "Guerre, et paix", "auteur": "Tolstoï", "copiesDisponibles": None}, None)
+    assert records[1] == (3, {"titre": "Sur\ndeux lignes", "auteur": "X", "copiesDisponibles": "2"}, None)
+    assert records[2] == (5, None, "1 colonnes au lieu de 3")
+
+
+def test_last_line_without_newline():
+    assert parse([b'{"a": 1}\n{"a": 2}'], "ndjson")[-1] == (2, {"a": 2}, None)
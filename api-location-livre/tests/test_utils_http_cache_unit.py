@@ -0,0 +1,33 @@
+import gzip
+
+from app.utils.http_cache import CachedJSON, etag_matches
+
+
+def test_cached_json_body_and_etag():
+    entry = CachedJSON({"title": "L’Alchimiste"})
+    assert entry.body == '{"title":"L’Alchimiste"}'.encode("utf-8")
+    assert entry.etag.startswith('"') and entry.etag.endswith('"')
+
+
+def test_cached_json_etag_depends_on_content():
+    assert CachedJSON({"a": 1}).etag == CachedJSON({"a": 1}).etag
+    assert CachedJSON({"a": 1}).etag != CachedJSON({"a": 2}).etag
+
+
+def test_etag_matches():
+    etag = CachedJSON([1, 2]).etag
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"x", {etag}', etag)
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"x"', etag)
+
+
+def test_cached_json_compressed_variant_is_computed_once():
+    entry = CachedJSON({"items": list(range(1000))})
+    gz = entry.encoded("gzip")
+    assert gzip.decompress(gz) == entry.body
+    assert entry.encoded("gzip") is gz
+    assert entry.variant_etag("gzip") != entry.etag
+    assert entry.variant_etag(None) == entry.etag
@@ -0,0 +1,24 @@
+import pytest
+
+from app.core.exceptions import ValidationRuleError
+from app.utils import pagination
+
+
+def test_cursor_roundtrip():
+    cursor = pagination.encode_cursor(42)
+    assert isinstance(cursor, str)
+    assert pagination.decode_cursor(cursor) == 42
+
+
+def test_cursor_is_opaque():
+    assert pagination.encode_cursor(123) != "123"
+
+
+def test_decode_cursor_none_or_empty():
+    assert pagination.decode_cursor(None) is None
+    assert pagination.decode_cursor("") is None
+
+
+def test_decode_cursor_invalid_raises():
+    with pytest.raises(ValidationRuleError):
+        pagination.decode_cursor("pas-un-curseur")
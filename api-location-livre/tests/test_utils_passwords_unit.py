@@ -0,0 +1,26 @@
+import asyncio
+
+import pytest
+from passlib.context import CryptContext
+
+from app.core.exceptions import OverloadedError
+from app.utils import passwords
+
+
+def test_verify_password_async_in_pool():
+    hashed = passwords.hash_password("pool_pwd")
+    assert asyncio.run(passwords.verify_password_async("pool_pwd", hashed))
+    assert not asyncio.run(passwords.verify_password_async("autre", hashed))
+    passwords.shutdown_pool()
+
+
+def test_pool_sheds_load_when_full(monkeypatch):
+    monkeypatch.setattr(passwords, "_inflight", 10_000)
+    with pytest.raises(OverloadedError):
+        asyncio.run(passwords.hash_password_async("x"))
+
+
+def test_needs_rehash_when_cost_changes():
+    old = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("x")
+    assert passwords.needs_rehash(old)
+    assert not passwords.needs_rehash(passwords.hash_password("x"))
@@ -1,3 +1,6 @@
+import asyncio
+from types import SimpleNamespace
+
 from app.utils import security
 
 
@@ -160,3 +163,71 @@ def test_hash_and_token_can_be_used_together():
     decoded = security.decode_access_token(token)
     assert decoded is not None
     assert decoded.get("sub") == "combo_user"
+
+
+def _fake_lookup(monkeypatch, role="membre"):
+    calls = []
+
+    def get_by_email(db, email):
+        calls.append(email)
+        return SimpleNamespace(id=7, email=email, full_name="Cache", role=role)
+
+    monkeypatch.setattr(security.user_repo, "get_by_email", get_by_email)
+    return calls
+
+
+def test_get_current_user_caches_principal(monkeypatch):
+    calls = _fake_lookup(monkeypatch)
+    token = security.create_access_token({"sub": "cache_user@example.com"})
+
+    first = security.get_current_user(token=token, db=None)
+    second = security.get_current_user(token=token, db=None)
+
+    assert first.email == second.email == "cache_user@example.com"
+    assert first.role == "membre"
+    assert len(calls) == 1
+
+
+def test_invalidate_principal_forces_reload(monkeypatch):
+    calls = _fake_lookup(monkeypatch)
+    token = security.create_access_token({"sub": "invalidate_user@example.com"})
+
+    security.get_current_user(token=token, db=None)
+    security.invalidate_principal("invalidate_user@example.com")
+    security.get_current_user(token=token, db=None)
+
+    assert len(calls) == 2
+
+
+def test_get_current_user_async_uses_async_lookup_and_shared_cache(monkeypatch):
+    sync_calls = _fake_lookup(monkeypatch, role="bibliothecaire")
+    async_calls = []
+
+    async def get_by_email(db, email):
+        async_calls.append(email)
+        return SimpleNamespace(id=8, email=email, full_name="Async", role="bibliothecaire")
+
+    monkeypatch.setattr(security.user_repo_async, "get_by_email", get_by_email)
+    token = security.create_access_token({"sub": "async_user@example.com"})
+
+    first = asyncio.run(security.get_current_user_async(token=token, db=None))
+    second = security.get_current_user(token=token, db=None)
+
+    assert first.email == second.email == "async_user@example.com"
+    assert async_calls == ["async_user@example.com"] and sync_calls == []
+    assert asyncio.run(security.require_role_async("bibliothecaire", "admin")(user=first)) is first
+
+
+def test_invalidations_are_bounded_and_never_resurrect_stale_entries(monkeypatch):
+    calls = _fake_lookup(monkeypatch)
+    monkeypatch.setattr(security, "_invalidations", security.LRUCache(2, ttl=60))
+    token = security.create_access_token({"sub": "bounded_user@example.com"})
+
+    security.get_current_user(token=token, db=None)
+    security.invalidate_principal("bounded_user@example.com")
+    security.invalidate_principal("autre1@example.com")
+    security.invalidate_principal("autre2@example.com")  # file pleine : cache vidé
+    security.get_current_user(token=token, db=None)
+
+    assert len(security._invalidations) <= 2
+    assert len(calls) == 2